@@ -12,116 +12,431 @@
 
 """
 This program reads SAT problems from input files in DIMACS format and uses three different algorithms for solving the
-SAT problems: GSAT, WalkSAT and DPLL. The output files are also in DIMACS format.
+SAT problems: GSAT, WalkSAT and DPLL, as well as a conflict-driven clause learning (CDCL) solver. The output files are
+also in DIMACS format.
+
+Usage:
+    python SAT.py solve FILE [--algo CDCL WalkSAT] [--seed 1] [--budget 10] [--preprocess] [--decompose -j 4]
+                      [--profile [cprofile|sample]]
+    python SAT.py sweep [DIR] [--algo GSAT DPLL] [--batch] [-j 4] [--timeout 60] [--cpu-timeout 60]
+                        [--profile [cprofile|sample]]
+    python SAT.py plot [--store FILE] [-o CNratio_CPUtime.png] [--show]
+    python SAT.py cube FILE [-j 4] [--depth 6] [--no-write]
+    python SAT.py count FILE [--approximate --samples 1000 --exact 30] [--seed 1]
+
+Without a subcommand, the problems directory is swept and the results are plotted with the default settings below.
+
+With --profile, every algorithm run is profiled with cProfile (default) or the stack sampler and the profile files are
+written next to the solution files, see profiling.py.
+
+NOTE: Only argparse is imported at startup. The solver modules (and NumPy) are imported by the subcommands that run
+them and matplotlib by plot only, such that a single solve starts quickly.
 """
 
-from functions import *
-from time import clock
-from os import listdir
-import matplotlib.pyplot as plt
-from statistics import mean
+import argparse
+import sys
 
 # Set problems directory
 problems_dir = '3SATproblems/'
 
-# List all files in problems directory
-files = listdir(problems_dir)
-
-# Loop through all files
-for file in files:
-    # If file is 3SAT problem file in cnf format, solve the problem using GSAT WalkSAT and DPLL
-    if file.endswith('.cnf'):
-        print('Solving problem: '+file)
-        filename = problems_dir+file
-
-        # Get number of variables, number of clauses and the sentence
-        N, C, sentence = readFile(filename)
-
-        # If no GSAT ouput exists yet for this problem, perform GSAT
-        if not files.count(file.replace('.cnf','.solGSAT')):
-            # Run and time the GSAT algorithm and save results
-            print('Running GSAT')
-            t0 = clock()
-            GSAT_sol = GSAT(N,sentence,max_restarts=20,max_climbs=5*N)
-            t_GSAT = clock() - t0
-            writeFile(filename,'GSAT',N,C,GSAT_sol,t_GSAT)
-
-        # If no WalkSAT ouput exists yet for this problem, perform WalkSAT
-        if not files.count(file.replace('.cnf','.solWalkSAT')):
-            # Run and time the WalkSAT algorithm and save results
-            print('Running WalkSAT')
-            t0 = clock()
-            WalkSAT_sol = WalkSAT(N,sentence,p=0.5,max_flips=200*N)
-            t_WalkSAT = clock() - t0
-            writeFile(filename,'WalkSAT',N,C,WalkSAT_sol,t_WalkSAT)
-
-        # If no DPLL ouput exists yet for this problem, perform DPLL
-        if not files.count(file.replace('.cnf','.solDPLL')):
-            # Run and time the DPLL algorithm and save results
-            print('Running DPLL')
-            t0 = clock()
-            DPLL_sol = DPLLInit(N, sentence)
-            t_DPLL = clock() - t0
-            writeFile(filename,'DPLL',N,C,DPLL_sol,t_DPLL)
+# Results database, in which the results are cached by formula content, algorithm and parameters. Problems already
+# solved with the same algorithm and parameters are not solved again, even if they were renamed or moved
+store = problems_dir+'results.sqlite'
+
+# Select algorithms to run (GSAT, WalkSAT, DPLL, CDCL, ProbSAT, NoveltyPlus, Portfolio, which races the other
+# algorithms, and/or ParallelGSAT and ParallelWalkSAT, which spread the local search over worker processes)
+algorithms = ['GSAT', 'WalkSAT', 'DPLL', 'CDCL']
+
+# All selectable algorithms and those running in processes of their own. NOTE: Same as batch.ALL_ALGORITHMS and
+# batch.MULTIPROCESS_ALGORITHMS, repeated such that batch.py (and NumPy) is not imported at startup
+all_algorithms = ['GSAT', 'WalkSAT', 'DPLL', 'CDCL', 'ProbSAT', 'NoveltyPlus', 'Portfolio', 'ParallelGSAT',
+                  'ParallelWalkSAT']
+multiprocess_algorithms = ['Portfolio', 'ParallelGSAT', 'ParallelWalkSAT']
+
+# Preprocess the sentences before solving them (see preprocess.py): False, True for all preprocessing steps, or
+# dictionary switching steps on or off, e.g. {'elimination': False}
+preprocess = False
+
+# Random seed of the local search algorithms, set before every run such that results are reproducible (None = not
+# seeded)
+seed = None
+
+# Batch mode settings: number of worker processes (None = number of CPUs) and wall-clock and CPU time limits per job in
+# seconds (None = no limit)
+batch = False
+workers = None
+timeout = None
+cpu_timeout = None
+
+# Profile every algorithm run and aggregate the profiles per algorithm and C/N ratio: None, 'cprofile' or 'sample', see
+# profiling.py. NOTE: The profiler slows the algorithms down, so the results database is neither read nor written when
+# profiling
+profile = None
+
+# Plot file, written without opening a window
+plot_file = 'CNratio_CPUtime.png'
+
+# Plot styles per algorithm
+styles = {'GSAT': 'ok-', 'WalkSAT': 'sr--', 'DPLL': 'db-.', 'CDCL': '^g:', 'ProbSAT': 'pc--', 'NoveltyPlus': 'hy-.',
+          'Portfolio': 'vm-', 'ParallelGSAT': 'ok:', 'ParallelWalkSAT': 'sr:'}
+
+
+def seedAll(seed):
+    """
+    Seeds the random number generators of Python and NumPy, if a seed is given.
+
+    :param seed: random seed, or None
+    :return:
+    """
 
+    if seed is not None:
+        import random
+        import numpy.random
+        random.seed(seed)
+        numpy.random.seed(seed)
+
+
+def solveFile(filename, algorithms=algorithms, preprocess=preprocess, seed=seed, budget=None, decompose=False,
+              workers=workers, write=True, profile=profile):
+    """
+    Solves a single problem file with the selected algorithms and writes the output files.
+
+    :param filename: problem file name string
+    :param algorithms: list of algorithm name strings
+    :param preprocess: preprocessing settings, see batch.runAlgorithm()
+    :param seed: random seed set before every run, or None
+    :param budget: optional wall-clock time budget per algorithm in seconds, in which case the algorithm runs in anytime
+    mode (see anytime.py) instead of with the iteration limits of SAT.py, and the best assignment found is written as
+    partial result if there is no decision. Preprocessing is not applied in anytime mode
+    :param decompose: if True, solve the variable-disjoint components of the sentence separately (see decompose.py),
+    unless a budget is given. Preprocessing is not applied to the components
+    :param workers: number of worker processes solving the components, None for the number of CPUs. With more than one
+    worker, the wall-clock time is recorded, as the CPU time is spent in the workers
+    :param write: if True, write the output file of every algorithm
+    :param profile: profiling mode ('cprofile' or 'sample') in which every algorithm is profiled, writing its profile
+    file next to its output file (see profiling.py), or None
+    :return: list of (algorithm, solution, time, unsat) tuples, the solution being 1 (= satisfiable), 0
+    (= unsatisfiable) or -1 (= no decision), and unsat the number of False clauses of the partial result, or None if
+    there is none
+    """
+
+    from time import perf_counter, process_time
+    from functions import writeFile
+    from cnf import CNF
+    from batch import runAlgorithm, numWorkers
+    from results import solutionStatus
+
+    sentence = CNF.read(filename)
+    N, C = sentence.N, sentence.C
+    solved = []
+
+    for algorithm in algorithms:
+        stats = dict()
+        best = None
+        seedAll(seed)
+        if profile:
+            from profiling import Profiler
+            profiler = Profiler(profile)
+            profiler.start()
+        t0 = process_time()
+        w0 = perf_counter()
+        if budget is not None:
+            from anytime import solveWithin
+            V, best = solveWithin(algorithm, N, sentence, wall=budget, stats=stats)
+        elif decompose:
+            from decompose import solveComponents
+            V = solveComponents(N, sentence, algorithm, workers, seed, stats)
         else:
-            print('Output files already exist.')
+            V = runAlgorithm(algorithm, N, sentence, stats, preprocess)
+        T = process_time() - t0
+        if profile:
+            profiler.stop()
+            profiler.dump(filename, algorithm)
+        # NOTE: The portfolio, the parallel modes and the parallel decomposition run in other processes, so their
+        # wall-clock time is recorded
+        if algorithm in multiprocess_algorithms:
+            T = stats['time']
+        elif decompose and budget is None and (workers if workers is not None else numWorkers()) > 1:
+            T = perf_counter() - w0
 
+        if write:
+            writeFile(filename, algorithm, N, C, V, T, stats, best)
+        solution = solutionStatus(V, N)
+        unsat = best['unsat'] if solution == -1 and best is not None and best['model'] is not None else None
+        solved.append((algorithm, solution, T, unsat))
 
-# Initialize dictionaries to store number of variables N, number of clauses C and execution time T for each problem
-GSATdata = dict()
-WalkSATdata = dict()
-DPLLdata = dict()
+    return solved
 
-# Read output files and collect ratio C/N and corresponding execution time T
-for file in files:
-    if file.endswith('.solGSAT'):
-        N,C,T = readSolFile(problems_dir+file)
-        if not [N,C,T]==[False]*3:
-            if C/N in GSATdata.keys():
-                GSATdata[C/N].append(T)
-            else:
-                GSATdata[C/N] = [T]
-    elif file.endswith('.solWalkSAT'):
-        N,C,T = readSolFile(problems_dir+file)
-        if not [N,C,T]==[False]*3:
-            if C/N in WalkSATdata.keys():
-                WalkSATdata[C/N].append(T)
-            else:
-                WalkSATdata[C/N] = [T]
-    elif file.endswith('.solDPLL'):
-        N,C,T = readSolFile(problems_dir+file)
-        if not [N,C,T]==[False]*3:
-            if C/N in DPLLdata.keys():
-                DPLLdata[C/N].append(T)
+
+def sweep(problems_dir=problems_dir, algorithms=algorithms, store=store, preprocess=preprocess, seed=seed, batch=batch,
+          workers=workers, timeout=timeout, cpu_timeout=cpu_timeout, profile=profile):
+    """
+    Solves all problems of a directory with the selected algorithms, skipping the problems of which the results are in
+    the results database.
+
+    :param problems_dir: problems directory string
+    :param algorithms: list of algorithm name strings
+    :param store: results database file name string
+    :param preprocess: preprocessing settings, see batch.runAlgorithm()
+    :param seed: random seed set before every run, or None
+    :param batch: if True, spread the (problem, algorithm) jobs over worker processes, see batch.py
+    :param workers: number of worker processes in batch mode, None for the number of CPUs
+    :param timeout: wall-clock time limit per job in batch mode in seconds, or None
+    :param cpu_timeout: CPU time limit per job in batch mode in seconds, or None
+    :param profile: profiling mode ('cprofile' or 'sample') in which every run is profiled, writing the profile files
+    next to the output files and aggregating the profiles per algorithm and C/N ratio in the problems directory (see
+    profiling.py), or None. When profiling, all problems are solved and the results database is not used
+    :return:
+    """
+
+    from os import listdir
+    from time import process_time
+    from functions import writeFile
+    from cnf import CNF
+    from dimacs import isCNF
+    from batch import runBatch, runAlgorithm, algorithmParams
+    from results import ResultStore, formulaHash
+
+    # In batch mode, spread the (problem, algorithm) jobs over worker processes with a time limit per job
+    if batch:
+        runBatch(problems_dir, algorithms, workers=workers, timeout=timeout, cpu_timeout=cpu_timeout, store=store,
+                 preprocess=preprocess, seed=seed, profile=profile)
+        return
+
+    if profile:
+        from profiling import Profiler, ProfileAggregate
+        profiles = ProfileAggregate()
+
+    # Else, solve the problems one after another
+    with ResultStore(store) as results:
+        # Loop through all files
+        for file in sorted(listdir(problems_dir)):
+            # If file is 3SAT problem file in cnf format (possibly compressed, like in batch mode), solve the problem
+            # using the selected algorithms
+            if isCNF(file):
+                print('Solving problem: '+file)
+                filename = problems_dir+file
+
+                # Get number of variables, number of clauses and the sentence, stored as compact CNF object shared by
+                # all algorithms
+                sentence = CNF.read(filename)
+                N, C = sentence.N, sentence.C
+                formula = formulaHash(N, sentence)
+
+                for algorithm in algorithms:
+                    # If a result exists for this problem, algorithm and parameters, skip the algorithm
+                    params = algorithmParams(algorithm, N, preprocess, seed)
+                    if not profile and results.get(formula, algorithm, params) is not None:
+                        print(algorithm+' result already exists.')
+                        continue
+
+                    # Run and time the algorithm and save results. NOTE: the time of the portfolio is the wall-clock
+                    # time until the first definitive answer, as the engines run in parallel processes
+                    print('Running '+algorithm)
+                    stats = dict()
+                    seedAll(seed)
+                    if profile:
+                        profiler = Profiler(profile)
+                        profiler.start()
+                    t0 = process_time()
+                    V = runAlgorithm(algorithm, N, sentence, stats, preprocess)
+                    T = process_time() - t0
+                    if profile:
+                        profiler.stop()
+                    if algorithm in multiprocess_algorithms:
+                        T = stats['time']
+                    writeFile(filename, algorithm, N, C, V, T, stats)
+
+                    # Profiled times are not representative, so they are not stored
+                    if profile:
+                        profiles.add(algorithm, N, C, *profiler.dump(filename, algorithm))
+                    else:
+                        results.put(formula, algorithm, params, N, C, V, T, stats, filename)
+
+    if profile:
+        profiles.write(problems_dir)
+
+
+def plot(store=store, algorithms=algorithms, output=plot_file, show=False):
+    """
+    Plots the average CPU time per algorithm versus the ratio C/N of all solved problems in the results database.
+
+    :param store: results database file name string
+    :param algorithms: list of algorithm name strings
+    :param output: plot file name string, or None to not save the plot
+    :param show: if True, also show the plot in a window
+    :return:
+    """
+
+    from results import ResultStore
+
+    # NOTE: Without a window, the non-interactive backend is selected before pyplot is imported, such that no display
+    # is needed
+    import matplotlib
+    if not show:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    # Average execution time T per algorithm and ratio C/N over all solved problems, obtained from the results database
+    with ResultStore(store) as results:
+        data = results.meanTimes(algorithms)
+
+    # Plot results
+    plt.figure(1)
+    for algorithm in algorithms:
+        if algorithm in data:
+            x, y = zip(*data[algorithm])
+            plt.plot(x, y, styles.get(algorithm, 'o-'), label=algorithm)
+
+    plt.xlabel('Ratio of clauses to variables, C/N [-]')
+    plt.ylabel('Average algorithm CPU time, t [sec]')
+    plt.legend(loc='upper right')
+    plt.grid(True)
+
+    if output is not None:
+        plt.savefig(output, bbox_inches='tight')
+    if show:
+        plt.show()
+    plt.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Solve SAT problems in DIMACS format and plot the solving times.')
+    subparsers = parser.add_subparsers(dest='command')
+
+    solve = subparsers.add_parser('solve', help='solve a single problem file and write its output files')
+    solve.add_argument('file', help='problem file (.cnf, possibly compressed)')
+    solve.add_argument('--algo', nargs='+', default=algorithms, choices=all_algorithms, metavar='ALGO',
+                       help='algorithms to run, from %(choices)s (default: %(default)s)')
+    solve.add_argument('--seed', type=int, default=seed, help='random seed (default: not seeded)')
+    solve.add_argument('--budget', type=float, help='wall-clock time budget per algorithm in seconds, runs the '
+                                                    'algorithms in anytime mode')
+    solve.add_argument('--preprocess', action='store_true', default=preprocess, help='preprocess the sentence')
+    solve.add_argument('--decompose', action='store_true', help='solve the variable-disjoint components separately')
+    solve.add_argument('-j', '--workers', type=int, default=1, help='number of worker processes solving the '
+                                                                    'components (default: %(default)s)')
+    solve.add_argument('--no-write', action='store_true', help='do not write the output files')
+    solve.add_argument('--profile', nargs='?', const='cprofile', default=profile, choices=['cprofile', 'sample'],
+                       help='profile every algorithm with cProfile (default) or the stack sampler, writing the profile '
+                            'files next to the output files')
+
+    sweeping = subparsers.add_parser('sweep', help='solve all problems of a directory, caching the results')
+    sweeping.add_argument('directory', nargs='?', default=problems_dir, help='problems directory (default: '
+                                                                              '%(default)s)')
+    sweeping.add_argument('--algo', nargs='+', default=algorithms, choices=all_algorithms, metavar='ALGO',
+                          help='algorithms to run, from %(choices)s (default: %(default)s)')
+    sweeping.add_argument('--store', help='results database (default: results.sqlite in the problems directory)')
+    sweeping.add_argument('--seed', type=int, default=seed, help='random seed (default: not seeded)')
+    sweeping.add_argument('--preprocess', action='store_true', default=preprocess, help='preprocess the sentences')
+    sweeping.add_argument('--batch', action='store_true', default=batch, help='solve in parallel worker processes')
+    sweeping.add_argument('-j', '--workers', type=int, default=workers, help='number of worker processes in batch '
+                                                                             'mode (default: number of CPUs)')
+    sweeping.add_argument('--timeout', type=float, default=timeout, help='wall-clock time limit per job in batch mode')
+    sweeping.add_argument('--cpu-timeout', type=float, default=cpu_timeout, help='CPU time limit per job in batch '
+                                                                                 'mode')
+    sweeping.add_argument('--profile', nargs='?', const='cprofile', default=profile, choices=['cprofile', 'sample'],
+                          help='profile every run with cProfile (default) or the stack sampler and aggregate the '
+                               'profiles per algorithm and C/N ratio (ignores the results database)')
+
+    plotting = subparsers.add_parser('plot', help='plot the average CPU time versus C/N from the results database')
+    plotting.add_argument('--store', default=store, help='results database (default: %(default)s)')
+    plotting.add_argument('--algo', nargs='+', default=algorithms, choices=all_algorithms, metavar='ALGO',
+                          help='algorithms to plot, from %(choices)s (default: %(default)s)')
+    plotting.add_argument('-o', '--output', default=plot_file, help='plot file (default: %(default)s)')
+    plotting.add_argument('--show', action='store_true', help='also show the plot in a window')
+
+    cubing = subparsers.add_parser('cube', help='solve a single problem file with cube-and-conquer DPLL')
+    cubing.add_argument('file', help='problem file (.cnf, possibly compressed)')
+    cubing.add_argument('-j', '--workers', type=int, default=workers, help='number of worker processes solving the '
+                                                                           'cubes (default: number of CPUs)')
+    cubing.add_argument('--depth', type=int, help='maximum number of split variables per cube (default: about 8 '
+                                                  'cubes per worker)')
+    cubing.add_argument('--candidates', type=int, default=20, help='number of variables looked ahead on per split '
+                                                                   '(default: %(default)s)')
+    cubing.add_argument('--no-write', action='store_true', help='do not write the output file')
+
+    counting = subparsers.add_parser('count', help='count the models of a single problem file')
+    counting.add_argument('file', help='problem file (.cnf, possibly compressed)')
+    counting.add_argument('--approximate', action='store_true', help='estimate the count with random probes')
+    counting.add_argument('--samples', type=int, default=1000, help='number of probes (default: %(default)s)')
+    counting.add_argument('--exact', type=int, default=30, help='components of at most this many variables are '
+                          'counted exactly in approximate mode (default: %(default)s)')
+    counting.add_argument('--cache-size', type=int, default=1000000, help='maximum total number of literals of the '
+                          'cached components (default: %(default)s)')
+    counting.add_argument('--seed', type=int, default=seed, help='random seed (default: not seeded)')
+
+    args = parser.parse_args(argv)
+
+    if args.command in ('solve', 'sweep', 'cube') and args.workers is not None and args.workers < 1:
+        parser.error('the number of worker processes (-j) must be at least 1')
+
+    # NOTE: The portfolio and the parallel modes run in processes of their own, the portfolio with its own time limit
+    for algorithm in args.algo if args.command in ('solve', 'sweep') else []:
+        if algorithm not in multiprocess_algorithms:
+            continue
+        if args.command == 'solve' and args.budget is not None:
+            parser.error('the %s algorithm cannot run with --budget' % algorithm)
+        if args.command == 'solve' and args.decompose and args.workers != 1:
+            parser.error('the %s algorithm cannot solve components in worker processes (-j 1)' % algorithm)
+        if args.command == 'sweep' and args.batch:
+            parser.error('the %s algorithm cannot run in batch mode' % algorithm)
+
+    if args.command == 'solve':
+        for algorithm, solution, T, unsat in solveFile(args.file, args.algo, args.preprocess, args.seed, args.budget,
+                                                       args.decompose, args.workers, not args.no_write, args.profile):
+            if unsat is not None:
+                print('%s: partial, %d clause(s) not satisfied in %.4f s' % (algorithm, unsat, T))
             else:
-                DPLLdata[C/N] = [T]
-    else:
-        continue
+                print('%s: %d in %.4f s' % (algorithm, solution, T))
+
+    elif args.command == 'sweep':
+        directory = args.directory if args.directory.endswith('/') else args.directory+'/'
+        sweep(directory, args.algo, args.store or directory+'results.sqlite', args.preprocess, args.seed, args.batch,
+              args.workers, args.timeout, args.cpu_timeout, args.profile)
+        print('Done.')
 
-print('Done.')
-print('Plotting ...')
+    elif args.command == 'plot':
+        plot(args.store, args.algo, args.output, args.show)
+        print('Plot written to '+args.output)
 
-# Plot results
-plt.figure(1)
-x = [key for key in list(zip(*sorted(GSATdata.items())))[0]]
-y = [mean(value) for value in list(zip(*sorted(GSATdata.items())))[1]]
-plt.plot(x,y,'ok-',label='GSAT')
+    elif args.command == 'cube':
+        from time import perf_counter
+        from functions import writeFile
+        from cnf import CNF
+        from cube import cubeAndConquer
+        from results import solutionStatus
+        sentence = CNF.read(args.file)
+        stats = dict()
+        t0 = perf_counter()
+        V = cubeAndConquer(sentence.N, sentence, args.workers, args.depth, args.candidates, stats=stats, verbose=True)
+        # NOTE: The work is spread over processes, so the wall-clock time is recorded like for the portfolio
+        T = perf_counter() - t0
+        if not args.no_write:
+            writeFile(args.file, 'Cube', sentence.N, sentence.C, V, T, stats)
+        print('Cube: %d in %.4f s' % (solutionStatus(V, sentence.N), T))
 
-x = [key for key in list(zip(*sorted(WalkSATdata.items())))[0]]
-y = [mean(value) for value in list(zip(*sorted(WalkSATdata.items())))[1]]
-plt.plot(x,y,'sr--',label='WalkSAT')
+    elif args.command == 'count':
+        from time import process_time
+        from cnf import CNF
+        from count import countModels
+        sentence = CNF.read(args.file)
+        stats = dict()
+        t0 = process_time()
+        count, error = countModels(sentence.N, sentence, args.approximate, args.samples, args.exact, args.cache_size,
+                                   args.seed, stats)
+        print('Models: %d%s in %.4f s' % (count, ' +- %d' % error if args.approximate else '', process_time() - t0))
+        print('Statistics: %s' % stats)
 
-x = [key for key in list(zip(*sorted(DPLLdata.items())))[0]]
-y = [mean(value) for value in list(zip(*sorted(DPLLdata.items())))[1]]
-plt.plot(x,y,'db-.',label='DPLL')
+    # Without a subcommand, run the whole experiment with the settings above
+    else:
+        sweep()
+        print('Done.')
+        print('Plotting ...')
+        plot()
+        print('Done.')
 
-plt.xlabel('Ratio of clauses to variables, C/N [-]')
-plt.ylabel('Average algorithm CPU time, t [sec]')
-plt.legend(loc='upper right')
-plt.grid(True)
-plt.show()
+    return 0
 
-#plt.savefig('CNratio_CPUtime.png', bbox_inches='tight')
 
-print('Done.')
+if __name__ == '__main__':
+    sys.exit(main())
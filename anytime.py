@@ -0,0 +1,137 @@
+########################################################################################################################
+#
+#   File name:      anytime.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the anytime mode: an algorithm runs until it finds a definitive answer or a wall-clock and/or CPU
+time budget runs out, instead of being limited to a number of restarts, climbs or flips. The local search algorithms
+keep the best assignment they have seen, which is returned together with its number of False clauses if no solution is
+found in time. With clause weights, MaxWalkSAT minimizes the total weight of the False clauses (weighted MaxSAT).
+
+The budget is checked cooperatively by the algorithms themselves through their stop event, so no process has to be
+killed and the best assignment is not lost.
+"""
+
+import sys
+from time import perf_counter, process_time
+from functions import GSAT, WalkSAT, DPLLInit, CDCLInit
+from localsearch import ProbSAT, NoveltyPlus, MaxWalkSAT
+from batch import algorithmParams
+
+
+# Algorithms that can be run in anytime mode, the local search algorithms returning their best assignment
+LOCAL_SEARCH = ['GSAT', 'WalkSAT', 'ProbSAT', 'NoveltyPlus', 'MaxWalkSAT']
+ANYTIME_ALGORITHMS = LOCAL_SEARCH + ['DPLL', 'CDCL']
+
+
+class Budget:
+    """
+    Time budget that behaves like an event (e.g. multiprocessing.Event) for the stop argument of the algorithms: it is
+    set when the wall-clock or CPU time limit is exceeded, or when an external event is set (cooperative cancellation).
+
+    NOTE: The method is called is_set() rather than isSet(), such that a Budget can be used wherever an event is.
+    """
+
+    def __init__(self, wall=None, cpu=None, event=None):
+        """
+        Starts the budget.
+
+        :param wall: wall-clock time limit in seconds, or None
+        :param cpu: CPU time limit of this process in seconds, or None
+        :param event: optional external event that cancels the search when set
+        """
+
+        self.wallDeadline = perf_counter() + wall if wall is not None else None
+        self.cpuDeadline = process_time() + cpu if cpu is not None else None
+        self.event = event
+
+    def is_set(self):
+        """
+        :return: True if the budget is exhausted or the search is cancelled, False otherwise
+        """
+
+        return ((self.event is not None and self.event.is_set()) or
+                (self.wallDeadline is not None and perf_counter() >= self.wallDeadline) or
+                (self.cpuDeadline is not None and process_time() >= self.cpuDeadline))
+
+    def remaining(self):
+        """
+        :return: remaining wall-clock time in seconds (None if unlimited), at least 0
+        """
+
+        if self.wallDeadline is None:
+            return None
+        return max(self.wallDeadline - perf_counter(), 0.0)
+
+
+def solveWithin(algorithm, N, sentence, wall=None, cpu=None, weights=None, stop=None, stats=None):
+    """
+    Runs an algorithm in anytime mode: without a limit on the number of restarts, climbs or flips, until it finds a
+    definitive answer, the wall-clock or CPU time budget runs out or the stop event is set. The local search algorithms
+    use the parameters of SAT.py otherwise (see batch.algorithmParams()), MaxWalkSAT uses p = 0.5.
+
+    Besides the answer of the algorithm, the best assignment found is returned: the model for a satisfiable answer, the
+    assignment with the fewest False clauses (or lowest cost with weights) seen by a local search algorithm otherwise.
+    DPLL and CDCL have no complete assignment to return if they are stopped.
+
+    :param algorithm: algorithm name string, see ANYTIME_ALGORITHMS
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param wall: wall-clock time budget in seconds, or None
+    :param cpu: CPU time budget in seconds, or None
+    :param weights: optional list of positive clause weights, one per clause, for MaxWalkSAT only (all weights 1 if
+    None)
+    :param stop: optional external event (e.g. multiprocessing.Event) that cancels the search when set
+    :param stats: optional dictionary to which the solver counters are added
+    :return V: model or, if no solution found, 0 (= unsatisfiable) or -1 (= no decision), as returned by the algorithm
+    :return best: dictionary with the best assignment ('model', list of (boolean) truth assignments ordered by variable
+    number, None if there is none), its number of False clauses ('unsat') and their total weight ('cost')
+    """
+
+    if algorithm not in ANYTIME_ALGORITHMS:
+        raise ValueError('Unknown algorithm: '+str(algorithm)+'. Choose from '+', '.join(ANYTIME_ALGORITHMS))
+    if weights is not None and algorithm != 'MaxWalkSAT':
+        raise ValueError('Clause weights are only supported by MaxWalkSAT')
+
+    budget = Budget(wall, cpu, stop)
+    incumbent = dict()
+
+    # NOTE: The iteration limits are lifted, only the budget ends the search
+    if algorithm == 'GSAT':
+        params = algorithmParams(algorithm, N)
+        V = GSAT(N, sentence, sys.maxsize, params['max_climbs'], budget, stats, incumbent=incumbent)
+    elif algorithm == 'MaxWalkSAT':
+        if weights is None:
+            weights = [1]*len(sentence)
+        V = MaxWalkSAT(N, sentence, weights, sys.maxsize, stop=budget, stats=stats, incumbent=incumbent)
+    elif algorithm in LOCAL_SEARCH:
+        params = algorithmParams(algorithm, N)
+        params['max_flips'] = sys.maxsize
+        search = {'WalkSAT': WalkSAT, 'ProbSAT': ProbSAT, 'NoveltyPlus': NoveltyPlus}[algorithm]
+        V = search(N, sentence, stop=budget, stats=stats, incumbent=incumbent, **params)
+    else:
+        search = DPLLInit if algorithm == 'DPLL' else CDCLInit
+        V = search(N, sentence, stats=stats, stop=budget)
+        # DPLL and CDCL return an empty list if the sentence is unsatisfiable and signed literals otherwise
+        if isinstance(V, list) and not V and N > 0:
+            V = 0
+        elif isinstance(V, list):
+            V = [literal > 0 for literal in V]
+
+    if isinstance(V, list):
+        incumbent = {'model': V, 'unsat': 0, 'cost': 0}
+    elif 'model' in incumbent:
+        if 'cost' not in incumbent:
+            incumbent['cost'] = incumbent['unsat']
+    else:
+        incumbent = {'model': None, 'unsat': None, 'cost': None}
+
+    return V, incumbent
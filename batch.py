@@ -0,0 +1,364 @@
+########################################################################################################################
+#
+#   File name:      batch.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the batch execution mode of SAT.py: every (problem, algorithm) pair of a problems directory is solved
+as a separate job, the jobs being spread over a pool of worker processes sized to the machine. Every job runs in its own
+process, such that a per-job wall-clock and CPU time limit can be enforced by killing it, in which case "no decision"
+(-1) is recorded. Output files are written as soon as jobs finish. Optionally, results are cached in the results
+database (see results.py), in which case jobs already solved for the same formula content are not rerun. In profiling
+mode, every job is profiled in its worker process and the profiles are aggregated (see profiling.py).
+"""
+
+import os
+import random
+import numpy.random
+from collections import deque
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from time import perf_counter, process_time
+from functions import readFile, writeFile, GSAT, WalkSAT, DPLLInit, CDCLInit
+from localsearch import ProbSAT, NoveltyPlus
+from dimacs import isCNF, stripCompression
+from cnf import CNF
+from preprocess import Preprocessor
+from results import ResultStore, formulaHash, solutionStatus
+from profiling import Profiler, ProfileAggregate, profileFiles
+
+try:
+    import resource     # CPU time limits, only available on Unix
+except ImportError:
+    resource = None
+
+
+# Algorithms with the parameters used by SAT.py: the default selection and all selectable algorithms
+ALGORITHMS = ['GSAT', 'WalkSAT', 'DPLL', 'CDCL']
+ALL_ALGORITHMS = ALGORITHMS + ['ProbSAT', 'NoveltyPlus', 'Portfolio', 'ParallelGSAT', 'ParallelWalkSAT']
+
+# Algorithms that run in processes of their own (see portfolio.py and parallel.py), of which the wall-clock time is
+# recorded. NOTE: They cannot run in batch jobs or component workers, as those (daemonic) processes cannot start them
+MULTIPROCESS_ALGORITHMS = ['Portfolio', 'ParallelGSAT', 'ParallelWalkSAT']
+
+
+def algorithmParams(algorithm, N, preprocess=None, seed=None):
+    """
+    Returns the parameters used by SAT.py for one of the algorithms.
+
+    :param algorithm: algorithm name string, see ALL_ALGORITHMS
+    :param N: number of variables
+    :param preprocess: preprocessing settings, see runAlgorithm()
+    :param seed: random seed set before running the algorithm, or None
+    :return: dictionary of parameters
+    """
+
+    # NOTE: The parallel modes spread the same total budget over their workers
+    if algorithm in ('GSAT', 'ParallelGSAT'):
+        params = {'max_restarts': 20, 'max_climbs': 5*N}
+    elif algorithm in ('WalkSAT', 'ParallelWalkSAT'):
+        params = {'p': 0.5, 'max_flips': 200*N}
+    elif algorithm == 'ProbSAT':
+        params = {'max_flips': 200*N, 'mode': 'poly', 'cb': 2.38, 'eps': 1.0}
+    elif algorithm == 'NoveltyPlus':
+        params = {'max_flips': 200*N, 'wp': 0.01, 'adaptive': True}
+    elif algorithm in ('DPLL', 'CDCL', 'Portfolio'):
+        params = dict()
+    else:
+        raise ValueError('Unknown algorithm: '+str(algorithm)+'. Choose from '+', '.join(ALL_ALGORITHMS))
+
+    # NOTE: Preprocessing is part of the parameters, such that results with and without it are stored separately
+    if preprocess:
+        params['preprocess'] = preprocess if isinstance(preprocess, dict) else True
+    # Likewise, a seeded run is only a cache hit for a run with the same seed, and unseeded runs are cached as before
+    if seed is not None:
+        params['seed'] = seed
+
+    return params
+
+
+def runAlgorithm(algorithm, N, sentence, stats=None, preprocess=None):
+    """
+    Runs one of the algorithms with the parameters used by SAT.py, optionally after preprocessing the sentence (see
+    preprocess.py). The model found for the preprocessed sentence is extended to a model of the original sentence.
+
+    :param algorithm: algorithm name string, see ALL_ALGORITHMS
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param stats: optional dictionary to which the solver counters are added
+    :param preprocess: None or False for no preprocessing, True for all preprocessing steps, or dictionary of keyword
+    arguments of Preprocessor switching steps on or off (e.g. {'elimination': False})
+    :return: model or, if no solution found, 0 (= unsatisfiable) or -1 (= no decision), as returned by the algorithm
+    """
+
+    if preprocess:
+        preprocessor = Preprocessor(N, sentence, **(preprocess if isinstance(preprocess, dict) else dict()))
+        satisfiable = preprocessor.run()
+        if stats is not None:
+            stats.update(('pre_'+key, value) for key, value in preprocessor.stats.items())
+        if not satisfiable:
+            return 0
+
+        V = runAlgorithm(algorithm, N, preprocessor.sentence(), stats)
+        # NOTE: DPLL and CDCL return an empty list if the sentence is unsatisfiable
+        if isinstance(V, list) and (V or N == 0):
+            V = preprocessor.reconstruct(V)
+        return V
+
+    params = algorithmParams(algorithm, N)
+    if algorithm == 'GSAT':
+        return GSAT(N, sentence, stats=stats, **params)
+    elif algorithm == 'WalkSAT':
+        return WalkSAT(N, sentence, stats=stats, **params)
+    elif algorithm == 'ProbSAT':
+        return ProbSAT(N, sentence, stats=stats, **params)
+    elif algorithm == 'NoveltyPlus':
+        return NoveltyPlus(N, sentence, stats=stats, **params)
+    elif algorithm == 'DPLL':
+        return DPLLInit(N, sentence, stats=stats)
+    elif algorithm == 'CDCL':
+        return CDCLInit(N, sentence, stats=stats)
+    elif algorithm in ('ParallelGSAT', 'ParallelWalkSAT'):
+        # NOTE: Imported here, because parallel.py imports this file. The seed of the first worker is drawn from the
+        # (possibly seeded) random number generator, such that seeded runs are reproducible
+        from parallel import parallelGSAT, parallelWalkSAT
+        search = parallelGSAT if algorithm == 'ParallelGSAT' else parallelWalkSAT
+        return search(N, sentence, seed=random.getrandbits(31), stats=stats, **params)
+    else:
+        # NOTE: Imported here, because the portfolio itself runs the other algorithms through this function
+        from portfolio import portfolio
+        V, winner, T = portfolio(N, sentence)
+        if stats is not None:
+            stats['winner'] = winner
+            stats['time'] = T
+        return V
+
+
+def numWorkers():
+    """
+    Returns the number of CPUs available to this process.
+
+    :return: number of CPUs
+    """
+
+    # NOTE: sched_getaffinity respects CPU affinity masks (e.g. in containers), but is not available on all platforms
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def batchWorker(filename, algorithm, cpu_timeout, store, preprocess, seed, profile, connection):
+    """
+    Worker process of a single job: reads the problem, runs the algorithm (unless a result is cached in the results
+    database) and sends the results to the parent process. If a CPU time limit is given, the process is killed by the
+    operating system (SIGXCPU) when it is exceeded.
+
+    :param filename: problem file name string
+    :param algorithm: algorithm name string
+    :param cpu_timeout: CPU time limit in seconds, or None
+    :param store: results database file name string, or None
+    :param preprocess: preprocessing settings, see runAlgorithm()
+    :param seed: random seed, or None
+    :param profile: profiling mode in which the algorithm is profiled, writing its profile file (see profiling.py), or
+    None
+    :param connection: pipe connection to the parent process
+    :return:
+    """
+
+    if cpu_timeout is not None and resource is not None:
+        limit = max(1, int(cpu_timeout + 0.999))
+        resource.setrlimit(resource.RLIMIT_CPU, (limit, resource.getrlimit(resource.RLIMIT_CPU)[1]))
+
+    sentence = CNF.read(filename)
+    N, C = sentence.N, sentence.C
+    formula = formulaHash(N, sentence)
+    # Send the problem size first, such that the parent can write the output file if the job is killed
+    connection.send(('start', N, C, formula))
+
+    # Return the cached result if there is one
+    if store is not None:
+        with ResultStore(store) as results:
+            cached = results.get(formula, algorithm, algorithmParams(algorithm, N, preprocess, seed))
+        if cached is not None:
+            connection.send(('cached', cached['V'], cached['time'], cached['counters']))
+            connection.close()
+            return
+
+    stats = dict()
+    if seed is not None:
+        random.seed(seed)
+        numpy.random.seed(seed)
+    profiler = Profiler(profile) if profile else None
+    if profiler is not None:
+        profiler.start()
+    t0 = process_time()
+    V = runAlgorithm(algorithm, N, sentence, stats, preprocess)
+    T = process_time() - t0
+    if profiler is not None:
+        profiler.stop()
+        profiler.dump(filename, algorithm)
+    # NOTE: The portfolio and the parallel modes run in other processes, so their wall-clock time is recorded instead
+    if algorithm in MULTIPROCESS_ALGORITHMS:
+        T = stats['time']
+
+    connection.send(('done', V, T, stats))
+    connection.close()
+
+
+def listJobs(problems_dir, algorithms, overwrite=False):
+    """
+    Lists the (problem, algorithm) jobs of a problems directory, skipping the ones for which an output file exists.
+
+    :param problems_dir: problems directory string
+    :param algorithms: list of algorithm name strings
+    :param overwrite: if True, also list the jobs for which an output file exists
+    :return jobs: list of (file name, algorithm) tuples
+    """
+
+    files = sorted(os.listdir(problems_dir))
+    jobs = []
+    for file in files:
+        if isCNF(file):
+            for algorithm in algorithms:
+                if overwrite or not files.count(stripCompression(file).replace('.cnf', '.sol'+algorithm)):
+                    jobs.append((os.path.join(problems_dir, file), algorithm))
+
+    return jobs
+
+
+def runBatch(problems_dir, algorithms=ALGORITHMS, workers=None, timeout=None, cpu_timeout=None, overwrite=False,
+             store=None, preprocess=None, seed=None, profile=None, verbose=True):
+    """
+    Solves all problems of a directory with the given algorithms in parallel worker processes and writes the output
+    files as the jobs finish. Jobs exceeding the wall-clock or CPU time limit are killed and recorded as "no decision".
+    If a results database is given, it replaces the output file existence checks: every job is listed, cached results
+    are reused and new results (except killed jobs) are stored.
+
+    In profiling mode, every job is profiled and the profiles are aggregated per algorithm and C/N ratio in the problems
+    directory, see profiling.py. All jobs are run and the results database is neither read nor written, as the
+    profiler slows the algorithms down.
+
+    :param problems_dir: problems directory string
+    :param algorithms: list of algorithm name strings
+    :param workers: number of worker processes, defaults to the number of available CPUs
+    :param timeout: wall-clock time limit per job in seconds, or None
+    :param cpu_timeout: CPU time limit per job in seconds, or None
+    :param overwrite: if True, also rerun the jobs for which an output file exists
+    :param store: results database file name string, or None
+    :param preprocess: preprocessing settings, see runAlgorithm()
+    :param seed: random seed set in every job before running the algorithm, such that results are reproducible, or
+    None
+    :param profile: profiling mode ('cprofile' or 'sample') in which every job is profiled, or None
+    :param verbose: if True, print progress and throughput (and the hottest functions in profiling mode)
+    :return results: list of (file name, algorithm, solution, time) tuples in order of completion, the solution being 1
+    (= satisfiable), 0 (= unsatisfiable) or -1 (= no decision)
+    """
+
+    # NOTE: The (daemonic) worker processes cannot start the processes of the portfolio or the parallel modes
+    for algorithm in algorithms:
+        if algorithm in MULTIPROCESS_ALGORITHMS:
+            raise ValueError('The '+algorithm+' algorithm cannot be run in batch mode')
+
+    if workers is None:
+        workers = numWorkers()
+    if workers < 1:
+        raise ValueError('Number of workers must be at least 1, got '+str(workers))
+    if profile:
+        overwrite, store = True, None
+
+    pending = deque(listJobs(problems_dir, algorithms, overwrite or store is not None))
+    total = len(pending)
+    running = dict()    # connection -> [file name, algorithm, process, start time, N, C, formula hash]
+    results = []
+    database = ResultStore(store) if store is not None else None
+    profiles = ProfileAggregate() if profile else None
+    t_start = perf_counter()
+
+    def finish(connection, V, T, stats=None, cached=False):
+        filename, algorithm, process, started, N, C, formula = running.pop(connection)
+        connection.close()
+        process.join()
+
+        # Record no decision if the worker did not report its problem size or result. NOTE: If the worker died because
+        # the problem file cannot be read, no output file can be written, but the batch carries on
+        error = None
+        if N is None:
+            try:
+                N, C, sentence = readFile(filename)
+            except Exception as exception:
+                error = type(exception).__name__+': '+str(exception)
+        if error is None:
+            writeFile(filename, algorithm, N, C, V, T, stats)
+        solution = solutionStatus(V, N)
+        results.append((filename, algorithm, solution, T))
+
+        # Store new results of jobs that were not killed
+        if database is not None and stats is not None and not cached:
+            params = algorithmParams(algorithm, N, preprocess, seed)
+            database.put(formula, algorithm, params, N, C, V, T, stats, filename)
+
+        # Aggregate the profile of jobs that were not killed
+        if profiles is not None and stats is not None:
+            profiles.add(algorithm, N, C, *profileFiles(filename, algorithm, profile))
+
+        if verbose:
+            elapsed = perf_counter() - t_start
+            print('[%d/%d] %s %s: %d in %.3f s%s (%.2f jobs/s)' %
+                  (len(results), total, os.path.basename(filename), algorithm, solution, T,
+                   ' (cached)' if cached else ' (unreadable problem, '+error+')' if error else '',
+                   len(results)/elapsed))
+
+    while pending or running:
+        # Start new jobs while there are free workers
+        while pending and len(running) < workers:
+            filename, algorithm = pending.popleft()
+            parent, child = Pipe(duplex=False)
+            process = Process(target=batchWorker, args=(filename, algorithm, cpu_timeout, store, preprocess, seed,
+                                                                profile, child), daemon=True)
+            process.start()
+            child.close()
+            running[parent] = [filename, algorithm, process, perf_counter(), None, None, None]
+
+        # Wait for messages, waking up in time to enforce the earliest wall-clock deadline
+        if timeout is not None:
+            earliest = min(job[3] for job in running.values()) + timeout
+            ready = wait(list(running), max(0.0, earliest - perf_counter()))
+        else:
+            ready = wait(list(running))
+
+        for connection in ready:
+            try:
+                message = connection.recv()
+            except EOFError:
+                # Worker died without result, e.g. killed for exceeding the CPU time limit
+                finish(connection, -1, perf_counter() - running[connection][3])
+                continue
+            if message[0] == 'start':
+                running[connection][4:7] = message[1:4]
+            else:
+                finish(connection, message[1], message[2], message[3], message[0] == 'cached')
+
+        # Kill jobs exceeding the wall-clock time limit
+        if timeout is not None:
+            now = perf_counter()
+            for connection in [c for c, job in running.items() if now - job[3] >= timeout]:
+                running[connection][2].kill()
+                finish(connection, -1, now - running[connection][3])
+
+    if database is not None:
+        database.close()
+
+    if verbose and total:
+        elapsed = perf_counter() - t_start
+        print('Solved %d jobs in %.2f s with %d workers (%.2f jobs/s)' % (total, elapsed, workers, total/elapsed))
+    if profiles is not None:
+        profiles.write(problems_dir, verbose)
+
+    return results
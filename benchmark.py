@@ -0,0 +1,285 @@
+########################################################################################################################
+#
+#   File name:      benchmark.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the reproducible benchmark suite. Random k-SAT instances are generated from a seed for a grid of
+numbers of variables N and ratios C/N (denser around the phase transition at C/N = 4.26), every algorithm is run several
+times per instance with fixed seeds after a number of warmup runs, and the median and 90th percentile of the wall-clock
+and CPU times and the success rate are reported per algorithm, N and ratio as JSON. Two result files can be compared to
+catch performance regressions.
+
+Usage:
+    python benchmark.py run [-o results.json] [--sizes 20 50] [--algorithms GSAT WalkSAT DPLL CDCL] ...
+    python benchmark.py compare baseline.json current.json [--threshold 0.1]
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+from time import perf_counter, process_time
+import numpy as np
+import numpy.random
+from batch import ALGORITHMS, ALL_ALGORITHMS, runAlgorithm
+from cnf import CNF
+
+
+# Ratio C/N of the satisfiability phase transition of random 3-SAT
+PHASE_TRANSITION = 4.26
+
+# Metrics compared by compareResults(): a higher value is worse for all times and better for the success rate
+TIME_METRICS = ['median_time', 'p90_time', 'median_cpu', 'p90_cpu']
+
+
+def randomKSAT(N, C, k=3, seed=None):
+    """
+    Generates a random k-SAT instance: every clause consists of k distinct variables drawn uniformly, each negated with
+    probability 0.5.
+
+    :param N: number of variables
+    :param C: number of clauses
+    :param k: number of literals per clause
+    :param seed: random seed (integer or string), or None
+    :return: list of clauses with literals represented by positive or negative integers
+    """
+
+    if k > N:
+        raise ValueError('Clause width k = '+str(k)+' exceeds the number of variables N = '+str(N))
+
+    generator = random.Random(seed)
+    variables = range(1, N+1)
+
+    return [[variable if generator.random() < 0.5 else -variable for variable in generator.sample(variables, k)]
+            for i in range(C)]
+
+
+def ratioGrid(low=3.0, high=6.0, step=0.5, dense=0.5, dense_step=0.1):
+    """
+    Returns a grid of ratios C/N, with a finer step around the phase transition.
+
+    :param low: lowest ratio
+    :param high: highest ratio
+    :param step: step of the coarse grid
+    :param dense: half width of the fine grid around the phase transition
+    :param dense_step: step of the fine grid
+    :return: sorted list of ratios
+    """
+
+    coarse = np.arange(low, high + step/2, step)
+    fine = np.arange(PHASE_TRANSITION - dense, PHASE_TRANSITION + dense + dense_step/2, dense_step)
+    ratios = [ratio for ratio in np.concatenate((coarse, fine)) if low <= ratio <= high]
+
+    # NOTE: Rounding removes floating point noise, such that equal ratios of both grids are merged
+    return sorted(set(round(float(ratio), 6) for ratio in ratios))
+
+
+def runSolver(algorithm, N, sentence, seed):
+    """
+    Runs and times a single solver run with seeded random number generators.
+
+    :param algorithm: algorithm name string
+    :param N: number of variables
+    :param sentence: CNF object
+    :param seed: random seed of the run
+    :return status: 1 (= satisfiable), 0 (= unsatisfiable) or -1 (= no decision)
+    :return wall: wall-clock time in seconds
+    :return cpu: CPU time in seconds
+    """
+
+    random.seed(seed)
+    numpy.random.seed(seed)
+
+    t0, c0 = perf_counter(), process_time()
+    V = runAlgorithm(algorithm, N, sentence)
+    wall, cpu = perf_counter() - t0, process_time() - c0
+
+    # NOTE: DPLL and CDCL return an empty list if the sentence is unsatisfiable
+    if isinstance(V, list):
+        status = 1 if V or N == 0 else 0
+    else:
+        status = V
+
+    return status, wall, cpu
+
+
+def summarize(runs):
+    """
+    Computes the statistics of a set of runs.
+
+    :param runs: list of (status, wall-clock time, CPU time) tuples
+    :return: dictionary with the number of runs, the success rate (fraction of runs with a definitive answer), the
+    fraction of satisfiable answers and the median and 90th percentile of the wall-clock and CPU times
+    """
+
+    status, wall, cpu = (np.array(values) for values in zip(*runs))
+
+    return {'runs': len(runs),
+            'success_rate': float(np.mean(status != -1)),
+            'sat_rate': float(np.mean(status == 1)),
+            'median_time': float(np.median(wall)),
+            'p90_time': float(np.percentile(wall, 90)),
+            'median_cpu': float(np.median(cpu)),
+            'p90_cpu': float(np.percentile(cpu, 90))}
+
+
+def runBenchmark(algorithms=ALGORITHMS, sizes=(20, 50), ratios=None, k=3, instances=5, repeats=3, warmup=1, seed=0,
+                 verbose=True):
+    """
+    Runs the benchmark: for every N and ratio, generates the instances and runs every algorithm repeats times on every
+    instance. Instance i of (N, ratio) and run r always use the same seeds, so results are reproducible.
+
+    :param algorithms: list of algorithm name strings
+    :param sizes: list of numbers of variables
+    :param ratios: list of ratios C/N, defaults to ratioGrid()
+    :param k: number of literals per clause
+    :param instances: number of instances per N and ratio
+    :param repeats: number of timed runs per algorithm and instance
+    :param warmup: number of untimed runs per algorithm before the timed runs
+    :param seed: base random seed
+    :param verbose: if True, print progress
+    :return: dictionary with the benchmark configuration and a list of results per algorithm, N and ratio, see
+    summarize()
+    """
+
+    if ratios is None:
+        ratios = ratioGrid()
+
+    config = {'algorithms': list(algorithms), 'sizes': list(sizes), 'ratios': list(ratios), 'k': k,
+              'instances': instances, 'repeats': repeats, 'warmup': warmup, 'seed': seed,
+              'python': platform.python_version(), 'machine': platform.machine()}
+    results = []
+
+    # Warm up caches, lazy imports and memory allocators with a small instance at the phase transition
+    if warmup:
+        N = min(sizes)
+        sentence = CNF.fromClauses(N, randomKSAT(N, round(PHASE_TRANSITION*N), k, seed='warmup'))
+        for algorithm in algorithms:
+            for i in range(warmup):
+                runSolver(algorithm, N, sentence, seed+i)
+
+    for N in sizes:
+        for ratio in ratios:
+            C = round(ratio*N)
+            # NOTE: random.Random() only accepts numbers and strings as seed, strings being hashed deterministically
+            sentences = [CNF.fromClauses(N, randomKSAT(N, C, k, seed='%d-%d-%d-%g-%d' % (seed, k, N, ratio, i)))
+                         for i in range(instances)]
+
+            for algorithm in algorithms:
+                runs = [runSolver(algorithm, N, sentence, seed+r) for sentence in sentences for r in range(repeats)]
+                result = {'algorithm': algorithm, 'N': N, 'C': C, 'ratio': ratio}
+                result.update(summarize(runs))
+                results.append(result)
+
+                if verbose:
+                    print('%-8s N=%-4d C/N=%-5g median %.4f s  p90 %.4f s  success %3.0f%%' %
+                          (algorithm, N, ratio, result['median_time'], result['p90_time'],
+                           100*result['success_rate']))
+
+    return {'config': config, 'results': results}
+
+
+def saveResults(benchmark, filename):
+    """
+    :param benchmark: benchmark dictionary, as returned by runBenchmark()
+    :param filename: output file name string
+    :return:
+    """
+
+    with open(filename, 'w') as file:
+        json.dump(benchmark, file, indent=2)
+
+
+def loadResults(filename):
+    """
+    :param filename: input file name string
+    :return: benchmark dictionary, as returned by runBenchmark()
+    """
+
+    with open(filename) as file:
+        return json.load(file)
+
+
+def compareResults(baseline, current, threshold=0.1, min_time=0.01):
+    """
+    Compares two benchmark results per algorithm, N and ratio. A time metric regresses if it increased by more than the
+    threshold (relative), the success rate regresses if it decreased by more than the threshold (absolute).
+
+    :param baseline: benchmark dictionary of the reference run
+    :param current: benchmark dictionary of the run to check
+    :param threshold: allowed relative time increase and absolute success rate decrease
+    :param min_time: times below this value in seconds are considered equal, as they are dominated by noise
+    :return: list of (algorithm, N, ratio, metric, baseline value, current value) tuples of all regressions
+    """
+
+    reference = {(result['algorithm'], result['N'], result['ratio']): result for result in baseline['results']}
+    regressions = []
+
+    for result in current['results']:
+        key = (result['algorithm'], result['N'], result['ratio'])
+        if key not in reference:
+            continue
+        old = reference[key]
+
+        for metric in TIME_METRICS:
+            if result[metric] > max(old[metric], min_time)*(1 + threshold):
+                regressions.append(key + (metric, old[metric], result[metric]))
+        if result['success_rate'] < old['success_rate'] - threshold:
+            regressions.append(key + ('success_rate', old['success_rate'], result['success_rate']))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Reproducible random k-SAT benchmark of the SAT algorithms.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='run the benchmark and write the results as JSON')
+    run.add_argument('-o', '--output', default='benchmark.json', help='output file (default: %(default)s)')
+    run.add_argument('--algorithms', nargs='+', default=ALGORITHMS, choices=ALL_ALGORITHMS, metavar='ALGO',
+                     help='algorithms to run, from %(choices)s (default: %(default)s)')
+    run.add_argument('--sizes', nargs='+', type=int, default=[20, 50], help='numbers of variables N')
+    run.add_argument('--ratios', nargs='+', type=float, help='ratios C/N (default: grid, denser around 4.26)')
+    run.add_argument('-k', type=int, default=3, help='literals per clause (default: %(default)s)')
+    run.add_argument('--instances', type=int, default=5, help='instances per N and ratio (default: %(default)s)')
+    run.add_argument('--repeats', type=int, default=3, help='runs per instance (default: %(default)s)')
+    run.add_argument('--warmup', type=int, default=1, help='untimed warmup runs (default: %(default)s)')
+    run.add_argument('--seed', type=int, default=0, help='base random seed (default: %(default)s)')
+
+    compare = subparsers.add_parser('compare', help='compare two result files, exit status 1 on regressions')
+    compare.add_argument('baseline', help='reference result file')
+    compare.add_argument('current', help='result file to check')
+    compare.add_argument('--threshold', type=float, default=0.1, help='allowed relative slowdown and absolute '
+                                                                      'success rate drop (default: %(default)s)')
+    compare.add_argument('--min-time', type=float, default=0.01, help='times below this value in seconds are '
+                                                                      'considered noise (default: %(default)s)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        benchmark = runBenchmark(args.algorithms, args.sizes, args.ratios, args.k, args.instances, args.repeats,
+                                 args.warmup, args.seed)
+        saveResults(benchmark, args.output)
+        print('Results written to '+args.output)
+        return 0
+
+    regressions = compareResults(loadResults(args.baseline), loadResults(args.current), args.threshold,
+                                 args.min_time)
+    for algorithm, N, ratio, metric, old, new in regressions:
+        print('REGRESSION %-8s N=%-4d C/N=%-5g %-12s %.4f -> %.4f' % (algorithm, N, ratio, metric, old, new))
+    print('%d regression(s) found' % len(regressions))
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
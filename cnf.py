@@ -0,0 +1,243 @@
+########################################################################################################################
+#
+#   File name:      cnf.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the compact, immutable CNF formula type shared by all solvers. The literals of all clauses are stored
+in one contiguous int buffer with clause offsets, and the occurrence lists of every literal are precomputed, such that
+solvers can use the formula directly instead of copying it.
+"""
+
+from array import array
+import numpy as np
+from dimacs import readDIMACS
+
+
+def paddedMatrix(literals, offsets):
+    """
+    Converts a flat literal array with clause offsets to a C x k matrix of signed integer literals, with k the maximum
+    clause width, without any Python-level loop over the clauses. Clauses shorter than k are padded with zeros.
+
+    :param literals: flat numpy array of all literals of all clauses
+    :param offsets: numpy array of length C+1, clause i consisting of literals[offsets[i]:offsets[i+1]]
+    :return: C x k numpy array of literals
+    """
+
+    widths = np.diff(offsets)
+    C = len(widths)
+    matrix = np.zeros((C, int(widths.max()) if C else 0), dtype=np.int32)
+
+    # Row of every literal is its clause, column its position in the clause
+    rows = np.repeat(np.arange(C), widths)
+    columns = np.arange(len(literals)) - np.repeat(offsets[:-1], widths)
+    matrix[rows, columns] = literals
+
+    return matrix
+
+
+class CNF:
+    """
+    Immutable CNF formula. Behaves like the list of clauses used throughout functions.py (len(), indexing and iteration
+    over the clauses), but stores all literals in a single read-only int buffer. Clause i is the read-only view
+    literals[offsets[i]:offsets[i+1]].
+
+    The occurrence lists of all literals are precomputed in compressed form (one buffer of clause indices with offsets
+    per literal). The occurrences attribute exposes them with the same layout as occurrenceIndex() in functions.py: a
+    tuple of length 2N+1 indexed directly by the literal, negative literals using Python's negative indexing.
+    """
+
+    __slots__ = ('N', 'C', 'literals', 'offsets', 'occurrenceClauses', 'occurrenceOffsets', 'simple', '_occurrences',
+                 '_matrix')
+
+    def __init__(self, N, literals, offsets):
+        """
+        Creates a formula from a flat literal array and clause offsets, as returned by readDIMACS() in dimacs.py.
+
+        :param N: number of variables
+        :param literals: flat array (array, numpy array or list) of all literals of all clauses
+        :param offsets: array of length C+1, clause i consisting of literals[offsets[i]:offsets[i+1]]
+        """
+
+        literals = np.asarray(literals, dtype=np.int32).ravel()
+        offsets = np.asarray(offsets, dtype=np.int64).ravel()
+        C = len(offsets) - 1
+
+        # Clause index of every literal
+        clause = np.repeat(np.arange(C, dtype=np.int64), np.diff(offsets))
+
+        # The formula is simple if no clause contains a variable more than once, i.e. no duplicate literals and no
+        # tautologies
+        simple = len(np.unique(np.abs(literals).astype(np.int64)*max(C, 1) + clause)) == len(literals)
+
+        # Occurrence lists in compressed form: the clauses containing literal l are
+        # occurrenceClauses[occurrenceOffsets[l+N]:occurrenceOffsets[l+N+1]]. Sorting the unique (literal, clause) pairs
+        # orders them by literal and then by clause, counting a clause once even if it contains a literal more than once
+        pairs = np.unique((literals.astype(np.int64) + N)*max(C, 1) + clause)
+        occurrenceClauses = pairs % max(C, 1)
+        occurrenceOffsets = np.zeros(2*N+2, dtype=np.int64)
+        occurrenceOffsets[1:] = np.cumsum(np.bincount(pairs // max(C, 1), minlength=2*N+1))
+
+        # NOTE: Setting attributes is only possible through object.__setattr__, see __setattr__()
+        object.__setattr__(self, 'N', N)
+        object.__setattr__(self, 'C', C)
+        object.__setattr__(self, 'literals', memoryview(array('i', literals.tobytes())).toreadonly())
+        object.__setattr__(self, 'offsets', memoryview(array('i', offsets.astype(np.int32).tobytes())).toreadonly())
+        object.__setattr__(self, 'occurrenceClauses',
+                           memoryview(array('i', occurrenceClauses.astype(np.int32).tobytes())).toreadonly())
+        object.__setattr__(self, 'occurrenceOffsets',
+                           memoryview(array('i', occurrenceOffsets.astype(np.int32).tobytes())).toreadonly())
+        object.__setattr__(self, 'simple', bool(simple))
+        object.__setattr__(self, '_occurrences', None)
+        object.__setattr__(self, '_matrix', None)
+
+    @classmethod
+    def fromClauses(cls, N, clauses):
+        """
+        Creates a formula from a list of clauses.
+
+        :param N: number of variables
+        :param clauses: list of clauses with literals represented by positive or negative integers
+        :return: CNF object
+        """
+
+        offsets = [0]
+        for clause in clauses:
+            offsets.append(offsets[-1] + len(clause))
+
+        return cls(N, [literal for clause in clauses for literal in clause], offsets)
+
+    @classmethod
+    def read(cls, filename, use_mmap=False):
+        """
+        Reads a (possibly compressed) problem file in DIMACS cnf format, see readDIMACS() in dimacs.py.
+
+        :param filename: file name string
+        :param use_mmap: if True, memory-map uncompressed files instead of reading them
+        :return: CNF object
+        """
+
+        N, C, literals, offsets = readDIMACS(filename, use_mmap)
+
+        return cls(N, literals, offsets)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('CNF objects are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('CNF objects are immutable')
+
+    def __reduce__(self):
+        # Pickle the literal buffers only, the occurrence lists are rebuilt when unpickling
+        return CNF, (self.N, array('i', self.literals.tobytes()), array('i', self.offsets.tobytes()))
+
+    def __len__(self):
+        return self.C
+
+    def __getitem__(self, i):
+        """
+        :param i: clause index
+        :return: read-only view of the literals of the clause
+        """
+
+        if i < 0:
+            i += self.C
+        if not 0 <= i < self.C:
+            raise IndexError('clause index out of range')
+
+        return self.literals[self.offsets[i]:self.offsets[i+1]]
+
+    def __iter__(self):
+        literals = self.literals
+        offsets = self.offsets
+        for i in range(self.C):
+            yield literals[offsets[i]:offsets[i+1]]
+
+    def __repr__(self):
+        return 'CNF(N='+str(self.N)+', C='+str(self.C)+')'
+
+    def occurrencesOf(self, literal):
+        """
+        :param literal: literal represented by a positive or negative integer
+        :return: read-only view of the indices of the clauses containing the literal
+        """
+
+        return self.occurrenceClauses[self.occurrenceOffsets[literal+self.N]:self.occurrenceOffsets[literal+self.N+1]]
+
+    def positive(self, variable):
+        """
+        :param variable: variable number
+        :return: indices of the clauses containing the positive literal of the variable
+        """
+
+        return self.occurrencesOf(variable)
+
+    def negative(self, variable):
+        """
+        :param variable: variable number
+        :return: indices of the clauses containing the negative literal of the variable
+        """
+
+        return self.occurrencesOf(-variable)
+
+    @property
+    def occurrences(self):
+        """
+        Occurrence lists of all literals as a tuple of length 2N+1 indexed directly by the literal, like the occurrence
+        lists of occurrenceIndex() in functions.py. Built from the compressed occurrence lists on first use and shared
+        afterwards.
+
+        :return: tuple of tuples of clause indices
+        """
+
+        if self._occurrences is None:
+            # Positions 1..N hold literals 1..N, positions N+1..2N hold literals -N..-1
+            literals = [0] + list(range(1, self.N+1)) + list(range(-self.N, 0))
+            occurrences = tuple(tuple(self.occurrencesOf(literal)) if literal else () for literal in literals)
+            object.__setattr__(self, '_occurrences', occurrences)
+
+        return self._occurrences
+
+    @property
+    def matrix(self):
+        """
+        Clauses as zero-padded C x k matrix of signed integer literals, see paddedMatrix(). Built on first use and
+        shared afterwards.
+
+        :return: read-only C x k numpy array of literals
+        """
+
+        if self._matrix is None:
+            matrix = paddedMatrix(np.frombuffer(self.literals, dtype=np.int32),
+                                  np.frombuffer(self.offsets, dtype=np.int32).astype(np.int64))
+            matrix.flags.writeable = False
+            object.__setattr__(self, '_matrix', matrix)
+
+        return self._matrix
+
+    def clauses(self):
+        """
+        Converts the formula to a list of clauses.
+
+        :return: list of clauses with literals represented by positive or negative integers
+        """
+
+        literals = self.literals.tolist()
+        offsets = self.offsets.tolist()
+
+        return [literals[offsets[i]:offsets[i+1]] for i in range(self.C)]
+
+    def nbytes(self):
+        """
+        :return: number of bytes used by the literal, offset and occurrence buffers
+        """
+
+        return (self.literals.nbytes + self.offsets.nbytes +
+                self.occurrenceClauses.nbytes + self.occurrenceOffsets.nbytes)
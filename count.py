@@ -0,0 +1,333 @@
+########################################################################################################################
+#
+#   File name:      count.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the model counter (#SAT): the DPLL engine of functions.py explores both phases of every branching
+variable, and after unit propagation the remaining clauses (reduced to their unassigned literals) are split into
+variable-disjoint components, whose counts are multiplied. Every component is counted once: its count is cached under
+its canonical form, the sorted tuple of its sorted reduced clauses, in a cache of bounded size that evicts the least
+recently used components. Counts are Python integers, so they never overflow.
+
+For instances too large to count exactly, the approximate mode averages random probes down the search tree (Knuth's
+estimator): at every branching variable, a random consistent phase is followed and the estimate is divided by the
+probability of choosing it. The phases are chosen with a probability proportional to 2^-k, k being the number of
+variables the phase assigns, i.e. in proportion to the number of assignments left over, which keeps the variance of the
+estimate low. Components small enough are counted exactly on the way.
+"""
+
+import math
+import random
+import sys
+from collections import OrderedDict
+from fractions import Fraction
+from functions import DPLLEngine, addStats
+from decompose import find
+
+
+class ModelCounter(DPLLEngine):
+    """
+    Model counting engine. Uses the watches, trail and unit propagation of the DPLL engine, but neither pure literals,
+    which would remove models, nor the decision stack, as the search is recursive over the components.
+
+    Besides the statistics of the DPLL engine, the engine counts its cache hits, misses and evictions and the number of
+    times a residual sentence split into several components.
+    """
+
+    def __init__(self, N, sentence, cache_size=1000000, seed=None):
+        """
+        Loads the sentence into the engine.
+
+        :param N: number of variables
+        :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+        :param cache_size: maximum total number of literals of the cached components
+        :param seed: random seed of the approximate mode, or None
+        """
+
+        super().__init__(N, sentence, 'ordered')
+        self.stats.update({'cache_hits': 0, 'cache_misses': 0, 'cache_evictions': 0, 'splits': 0})
+        self.cache = OrderedDict()      # canonical form of a component -> model count, least recently used first
+        self.cacheSize = cache_size
+        self.cacheLiterals = 0          # total number of literals of the cached components
+        self.generator = random.Random(seed)
+
+    def initialize(self):
+        """
+        Assigns and propagates the literals of the unit clauses at decision level 0.
+
+        :return: False if the sentence is unsatisfiable by unit propagation, True otherwise
+        """
+
+        if self.unsat:
+            return False
+        for literal in self.units:
+            if self.value[literal] == -1:
+                return False
+            if self.value[literal] == 0:
+                self.assign(literal, -1)
+
+        return self.propagate() == -1
+
+    def residual(self, indices):
+        """
+        Reduces clauses to their unassigned literals, leaving out the satisfied clauses, and splits them into
+        variable-disjoint components.
+
+        :param indices: list of clause indices
+        :return components: list of (clause indices, reduced clauses) tuples
+        :return variables: number of variables occurring in the reduced clauses
+        """
+
+        value = self.value
+        parent = dict()
+        remaining = []
+
+        for c in indices:
+            clause = self.clauses[c]
+            if any(value[literal] == 1 for literal in clause):
+                continue
+            reduced = [literal for literal in clause if value[literal] == 0]
+            remaining.append((c, reduced))
+
+            # Union the variables of the clause
+            root = find(parent, parent.setdefault(abs(reduced[0]), abs(reduced[0])))
+            for literal in reduced[1:]:
+                other = find(parent, parent.setdefault(abs(literal), abs(literal)))
+                if other != root:
+                    parent[other] = root
+
+        groups = dict()
+        for c, reduced in remaining:
+            group = groups.setdefault(find(parent, abs(reduced[0])), ([], []))
+            group[0].append(c)
+            group[1].append(reduced)
+
+        if len(groups) > 1:
+            self.stats['splits'] += 1
+
+        return list(groups.values()), len(parent)
+
+    def branchVariable(self, reduced):
+        """
+        Chooses the branching variable of a component: the variable occurring in the most reduced clauses.
+
+        :param reduced: list of reduced clauses of the component
+        :return: variable number
+        """
+
+        occurrences = dict()
+        for clause in reduced:
+            for literal in clause:
+                occurrences[abs(literal)] = occurrences.get(abs(literal), 0) + 1
+
+        return max(occurrences, key=occurrences.get)
+
+    def lookup(self, key):
+        """
+        :param key: canonical form of a component
+        :return: cached model count, or None
+        """
+
+        count = self.cache.get(key)
+        if count is None:
+            self.stats['cache_misses'] += 1
+        else:
+            self.stats['cache_hits'] += 1
+            self.cache.move_to_end(key)
+
+        return count
+
+    def store(self, key, count):
+        """
+        Caches the model count of a component, evicting the least recently used components while the cache is full.
+
+        :param key: canonical form of a component
+        :param count: model count
+        :return:
+        """
+
+        size = sum(len(clause) for clause in key)
+        if size > self.cacheSize:
+            return
+
+        self.cache[key] = count
+        self.cacheLiterals += size
+        while self.cacheLiterals > self.cacheSize:
+            evicted, evictedCount = self.cache.popitem(last=False)
+            self.cacheLiterals -= sum(len(clause) for clause in evicted)
+            self.stats['cache_evictions'] += 1
+
+    def assume(self, literal, indices):
+        """
+        Assigns a literal, propagates it and splits the residual clauses of its component.
+
+        :param literal: literal represented by a positive or negative integer
+        :param indices: clause indices of the component the literal belongs to
+        :return components: components of the residual clauses, see residual(), or None if there is a conflict
+        :return variables: number of variables occurring in the residual clauses
+        """
+
+        self.assign(literal, -1)
+        if self.propagate() != -1:
+            self.stats['conflicts'] += 1
+            return None, 0
+
+        return self.residual(indices)
+
+    def countComponent(self, indices, reduced):
+        """
+        Counts the models of a component over its variables, i.e. the variables occurring in its reduced clauses.
+
+        :param indices: clause indices of the component
+        :param reduced: reduced clauses of the component
+        :return: model count
+        """
+
+        key = tuple(sorted(tuple(sorted(clause)) for clause in reduced))
+        count = self.lookup(key)
+        if count is not None:
+            return count
+
+        numVariables = len(set(abs(literal) for clause in reduced for literal in clause))
+        variable = self.branchVariable(reduced)
+        self.stats['decisions'] += 1
+
+        count = 0
+        for literal in (variable, -variable):
+            position = len(self.trail)
+            components, variables = self.assume(literal, indices)
+            if components is not None:
+                # Assigned variables and variables that no longer occur are free (NOTE: the trail only holds
+                # variables of this component, as the components are variable-disjoint)
+                product = 2**(numVariables - (len(self.trail) - position) - variables)
+                for subIndices, subReduced in components:
+                    product *= self.countComponent(subIndices, subReduced)
+                    if product == 0:
+                        break
+                count += product
+            self.undo(position)
+
+        self.store(key, count)
+        return count
+
+    def probe(self, indices, reduced, exact):
+        """
+        Estimates the model count of a component with a single random probe, counting components of at most exact
+        variables exactly.
+
+        :param indices: clause indices of the component
+        :param reduced: reduced clauses of the component
+        :param exact: maximum number of variables of a component counted exactly
+        :return: unbiased estimate of the model count (integer or Fraction)
+        """
+
+        numVariables = len(set(abs(literal) for clause in reduced for literal in clause))
+        if numVariables <= exact:
+            return self.countComponent(indices, reduced)
+
+        variable = self.branchVariable(reduced)
+        self.stats['decisions'] += 1
+
+        # Find the consistent phases together with the number of variables they assign
+        consistent = []
+        for literal in (variable, -variable):
+            position = len(self.trail)
+            if self.assume(literal, indices)[0] is not None:
+                consistent.append((literal, len(self.trail) - position))
+            self.undo(position)
+        if not consistent:
+            return 0
+
+        # Choose a phase with probability proportional to 2^-assigned, with integer weights
+        most = max(assigned for literal, assigned in consistent)
+        weights = [2**(most - assigned) for literal, assigned in consistent]
+        k = 0 if self.generator.randrange(sum(weights)) < weights[0] else 1
+        literal = consistent[k][0]
+
+        position = len(self.trail)
+        components, variables = self.assume(literal, indices)
+        estimate = Fraction(sum(weights), weights[k])*2**(numVariables - (len(self.trail) - position) - variables)
+        for subIndices, subReduced in components:
+            estimate *= self.probe(subIndices, subReduced, exact)
+            if estimate == 0:
+                break
+        self.undo(position)
+
+        return estimate
+
+    def count(self, approximate=False, samples=1000, exact=30):
+        """
+        Counts the models of the sentence.
+
+        :param approximate: if True, estimate the count with random probes instead of counting exactly
+        :param samples: number of probes of the approximate mode
+        :param exact: maximum number of variables of a component counted exactly in the approximate mode
+        :return count: (estimated) model count
+        :return error: standard error of the estimate, 0 if counted exactly
+        """
+
+        if not self.initialize():
+            return 0, 0
+
+        # NOTE: The recursion depth grows with the number of branching variables on the current path
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), 4*self.N + 1000))
+
+        components, variables = self.residual(range(len(self.clauses)))
+        factor = 2**(self.N - len(self.trail) - variables)
+
+        if not approximate:
+            count = factor
+            for indices, reduced in components:
+                count *= self.countComponent(indices, reduced)
+                if count == 0:
+                    break
+            return count, 0
+
+        # Mean and standard error of the probes, with exact fractions such that large counts do not overflow
+        total = 0
+        squares = 0
+        for i in range(samples):
+            estimate = factor
+            for indices, reduced in components:
+                estimate *= self.probe(indices, reduced, exact)
+                if estimate == 0:
+                    break
+            total += estimate
+            squares += estimate*estimate
+
+        mean = round(Fraction(total, samples))
+        variance = Fraction(samples*squares - total*total, samples*samples*(samples-1)) if samples > 1 else 0
+
+        return mean, math.isqrt(math.floor(variance))
+
+
+def countModels(N, sentence, approximate=False, samples=1000, exact=30, cache_size=1000000, seed=None, stats=None):
+    """
+    Counts the models of a sentence, exactly or approximately, see ModelCounter.
+
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param approximate: if True, estimate the count with random probes instead of counting exactly
+    :param samples: number of probes of the approximate mode
+    :param exact: maximum number of variables of a component counted exactly in the approximate mode
+    :param cache_size: maximum total number of literals of the cached components
+    :param seed: random seed of the approximate mode, or None
+    :param stats: optional dictionary to which the counter statistics are added
+    :return count: (estimated) model count
+    :return error: standard error of the estimate, 0 if counted exactly
+    """
+
+    counter = ModelCounter(N, sentence, cache_size, seed)
+    count, error = counter.count(approximate, samples, exact)
+    if stats is not None:
+        addStats(stats, counter.stats)
+
+    return count, error
@@ -0,0 +1,400 @@
+########################################################################################################################
+#
+#   File name:      cube.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the cube-and-conquer mode of DPLL. In the cube phase, a look-ahead search splits the sentence into
+cubes, i.e. partial assignments that together cover every assignment: at every node, the most promising candidate
+variables are assigned both ways and propagated, and the variable whose two phases propagate the most literals is split
+on. A phase that leads to a conflict is a failed literal, so the other phase is implied and added to the cube. Branches
+in which both phases fail are refuted without becoming a cube.
+
+In the conquer phase, the cubes are solved by the DPLL engine of functions.py in worker processes, every worker loading
+the sentence once and solving one cube after another. The workers take the next cube from a shared queue as soon as
+they are done with the previous one, such that a worker stuck in a hard cube does not hold up the others. The first
+satisfiable cube stops all workers, and the sentence is unsatisfiable once every cube is refuted.
+
+The parent process checks the workers while waiting for results. The cubes of a worker that dies (e.g. killed for
+running out of memory) are solved again in a next round of workers, as long as every round solves at least one cube.
+Otherwise there is no decision.
+"""
+
+import math
+import queue
+from multiprocessing import Event, Process, Queue
+from time import perf_counter
+from functions import DPLLEngine, addStats
+from batch import numWorkers
+
+
+# Number of cubes per worker aimed at by the default splitting depth
+CUBES_PER_WORKER = 8
+
+# Interval in seconds at which the workers are checked while no results arrive
+POLL_INTERVAL = 0.5
+
+
+class LookaheadEngine(DPLLEngine):
+    """
+    Look-ahead engine that splits a sentence into cubes. Uses the watches, trail and unit propagation of the DPLL
+    engine, but neither its decision stack nor its branching heuristic, as the split variables are chosen by look-ahead.
+
+    Besides the statistics of the DPLL engine, the engine counts its look-aheads (propagated phases), failed literals,
+    cubes and refuted branches.
+    """
+
+    def __init__(self, N, sentence, candidates=20):
+        """
+        :param N: number of variables
+        :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+        :param candidates: maximum number of variables looked ahead on at every node
+        """
+
+        super().__init__(N, sentence, 'ordered')
+        self.stats.update({'lookaheads': 0, 'failed_literals': 0, 'cubes': 0, 'refuted': 0})
+        self.candidates = candidates
+
+    def preselect(self):
+        """
+        Preselects the candidate variables of a look-ahead: the unassigned variables occurring most often in the clauses
+        that are not satisfied yet.
+
+        :return: list of at most self.candidates variable numbers, empty if every clause is satisfied
+        """
+
+        value = self.value
+        occurrences = dict()
+        for clause in self.clauses:
+            if any(value[literal] == 1 for literal in clause):
+                continue
+            for literal in clause:
+                if value[literal] == 0:
+                    occurrences[abs(literal)] = occurrences.get(abs(literal), 0) + 1
+
+        return sorted(occurrences, key=occurrences.get, reverse=True)[:self.candidates]
+
+    def probe(self, literal):
+        """
+        Assigns and propagates a literal and undoes it again.
+
+        :param literal: literal represented by a positive or negative integer
+        :return: number of literals assigned, including the literal itself, or -1 if it leads to a conflict
+        """
+
+        position = len(self.trail)
+        self.assign(literal, -1)
+        conflict = self.propagate()
+        assigned = len(self.trail) - position
+        self.undo(position)
+        self.stats['lookaheads'] += 1
+
+        return -1 if conflict != -1 else assigned
+
+    def lookahead(self):
+        """
+        Chooses the split variable of a node by look-ahead, assigning the failed literals' opposite phases on the way.
+        The score of a variable is the product of the numbers of literals its two phases assign, ties broken by their
+        sum, which favours variables that simplify the sentence in both branches.
+
+        :return variable: split variable, 0 if every clause is satisfied, or None if the node is refuted
+        :return forced: list of the literals implied by failed literals
+        """
+
+        forced = []
+        while True:
+            candidates = self.preselect()
+            if not candidates:
+                return 0, forced
+
+            best = 0
+            bestScore = -1
+            for variable in candidates:
+                if self.value[variable] != 0:
+                    continue
+                positive = self.probe(variable)
+                negative = self.probe(-variable)
+                if positive == -1 and negative == -1:
+                    return None, forced
+
+                # Failed literal: the other phase is implied
+                if positive == -1 or negative == -1:
+                    literal = -variable if positive == -1 else variable
+                    self.stats['failed_literals'] += 1
+                    self.assign(literal, -1)
+                    forced.append(literal)
+                    if self.propagate() != -1:
+                        return None, forced
+                    continue
+
+                score = 1024*positive*negative + positive + negative
+                if score > bestScore:
+                    best, bestScore = variable, score
+
+            # NOTE: The scores of variables probed before a failed literal are outdated, but still a valid choice
+            if best != 0 and self.value[best] == 0:
+                return best, forced
+            # Else, the failed literals assigned every candidate, so look ahead again
+
+    def split(self, depth, cube, cubes):
+        """
+        Splits the current node into cubes, recursively up to the given depth.
+
+        :param depth: remaining splitting depth
+        :param cube: list of literals of the current node
+        :param cubes: list to which the cubes are appended
+        :return: True if a model was found, which is left assigned, False otherwise
+        """
+
+        position = len(self.trail)
+        if self.propagate() != -1:
+            self.stats['refuted'] += 1
+            self.undo(position)
+            return False
+
+        variable, forced = self.lookahead()
+        if variable is None:
+            self.stats['refuted'] += 1
+            self.undo(position)
+            return False
+        cube = cube + forced
+
+        # Every clause is satisfied: complete the model with the unassigned variables
+        if variable == 0:
+            for variable in range(1, self.N+1):
+                if self.value[variable] == 0:
+                    self.assign(-variable, -1)
+            return True
+
+        if depth == 0:
+            cubes.append(cube)
+            self.stats['cubes'] += 1
+            self.undo(position)
+            return False
+
+        self.stats['decisions'] += 1
+        for literal in (variable, -variable):
+            branch = len(self.trail)
+            self.assign(literal, -1)
+            if self.split(depth-1, cube+[literal], cubes):
+                return True
+            self.undo(branch)
+
+        self.undo(position)
+        return False
+
+    def cubes(self, depth):
+        """
+        Splits the sentence into cubes.
+
+        :param depth: maximum splitting depth, i.e. number of split variables per cube
+        :return cubes: list of cubes, i.e. lists of literals represented by positive or negative integers, covering all
+        models not found otherwise. Empty if the sentence is unsatisfiable or a model was found
+        :return model: model found during the splitting as list of literals, or None
+        """
+
+        cubes = []
+        if not self.initialize():
+            return [], None
+        if self.split(depth, [], cubes):
+            return [], self.model()
+
+        return cubes, None
+
+
+class ConquerEngine(DPLLEngine):
+    """
+    DPLL engine solving one cube after another: the literals of a cube are assigned below the root literals, searched
+    under and unassigned again, such that the sentence is loaded only once.
+    """
+
+    def solveCube(self, cube):
+        """
+        Runs the DPLL search under the assumption of a cube. Must be called after initialize().
+
+        :param cube: list of literals represented by positive or negative integers
+        :return: True if the cube is satisfiable, False otherwise, None if stopped before a decision was reached
+        """
+
+        position = len(self.trail)
+        result = False
+        for literal in cube:
+            if self.value[literal] == -1:
+                break
+            if self.value[literal] == 0:
+                self.assign(literal, -1)
+        else:
+            # Same loop as DPLLEngine.solve(), backtracking stops at the cube as it is not on the decision stack
+            while True:
+                conflict = self.propagate()
+                if conflict != -1:
+                    self.conflict()
+                    if self.stopped():
+                        result = None
+                        break
+                    self.heuristic.conflict(self.clauses[conflict])
+                    if not self.backtrack():
+                        break
+                    continue
+
+                literal = self.decide()
+                if literal == 0:
+                    return True
+                if self.stats['decisions'] % 256 == 255 and self.stopped():
+                    result = None
+                    break
+                self.branch(literal)
+
+        self.decisions = []
+        self.undo(position)
+        return result
+
+
+def conquerWorker(index, N, sentence, heuristic, tasks, results, stop):
+    """
+    Worker process of the conquer phase: takes cubes from the shared queue until it is empty or a model is found and
+    sends the result of every cube to the parent process.
+
+    :param index: worker number
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param heuristic: branching heuristic name of the DPLL engine
+    :param tasks: queue of (cube number, cube) tuples, terminated by None
+    :param results: queue to which ('cube', worker, cube number, result, model or None) and finally ('done', worker,
+    stats) tuples are sent
+    :param stop: shared event, set when a model is found
+    :return:
+    """
+
+    engine = ConquerEngine(N, sentence, heuristic, stop=stop)
+    # NOTE: Pure literals are assigned at the root like in the look-ahead engine, so the cubes never contradict them
+    satisfiable = engine.initialize() and engine.propagate() == -1
+    solved = 0
+
+    while not stop.is_set():
+        task = tasks.get()
+        if task is None:
+            break
+        number, cube = task
+        result = engine.solveCube(cube) if satisfiable else False
+        if result is None:
+            break
+        solved += 1
+        results.put(('cube', index, number, result, engine.model() if result else None))
+        if result:
+            stop.set()
+            break
+
+    engine.stats['cubes_solved'] = solved
+    results.put(('done', index, engine.stats))
+
+
+def cubeAndConquer(N, sentence, workers=None, depth=None, candidates=20, heuristic='ordered', stats=None,
+                   verbose=False):
+    """
+    Cube-and-conquer DPLL: splits the sentence into cubes by look-ahead and solves the cubes in parallel worker
+    processes, see the description of this file.
+
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param workers: number of worker processes, defaults to the number of available CPUs
+    :param depth: maximum splitting depth, defaults to the depth giving CUBES_PER_WORKER cubes per worker
+    :param candidates: maximum number of variables looked ahead on at every node
+    :param heuristic: branching heuristic name of the DPLL engine solving the cubes, see heuristics.py
+    :param stats: optional dictionary to which the look-ahead statistics, the summed search statistics of the workers,
+    the number of the satisfiable cube (or None), the number of started and died workers and the wall-clock time are
+    added
+    :param verbose: if True, print the number of cubes and the result
+    :return model: a list containing the model (or empty list if no such assignment), like DPLLInit(), or -1 (= no
+    decision) if workers died on cubes that could not be solved again
+    """
+
+    if workers is None:
+        workers = numWorkers()
+    if workers < 1:
+        raise ValueError('Number of workers must be at least 1, got '+str(workers))
+    if depth is None:
+        depth = max(1, math.ceil(math.log2(CUBES_PER_WORKER*workers)))
+
+    t0 = perf_counter()
+    total = {'workers': 0, 'failed_workers': 0, 'winner': None}
+
+    # Cube phase
+    lookahead = LookaheadEngine(N, sentence, candidates)
+    cubes, model = lookahead.cubes(depth)
+    addStats(total, lookahead.stats)
+    if verbose:
+        print('Cube-and-conquer: %d cube(s) of depth %d, %d refuted branch(es), %d failed literal(s) in %.3f s' %
+              (len(cubes), depth, lookahead.stats['refuted'], lookahead.stats['failed_literals'], perf_counter() - t0))
+
+    # Conquer phase, unless the look-ahead decided the sentence, in rounds until every cube is solved
+    unresolved = dict(enumerate(cubes))     # cube number -> cube
+    refuted = 0
+    while unresolved and model is None:
+        tasks = Queue()
+        results = Queue()
+        stop = Event()
+        # NOTE: The largest cubes constrain the most, so they are usually the quickest ones and go first
+        for number, cube in sorted(unresolved.items(), key=lambda task: len(task[1]), reverse=True):
+            tasks.put((number, cube))
+        processes = dict()  # worker number -> process, numbered over all rounds
+        for i in range(total['workers'], total['workers'] + min(workers, len(unresolved))):
+            tasks.put(None)
+            process = Process(target=conquerWorker, args=(i, N, sentence, heuristic, tasks, results, stop),
+                              daemon=True)
+            process.start()
+            processes[i] = process
+        total['workers'] += len(processes)
+
+        # Collect the results until every worker is done or died. NOTE: The queue must be emptied before joining the
+        # workers
+        solved = 0
+        while processes:
+            try:
+                message = results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                # A worker that exits without being done died, its current cube stays unresolved
+                for i in [i for i, process in processes.items() if process.exitcode not in (None, 0)]:
+                    processes.pop(i).join()
+                    total['failed_workers'] += 1
+                continue
+
+            if message[0] == 'done':
+                addStats(total, message[2])
+                processes.pop(message[1]).join()
+                continue
+            solved += 1
+            del unresolved[message[2]]
+            if message[3]:
+                if model is None:
+                    model = message[4]
+                    total['winner'] = message[2]
+                stop.set()
+            else:
+                refuted += 1
+
+        # Cubes left in the queue after a model was found are dropped
+        tasks.cancel_join_thread()
+        if not solved:
+            break
+    total['cubes_refuted'] = refuted
+
+    total['time'] = perf_counter() - t0
+    decided = model is not None or not unresolved
+    if verbose:
+        print('Cube-and-conquer: %s in %.3f s' % ('satisfiable' if model is not None else 'unsatisfiable' if decided
+                                                  else 'no decision, %d worker(s) died' % total['failed_workers'],
+                                                  total['time']))
+    if stats is not None:
+        addStats(stats, total)
+
+    if not decided:
+        return -1
+    return model if model is not None else []
@@ -0,0 +1,488 @@
+########################################################################################################################
+#
+#   File name:      daemon.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the solver daemon: a long-lived process that accepts jobs as JSON lines on stdin (answering on
+stdout) or on a Unix socket, queues them with asyncio and dispatches them to a pool of warm worker processes, which have
+imported the solver modules once. Results are streamed back as soon as they are available, so they may arrive out of
+order and are matched to their job by its id.
+
+A job is a JSON object with the problem, either as DIMACS text ("cnf") or as file name ("file"), and optionally an id,
+the algorithm ("algorithm", default CDCL), a wall-clock time limit in seconds ("timeout", in which case the algorithm
+runs in anytime mode, see anytime.py) and a random seed ("seed"):
+
+    {"id": 1, "file": "3SATproblems/n20_c91.cnf", "algorithm": "WalkSAT", "timeout": 5, "seed": 1}
+
+and is answered with its status (1 = satisfiable, 0 = unsatisfiable, -1 = no decision), the model as list of literals,
+the solving time, the time spent in the queue and the solver counters:
+
+    {"id": 1, "status": 1, "model": [1, -2, ...], "time": 0.01, "wait": 0.0, "stats": {...}}
+
+A job with a timeout that ends without a decision is answered with a partial result: the best assignment found as model
+and its number of False clauses, e.g. {"id": 1, "status": -1, "partial": true, "unsat": 2, "model": [1, -2, ...], ...}.
+
+or with {"id": 1, "error": "..."}. The request {"op": "stats"} is answered immediately with the queue depth, the number
+of running and finished jobs and the latency percentiles.
+
+The job queue is bounded: when it is full, no further requests are read until a worker becomes free (backpressure).
+
+Every job has a hard time limit: its timeout plus a grace period, or the default time limit of the daemon for jobs
+without timeout. A job exceeding it is answered with an error and the worker pool is restarted, killing its worker.
+The pool is also restarted when a worker dies (e.g. killed for running out of memory), in which case the jobs that were
+running in the broken pool are retried once.
+
+Usage:
+    python daemon.py [--socket /tmp/sat.sock] [-j 4] [--queue 8] [--timeout 300]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from time import perf_counter
+import numpy as np
+from batch import ALL_ALGORITHMS, MULTIPROCESS_ALGORITHMS, numWorkers
+
+
+# Algorithms accepted by the daemon. NOTE: The portfolio and the parallel modes start processes of their own, which
+# would compete with the pool workers for the CPUs
+DAEMON_ALGORITHMS = [algorithm for algorithm in ALL_ALGORITHMS if algorithm not in MULTIPROCESS_ALGORITHMS]
+
+# Number of recent jobs of which the latencies are kept for the statistics
+LATENCY_WINDOW = 1000
+
+# Hard time limit in seconds of jobs without timeout, and grace period in seconds added to the timeout of other jobs,
+# which stop by themselves in anytime mode
+DEFAULT_TIMEOUT = 300
+KILL_GRACE = 5
+
+
+def warmWorker():
+    """
+    Initializer of the worker processes: imports the solver modules, such that the first job does not pay for it, and
+    sends the messages the algorithms print to stderr, such that they cannot corrupt the responses on stdout.
+
+    :return:
+    """
+
+    sys.stdout = sys.stderr
+    import functions
+    import localsearch
+    import anytime
+
+
+def solveJob(job):
+    """
+    Solves a job in a worker process.
+
+    :param job: job dictionary, see the description of this file
+    :return: dictionary with the status, the model as list of literals (None if there is none), the solving time and
+    the solver counters, and for a partial result the number of False clauses of its model
+    """
+
+    import random
+    import numpy.random
+    from cnf import CNF
+    from dimacs import parseDIMACS
+    from batch import runAlgorithm
+    from anytime import solveWithin
+    from results import solutionStatus
+
+    t0 = perf_counter()
+
+    if 'cnf' in job:
+        N, C, literals, offsets = parseDIMACS(job['cnf'].encode())
+        sentence = CNF(N, literals, offsets)
+    else:
+        sentence = CNF.read(job['file'])
+    N = sentence.N
+
+    if job.get('seed') is not None:
+        random.seed(job['seed'])
+        numpy.random.seed(job['seed'])
+
+    stats = dict()
+    best = None
+    if job.get('timeout') is not None:
+        V, best = solveWithin(job['algorithm'], N, sentence, wall=job['timeout'], stats=stats)
+    else:
+        V = runAlgorithm(job['algorithm'], N, sentence, stats)
+
+    status = solutionStatus(V, N)
+    response = {'status': status, 'model': None, 'time': 0.0, 'stats': stats}
+    # Without a decision, the best assignment of the anytime run is the model of a partial result
+    if status == -1 and best is not None and best['model'] is not None:
+        V = best['model']
+        response.update({'partial': True, 'unsat': best['unsat']})
+    if status == 1 or 'partial' in response:
+        # DPLL and CDCL return literals, the local search algorithms truth assignments
+        response['model'] = [int(value) if not isinstance(value, bool) else (i+1 if value else -(i+1))
+                             for i, value in enumerate(V)]
+    response['time'] = perf_counter() - t0
+
+    return response
+
+
+def checkJob(job):
+    """
+    Validates a job and fills in the default algorithm.
+
+    :param job: job dictionary, modified in place
+    :return: error message string, or None if the job is valid
+    """
+
+    if not isinstance(job, dict):
+        return 'job must be a JSON object'
+    if ('cnf' in job) == ('file' in job):
+        return 'job must contain either "cnf" or "file"'
+    job.setdefault('algorithm', 'CDCL')
+    if job['algorithm'] not in DAEMON_ALGORITHMS:
+        return 'unknown algorithm '+str(job['algorithm'])+', choose from '+', '.join(DAEMON_ALGORITHMS)
+    if job.get('timeout') is not None and (not isinstance(job['timeout'], (int, float)) or job['timeout'] <= 0):
+        return 'timeout must be a positive number'
+
+    return None
+
+
+class SolverService:
+    """
+    Job queue and warm worker pool of the daemon. Requests are submitted with submit(), which waits while the queue is
+    full, and every response is passed to the reply coroutine given with the request.
+    """
+
+    def __init__(self, workers=None, queue_size=None, timeout=DEFAULT_TIMEOUT):
+        """
+        :param workers: number of worker processes, defaults to the number of available CPUs
+        :param queue_size: maximum number of queued jobs, defaults to twice the number of workers
+        :param timeout: hard time limit in seconds of jobs without timeout
+        """
+
+        self.workers = workers if workers is not None else numWorkers()
+        self.queue = asyncio.Queue(queue_size if queue_size is not None else 2*self.workers)
+        self.pool = None
+        self.warmup = None                               # task warming up a restarted pool
+        self.dispatchers = []
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeout = timeout
+        self.restarts = 0                                # number of times the worker pool was restarted
+        self.latencies = deque(maxlen=LATENCY_WINDOW)    # time from submission to response of recent jobs
+        self.waits = deque(maxlen=LATENCY_WINDOW)        # time spent in the queue of recent jobs
+
+    async def start(self):
+        """
+        Starts the worker processes, waiting until all of them have imported the solver modules, and the dispatchers.
+
+        :return:
+        """
+
+        self.pool = ProcessPoolExecutor(self.workers, initializer=warmWorker)
+        await self.warm(self.pool)
+        self.dispatchers = [asyncio.create_task(self.dispatch()) for i in range(self.workers)]
+
+    async def warm(self, pool):
+        """
+        Starts all worker processes of a pool, each of which imports the solver modules.
+
+        :param pool: ProcessPoolExecutor
+        :return:
+        """
+
+        loop = asyncio.get_running_loop()
+        # NOTE: Workers are only started on demand, so one task per worker forces all of them to start now. A pool that
+        # breaks while warming up is restarted by the dispatcher that runs into it
+        await asyncio.gather(*(loop.run_in_executor(pool, os.getpid) for i in range(self.workers)),
+                             return_exceptions=True)
+
+    async def close(self):
+        """
+        Waits until all queued jobs are finished and stops the dispatchers and worker processes.
+
+        :return:
+        """
+
+        await self.queue.join()
+        for dispatcher in self.dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        self.pool.shutdown()
+
+    def restart(self, pool, kill=False):
+        """
+        Replaces a broken worker pool, or a pool with a worker that has to be killed, by a new one, which is warmed up
+        in the background. Does nothing if the pool has been replaced already, e.g. by another dispatcher that ran into
+        the same broken pool.
+
+        :param pool: ProcessPoolExecutor to replace
+        :param kill: if True, kill the worker processes of the pool first, failing the jobs running in them
+        :return:
+        """
+
+        if pool is not self.pool:
+            return
+
+        # NOTE: The executor cannot kill a single worker, so all worker processes are killed, which are the only child
+        # processes of the daemon (the processes of earlier pools have exited). The other jobs of the pool then fail
+        # with BrokenProcessPool and are retried in the new pool
+        if kill:
+            for process in multiprocessing.active_children():
+                process.kill()
+        # NOTE: Futures are not cancelled, every job of the pool is awaited by a dispatcher that retries or answers it
+        pool.shutdown(wait=False)
+        self.pool = ProcessPoolExecutor(self.workers, initializer=warmWorker)
+        self.warmup = asyncio.get_running_loop().create_task(self.warm(self.pool))
+        self.restarts += 1
+        print('Worker pool restarted', file=sys.stderr)
+
+    async def run(self, job):
+        """
+        Runs a job in the worker pool within its hard time limit, see the description of this file.
+
+        :param job: job dictionary
+        :return: response dictionary of solveJob()
+        """
+
+        loop = asyncio.get_running_loop()
+        limit = job['timeout'] + KILL_GRACE if job.get('timeout') is not None else self.timeout
+
+        for attempt in range(2):
+            pool = self.pool
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(pool, solveJob, job), limit)
+            except asyncio.TimeoutError:
+                self.restart(pool, kill=True)
+                raise TimeoutError('job exceeded its time limit of %g s' % limit)
+            except BrokenProcessPool:
+                # A worker died, possibly running another job: retry once in a new pool
+                self.restart(pool)
+                if attempt == 1:
+                    raise
+            except asyncio.CancelledError:
+                # Cancellation of the dispatcher itself is passed on, of the executor future (by a pool shutdown) it is
+                # handled like a broken pool
+                if asyncio.current_task().cancelling():
+                    raise
+                self.restart(pool)
+                if attempt == 1:
+                    raise RuntimeError('job cancelled by a worker pool restart')
+
+    def statistics(self):
+        """
+        :return: dictionary with the queue depth, the numbers of running, completed and failed jobs and the median and
+        90th percentile of the latency (submission to response) and queue wait of recent jobs in seconds
+        """
+
+        stats = {'queue_depth': self.queue.qsize(), 'queue_size': self.queue.maxsize, 'workers': self.workers,
+                 'running': self.running, 'completed': self.completed, 'failed': self.failed,
+                 'pool_restarts': self.restarts}
+        for name, values in (('latency', self.latencies), ('wait', self.waits)):
+            if values:
+                stats[name+'_p50'] = float(np.percentile(values, 50))
+                stats[name+'_p90'] = float(np.percentile(values, 90))
+
+        return stats
+
+    async def submit(self, request, reply):
+        """
+        Handles a request: answers stats requests and invalid jobs immediately and queues valid jobs, waiting while the
+        queue is full.
+
+        :param request: request dictionary
+        :param reply: coroutine function called with the response dictionary
+        :return:
+        """
+
+        if isinstance(request, dict) and request.get('op') == 'stats':
+            await reply(self.statistics())
+            return
+
+        error = checkJob(request)
+        if error is not None:
+            self.failed += 1
+            await reply({'id': request.get('id') if isinstance(request, dict) else None, 'error': error})
+            return
+
+        await self.queue.put((request, reply, perf_counter()))
+
+    async def dispatch(self):
+        """
+        Dispatcher: takes jobs from the queue, runs them in the worker pool and sends the responses.
+
+        :return:
+        """
+
+        while True:
+            job, reply, submitted = await self.queue.get()
+            started = perf_counter()
+            self.running += 1
+            response = {'id': job.get('id')}
+            try:
+                try:
+                    response.update(await self.run(job))
+                    response['wait'] = started - submitted
+                    self.completed += 1
+                except Exception as error:
+                    response['error'] = type(error).__name__+': '+str(error)
+                    self.failed += 1
+                finally:
+                    self.running -= 1
+
+                self.latencies.append(perf_counter() - submitted)
+                self.waits.append(started - submitted)
+                try:
+                    await reply(response)
+                except (ConnectionError, OSError):
+                    # Client disconnected before its response was ready
+                    pass
+            finally:
+                # NOTE: Also when the dispatcher is cancelled during a job, such that close() does not wait forever
+                self.queue.task_done()
+
+
+async def handleLine(service, line, reply):
+    """
+    Parses a request line and submits the request.
+
+    :param service: started SolverService
+    :param line: request JSON line (bytes or string)
+    :param reply: coroutine function called with the response dictionary
+    :return:
+    """
+
+    try:
+        request = json.loads(line)
+    except ValueError as error:
+        await reply({'id': None, 'error': 'invalid JSON: '+str(error)})
+        return
+
+    await service.submit(request, reply)
+
+
+async def serveStdio(service):
+    """
+    Reads requests from stdin until it is closed and writes the responses to stdout, then waits for the queued jobs.
+
+    :param service: started SolverService
+    :return:
+    """
+
+    loop = asyncio.get_running_loop()
+
+    async def reply(response):
+        sys.stdout.write(json.dumps(response)+'\n')
+        sys.stdout.flush()
+
+    while True:
+        # NOTE: Reading in a thread also works when stdin is a regular file, which asyncio pipe transports reject
+        line = await loop.run_in_executor(None, sys.stdin.buffer.readline)
+        if not line:
+            break
+        if line.strip():
+            await handleLine(service, line, reply)
+
+    await service.close()
+
+
+async def serveSocket(service, path):
+    """
+    Accepts connections on a Unix socket, every connection sending requests and receiving the responses to them, until
+    the daemon is interrupted.
+
+    :param service: started SolverService
+    :param path: socket file name string
+    :return:
+    """
+
+    async def connection(reader, writer):
+        async def reply(response):
+            writer.write((json.dumps(response)+'\n').encode())
+            await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    await handleLine(service, line, reply)
+        finally:
+            # NOTE: Queued jobs of the connection still run, their responses are dropped
+            writer.close()
+
+    if os.path.exists(path):
+        os.unlink(path)
+    server = await asyncio.start_unix_server(connection, path)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        os.unlink(path)
+
+
+async def runDaemon(socket=None, workers=None, queue_size=None, timeout=DEFAULT_TIMEOUT):
+    """
+    Runs the daemon.
+
+    :param socket: Unix socket file name string, or None to serve on stdin/stdout
+    :param workers: number of worker processes, defaults to the number of available CPUs
+    :param queue_size: maximum number of queued jobs, defaults to twice the number of workers
+    :param timeout: hard time limit in seconds of jobs without timeout
+    :return:
+    """
+
+    # Stop on SIGTERM like on SIGINT, such that the socket file is removed. NOTE: Not available on Windows
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass
+
+    service = SolverService(workers, queue_size, timeout)
+    await service.start()
+    print('Solver daemon ready with %d workers' % service.workers, file=sys.stderr)
+
+    if socket is None:
+        await serveStdio(service)
+    else:
+        await serveSocket(service, socket)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Solver daemon answering JSON-lines jobs with a warm worker pool.')
+    parser.add_argument('--socket', help='Unix socket to listen on (default: stdin/stdout)')
+    parser.add_argument('-j', '--workers', type=int, help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('--queue', type=int, help='maximum number of queued jobs (default: twice the workers)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='hard time limit in seconds of jobs '
+                                                                               'without timeout (default: %(default)s)')
+
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error('the number of worker processes (-j) must be at least 1')
+    if args.timeout <= 0:
+        parser.error('the time limit (--timeout) must be positive')
+
+    try:
+        asyncio.run(runDaemon(args.socket, args.workers, args.queue, args.timeout))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+########################################################################################################################
+#
+#   File name:      decompose.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the decomposition of a sentence into variable-disjoint components: two variables are connected if
+they occur in the same clause, and the connected components of this variable interaction graph are found with a
+union-find structure. The sentence is satisfiable if and only if every component is, so the components are solved
+independently (optionally in parallel worker processes), which replaces the product of their search spaces by the sum.
+The search stops as soon as a component is unsatisfiable and the models of the components are merged into one model.
+"""
+
+import random
+from multiprocessing import Pool
+import numpy.random
+from functions import addStats
+from dimacs import clauseList
+from cnf import CNF
+from batch import runAlgorithm, numWorkers, MULTIPROCESS_ALGORITHMS
+
+
+def find(parent, variable):
+    """
+    Finds the representative of the set of a variable, halving the path to it on the way.
+
+    :param parent: list of the parent of every variable in the union-find forest
+    :param variable: variable number
+    :return: representative variable number
+    """
+
+    while parent[variable] != variable:
+        parent[variable] = parent[parent[variable]]
+        variable = parent[variable]
+
+    return variable
+
+
+def decompose(N, sentence):
+    """
+    Splits a sentence into its variable-disjoint components. The variables of every component are renumbered from 1,
+    such that a component can be solved as a sentence of its own.
+
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object, without
+    empty clauses
+    :return components: list of (variables, clauses) tuples sorted by decreasing number of clauses, variables being the
+    original numbers of the renumbered variables 1..n of the component and clauses its renumbered clauses
+    :return free: list of the variables that occur in no clause
+    """
+
+    clauses = clauseList(sentence.literals, sentence.offsets) if isinstance(sentence, CNF) else \
+        [list(clause) for clause in sentence]
+    if any(len(clause) == 0 for clause in clauses):
+        raise ValueError('Sentence contains an empty clause')
+
+    parent = list(range(N+1))
+    size = [1]*(N+1)
+    used = [False]*(N+1)
+
+    # Union the variables of every clause, attaching the smaller set to the larger one
+    for clause in clauses:
+        root = find(parent, abs(clause[0]))
+        for literal in clause:
+            used[abs(literal)] = True
+            other = find(parent, abs(literal))
+            if other != root:
+                if size[other] > size[root]:
+                    root, other = other, root
+                parent[other] = root
+                size[root] += size[other]
+
+    # Group the variables and clauses by representative, renumbering the variables in order of appearance
+    number = [0]*(N+1)
+    groups = dict()     # representative -> (variables, clauses)
+    free = []
+    for variable in range(1, N+1):
+        if not used[variable]:
+            free.append(variable)
+            continue
+        variables, group = groups.setdefault(find(parent, variable), ([], []))
+        variables.append(variable)
+        number[variable] = len(variables)
+
+    for clause in clauses:
+        variables, group = groups[find(parent, abs(clause[0]))]
+        group.append([number[literal] if literal > 0 else -number[-literal] for literal in clause])
+
+    components = sorted(groups.values(), key=lambda component: len(component[1]), reverse=True)
+
+    return components, free
+
+
+def componentWorker(task):
+    """
+    Solves a single component, in the parent process or in a worker process.
+
+    :param task: (index, algorithm name string, number of variables, clauses, random seed or None) tuple
+    :return index: index of the component
+    :return values: list of (boolean) truth assignments of the component, or 0 (= unsatisfiable) or -1 (= no decision)
+    :return stats: dictionary of solver counters
+    """
+
+    index, algorithm, n, clauses, seed = task
+    if seed is not None:
+        random.seed(seed)
+        numpy.random.seed(seed)
+
+    stats = dict()
+    V = runAlgorithm(algorithm, n, clauses, stats)
+
+    # DPLL and CDCL return literals, or an empty list if the component is unsatisfiable
+    if isinstance(V, list):
+        if not V:
+            V = 0
+        elif not isinstance(V[0], bool):
+            V = [literal > 0 for literal in V]
+
+    return index, V, stats
+
+
+def solveComponents(N, sentence, algorithm, workers=1, seed=None, stats=None, verbose=False):
+    """
+    Solves a sentence component by component, see decompose(), and merges the models of the components. Variables that
+    occur in no clause are set to False.
+
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param algorithm: algorithm name string, see batch.ALL_ALGORITHMS
+    :param workers: number of worker processes, 1 to solve the components one after another in this process, None for
+    the number of available CPUs
+    :param seed: random seed, component i being solved with seed + i, or None
+    :param stats: optional dictionary to which the solver counters of all components, the number of components and
+    the size (number of variables) of the largest component are added
+    :param verbose: if True, print the components and the result of every component
+    :return: model in the format of the algorithm (list of (boolean) truth assignments, or list of literals for DPLL and
+    CDCL) or, if no solution found, 0 (= unsatisfiable) or -1 (= no decision)
+    """
+
+    if workers is None:
+        workers = numWorkers()
+    if any(len(clause) == 0 for clause in sentence):
+        return 0
+
+    components, free = decompose(N, sentence)
+    if stats is not None:
+        addStats(stats, {'components': len(components),
+                         'largest_component': max((len(variables) for variables, clauses in components), default=0)})
+    if verbose:
+        print('%d component(s), sizes %s, %d free variable(s)' %
+              (len(components), [len(variables) for variables, clauses in components], len(free)))
+
+    tasks = [(i, algorithm, len(variables), clauses, None if seed is None else seed+i)
+             for i, (variables, clauses) in enumerate(components)]
+    values = [False]*N
+    solution = 1
+
+    def merge(index, V, counters):
+        if stats is not None:
+            addStats(stats, counters)
+        if verbose:
+            print('Component %d (%d variables): %d' % (index, len(components[index][0]),
+                                                       1 if isinstance(V, list) else V))
+        if isinstance(V, list):
+            for variable, value in zip(components[index][0], V):
+                values[variable-1] = value
+        return 1 if isinstance(V, list) else V
+
+    # NOTE: The largest components come first, such that they do not end up last on a single worker
+    if workers > 1 and len(tasks) > 1:
+        if algorithm in MULTIPROCESS_ALGORITHMS:
+            raise ValueError('The '+algorithm+' algorithm cannot solve components in worker processes')
+        with Pool(min(workers, len(tasks))) as pool:
+            for index, V, counters in pool.imap_unordered(componentWorker, tasks):
+                status = merge(index, V, counters)
+                # Stop at the first unsatisfiable component, the pool terminates the remaining workers
+                if status == 0:
+                    return 0
+                solution = min(solution, status)
+    else:
+        for task in tasks:
+            status = merge(*componentWorker(task))
+            if status == 0:
+                return 0
+            solution = min(solution, status)
+
+    # Without a model of every component, there is no decision
+    if solution == -1:
+        return -1
+
+    if algorithm in ('DPLL', 'CDCL'):
+        return [variable if values[variable-1] else -variable for variable in range(1, N+1)]
+    return values
@@ -0,0 +1,173 @@
+########################################################################################################################
+#
+#   File name:      dimacs.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the bulk parser for problem files in DIMACS cnf format. The whole file is read at once, optionally
+decompressed (.gz, .xz, .bz2) or memory-mapped, and tokenized with a vectorized integer conversion. Clauses may span
+several lines and have any width, as they are only delimited by the terminating zeros. The result is a flat array of
+literals together with the clause offsets.
+"""
+
+import re
+import gzip
+import lzma
+import bz2
+import mmap
+import numpy as np
+
+
+# Compressed file extensions and the corresponding open functions
+COMPRESSION = {'.gz': gzip.open, '.xz': lzma.open, '.bz2': bz2.open}
+
+# Problem line, e.g. 'p cnf 20 91'
+HEADER = re.compile(rb'^p[ \t]+cnf[ \t]+(\S+)[ \t]+(\S+)[ \t]*\r?$', re.M)
+
+# Comment lines, starting with 'c'
+COMMENTS = re.compile(rb'^c.*$', re.M)
+
+# End of formula marker used by the SATLIB benchmark files, everything after it is ignored
+END = re.compile(rb'^%', re.M)
+
+
+def stripCompression(filename):
+    """
+    Removes the compression extension from a file name, e.g. 'n20_c91.cnf.gz' becomes 'n20_c91.cnf'.
+
+    :param filename: file name string
+    :return: file name string without compression extension
+    """
+
+    for extension in COMPRESSION:
+        if filename.endswith(extension):
+            return filename[:-len(extension)]
+    return filename
+
+
+def isCNF(filename):
+    """
+    Checks if a file name is a problem file in cnf format, possibly compressed.
+
+    :param filename: file name string
+    :return: True if the file name ends with .cnf, optionally followed by a compression extension
+    """
+
+    return stripCompression(filename).endswith('.cnf')
+
+
+def readBuffer(filename, use_mmap=False):
+    """
+    Reads the whole contents of a (possibly compressed) file.
+
+    :param filename: file name string
+    :param use_mmap: if True, memory-map uncompressed files instead of reading them
+    :return: bytes-like object with the file contents
+    """
+
+    for extension, open_function in COMPRESSION.items():
+        if filename.endswith(extension):
+            with open_function(filename, 'rb') as file:
+                return file.read()
+
+    with open(filename, 'rb') as file:
+        # NOTE: Empty files cannot be memory-mapped
+        if use_mmap and file.seek(0, 2) > 0:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        file.seek(0)
+        return file.read()
+
+
+def parseDIMACS(data):
+    """
+    Parses the contents of a problem file in DIMACS cnf format and validates it against its problem line.
+
+    :param data: bytes-like object with the file contents
+    :return N: number of variables
+    :return C: number of clauses
+    :return literals: flat numpy array of all literals of all clauses, without the terminating zeros
+    :return offsets: numpy array of length C+1, clause i consisting of literals[offsets[i]:offsets[i+1]]
+    """
+
+    # Cut off everything after the end of formula marker
+    end = END.search(data)
+    if end is not None:
+        data = data[:end.start()]
+
+    # Find and validate the problem line
+    headers = HEADER.findall(data)
+    if len(headers) != 1:
+        raise ValueError('Expected exactly one problem line "p cnf N C", found '+str(len(headers)))
+    try:
+        N, C = int(headers[0][0]), int(headers[0][1])
+    except ValueError:
+        raise ValueError('Invalid problem line: number of variables and clauses must be integers')
+    if N < 0 or C < 0:
+        raise ValueError('Invalid problem line: number of variables and clauses must be non-negative')
+
+    # Remove comment lines and the problem line, and convert all remaining tokens to integers at once
+    body = HEADER.sub(b'', COMMENTS.sub(b'', data))
+    try:
+        tokens = np.array(body.split(), dtype=np.int64)
+    except ValueError:
+        raise ValueError('Invalid literal in clauses')
+
+    # Clauses are terminated by zeros. NOTE: A last clause without terminating zero is accepted
+    zeros = np.flatnonzero(tokens == 0)
+    if len(tokens) > 0 and tokens[-1] != 0:
+        zeros = np.append(zeros, len(tokens))
+
+    # Offsets of the clauses in the literal array without the zeros: the i-th zero is preceded by i other zeros
+    offsets = np.zeros(len(zeros)+1, dtype=np.int64)
+    offsets[1:] = zeros - np.arange(len(zeros))
+    literals = tokens[tokens != 0].astype(np.int32)
+
+    if len(zeros) != C:
+        raise ValueError('Problem line declares '+str(C)+' clauses, but '+str(len(zeros))+' clauses were found')
+    if len(literals) > 0 and np.abs(literals).max() > N:
+        raise ValueError('Problem line declares '+str(N)+' variables, but variable '+str(np.abs(literals).max())+
+                         ' was found')
+
+    return N, C, literals, offsets
+
+
+def readDIMACS(filename, use_mmap=False):
+    """
+    Reads and parses a (possibly compressed) problem file in DIMACS cnf format.
+
+    :param filename: file name string
+    :param use_mmap: if True, memory-map uncompressed files instead of reading them
+    :return N: number of variables
+    :return C: number of clauses
+    :return literals: flat numpy array of all literals of all clauses, without the terminating zeros
+    :return offsets: numpy array of length C+1, clause i consisting of literals[offsets[i]:offsets[i+1]]
+    """
+
+    data = readBuffer(filename, use_mmap)
+    try:
+        return parseDIMACS(data)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+def clauseList(literals, offsets):
+    """
+    Converts the flat literal array and clause offsets to a list of clauses.
+
+    :param literals: flat numpy array of literals
+    :param offsets: numpy array of clause offsets
+    :return: list of clauses with literals represented by positive or negative integers
+    """
+
+    literals = literals.tolist()
+    offsets = offsets.tolist()
+
+    return [literals[offsets[i]:offsets[i+1]] for i in range(len(offsets)-1)]
@@ -12,18 +12,26 @@
 
 """
 This file contains the function definitions of the functions used in SAT.py, notably the three algorithms for solving
-SAT problems: GSAT, WalkSAT and DPLL.
+SAT problems: GSAT, WalkSAT and DPLL, as well as the conflict-driven clause learning (CDCL) extension of DPLL.
 """
 
-from random import choice
-from copy import deepcopy
-from numpy.random import choice as pchoice
+from itertools import chain
+from random import choice, random
+import numpy as np
+from heuristics import makeHeuristic
+from dimacs import readDIMACS, clauseList, stripCompression
+from cnf import CNF, paddedMatrix
+
+
+# Number of random GSAT restart models drawn and scored at once, see GSATScoresBatch()
+RESTART_BATCH = 8
 
 
 def readFile(filename):
     """
-    Reads and processes 3SAT problem input file of DIMACS format and returns #variables, #clauses and the clauses. Input
-    file format is assumed to be cnf.
+    Reads and processes SAT problem input file of DIMACS format and returns #variables, #clauses and the clauses. Input
+    file format is assumed to be cnf, possibly compressed (.gz, .xz, .bz2). Clauses may span several lines and have any
+    width. The file is parsed at once by readDIMACS() in dimacs.py.
 
     :param filename: file name string
     :return N: number of variables
@@ -31,23 +39,9 @@ def readFile(filename):
     :return clauses: list of clauses
     """
 
-    # Open file for reading. NOTE: Use of 'with' does not require close()
-    with open(filename, 'r') as file:
-        # Initialize list of clauses, i.e. the sentence
-        clauses = []
-        for line in file:
-            # Skip comment lines starting with 'c'
-            if not line.startswith('c'):
-                # Read property line starting with 'p'. Convert number of variables and clauses from string to integer.
-                # Format is assumed to be always cnf, hence does not need to be read
-                if line.startswith('p'):
-                    N = int(line.split()[-2])   # number of variables
-                    C = int(line.split()[-1])   # number of clauses
-                # Convert literals from string to integer and append clause to list (after removing the trailing zero)
-                else:
-                    clauses.append(list(map(int,line.split()[0:-1])))
+    N, C, literals, offsets = readDIMACS(filename)
 
-    return N, C, clauses
+    return N, C, clauseList(literals, offsets)
 
 
 def readSolFile(filename):
@@ -79,41 +73,63 @@ def readSolFile(filename):
 
     return N, C, T
 
-def writeFile(filename, algorithm, N, C, V, T):
+def writeFile(filename, algorithm, N, C, V, T, stats=None, best=None):
     """
     Writes solution to output file in DIMACS format, containing the number of variables and clauses, the variable
-    assignments and the timing of the code execution.
+    assignments and the timing of the code execution. The search statistics, if given, are written as comment lines
+    'c <name> <value>'. A partial result, i.e. the best assignment of an anytime run without a decision, is written as
+    variable lines below the solution line -1, with its number of False clauses as comment line 'c partial_unsat <k>'.
 
     :param filename: file name string
-    :param algorithm: algorithm name string (GSAT, WalkSAT or DPLL)
+    :param algorithm: algorithm name string (GSAT, WalkSAT, DPLL or CDCL)
     :param N: number of variables
     :param C: number of clauses
-    :param V: variable assignments or, if no solution found, 0 (= unsatisfiable) or -1 (= no decision)
+    :param V: variable assignments (list of booleans ordered by variable number, or list of literals represented by
+    positive or negative integers as returned by DPLL and CDCL) or, if no solution found, 0 (= unsatisfiable) or -1
+    (= no decision)
     :param T: algorithm execution time (CPU time) in seconds
+    :param stats: optional dictionary of search statistics
+    :param best: optional best assignment of an anytime run, dictionary as returned by anytime.solveWithin(), written if
+    no solution was found
     :return:
     """
 
-    # Create output file with same name as input file, but with extension .sol
+    # Create output file with same name as input file (without compression extension), but with extension .sol
+    filename = stripCompression(filename)
     with open(filename.replace('.cnf','.sol'+algorithm),'w') as file:
         file.write('c '+'Solution to the 3SAT problem defined in '+filename.replace('3SATproblems/','')+
                    ', obtained using the '+algorithm+' algorithm'+'\n')
-        # If there is a solution, output 1 (= satisfiable)
+        # Write statistics lines
+        if stats:
+            for key, value in sorted(stats.items()):
+                file.write('c '+key+' '+str(value)+'\n')
+        # If there is a solution, output 1 (= satisfiable). NOTE: DPLL and CDCL return an empty list if the sentence is
+        # unsatisfiable, which is only a solution if there are no variables
         if isinstance(V,list):
-            solution = 1
-        # If no solution was found, output 0 (= unsatisfiable) in case of DPLL or -1 (= no decision) in case of GSAT or
-        # WalkSAT
+            solution = 1 if V or N == 0 else 0
+        # If no solution was found, output 0 (= unsatisfiable) in case of DPLL or CDCL or -1 (= no decision) in case of
+        # GSAT or WalkSAT
         else:
             solution = V
+        # Write the number of False clauses of a partial result
+        partial = solution == -1 and best is not None and best.get('model') is not None
+        if partial:
+            file.write('c '+'partial_unsat '+str(best['unsat'])+'\n')
         # Write solution line
         file.write('s '+'cnf '+str(solution)+' '+str(N)+' '+str(C)+'\n')
         # Write timing line, including repetition of solution line
         file.write('t '+'cnf '+str(solution)+' '+str(N)+' '+str(C)+' '+str(T)+'\n')
 
-        # If there is a solution, write it to output file
-        if isinstance(V,list):
-            # Write variable lines
+        # If there is a solution or a partial result, write it to output file
+        if partial:
+            V = best['model']
+        if solution == 1 or partial:
+            # Write variable lines, the literals of DPLL and CDCL as they are and the truth assignments of the local
+            # search algorithms as the literal of the variable that is True
             for i in range(0,len(V)):
-                if V[i] is not False:
+                if not isinstance(V[i],bool):
+                    file.write('v '+str(V[i])+'\n')
+                elif V[i]:
                     file.write('v '+str(i+1)+'\n')
                 else:
                     file.write('v '+str(-(i+1))+'\n')
@@ -143,114 +159,233 @@ def assign(model, sentence):
     :return tmp_sentence: list of clauses with literals evaluated as True/False
     """
 
-    # Create copy of model and sentence without reference
-    tmp_model = model[:]
-    tmp_sentence = deepcopy(sentence)
-
-    # Loop through clauses of sentence
-    for i in range(len(tmp_sentence)):
-        # Loop through the three literals of clause
-        for j in range(3):
-            literal = sentence[i][j]
-            # If literal is positive, substitute literal by truth assignment
-            if literal > 0:
-                tmp_sentence[i][j] = tmp_model[literal-1]
-            # If literal is negative, substitute literal by negation of truth assignment
-            else:
-                tmp_sentence[i][j] = not tmp_model[abs(literal)-1]
+    # Build new clauses in which each literal is substituted by the truth assignment of its variable if it is positive,
+    # or by the negation of that truth assignment if it is negative. NOTE: The sentence itself is never modified, so it
+    # does not need to be copied
+    tmp_sentence = [[(literal > 0) == model[abs(literal)-1] for literal in clause] for clause in sentence]
 
     return tmp_sentence
 
 
 def satisfies(model, sentence):
     """
-    Checks if a model satisfies all clauses of a sentence.
+    Checks if a model satisfies all clauses of a sentence, see satisfiesBatch().
 
     :param model: list of (boolean) truth assignments ordered by variable number
-    :param sentence: list of clauses with literals represented by positive or negative integers
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
     :return: True if model satisfies sentence, False otherwise
     """
 
-    # Assign True/False to the variables in the sentence according to the model
-    tmp_sentence = assign(model,sentence)
-
-    # If there is any clause with all literals False, then sentence is unsatisfiable
-    for clause in tmp_sentence:
-        if all(literal is False for literal in clause):
-            return False
-
-    # If all clauses contain at least one literal that is True, the sentence is satisfiable
-    return True
+    return bool(satisfiesBatch(model, clauseMatrix(sentence))[0])
 
 
 def numSatisfiedClauses(model, sentence):
     """
-    Counts the number of clauses satisfied by the model.
+    Counts the number of clauses satisfied by the model, see numSatisfiedClausesBatch().
 
     :param model: list of (boolean) truth assignments ordered by variable number
-    :param sentence: list of clauses with literals represented by positive or negative integers
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
     :return countSatisfiedClauses: number of clauses satisfied by the model
     """
 
-    # Assign True/False to the variables in the sentence according to the model
-    tmp_sentence = assign(model,sentence)
-
-    # Count the number of satsfied clauses, i.e. clauses with at least one True literal
-    countSatisfiedClauses = 0
-    for clause in tmp_sentence:
-        if not all(literal is False for literal in clause):
-            countSatisfiedClauses += 1
+    countSatisfiedClauses = int(numSatisfiedClausesBatch(model, clauseMatrix(sentence))[0])
 
     return countSatisfiedClauses
 
 
-def randBestSuccessor(model, sentence):
+def clauseMatrix(sentence):
     """
-    Determines random best successor of the current model by flipping the variable assignments one by one and checking
-    which variable flip results in the model with the highest number of satisfied clauses.
+    Converts the sentence to a C x k matrix of signed integer literals, with k the maximum clause width. Clauses shorter
+    than k are padded with zeros, which are evaluated as False literals. The matrix of a CNF object is built once and
+    cached on it, so build the matrix once and pass it to the batch functions below when the sentence is a list.
 
-    :param model: list of (boolean) truth assignments ordered by variable number
-    :param sentence: list of clauses with literals represented by positive or negative integers
-    :return successor_model: random best successor of input model, i.e. copy with one flipped (boolean) truth assignment
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :return matrix: C x k numpy array of literals
     """
 
-    # Create copy of sentence without reference
-    tmp_sentence = deepcopy(sentence)
+    if isinstance(sentence, CNF):
+        return sentence.matrix
 
-    # Create dictionary for storing the number of satisfied clauses for each successor
-    satisfiedClauses = dict()
+    # Flatten the clauses at C speed and pad them in a single vectorized step
+    widths = np.fromiter(map(len, sentence), dtype=np.int64, count=len(sentence))
+    offsets = np.zeros(len(sentence)+1, dtype=np.int64)
+    np.cumsum(widths, out=offsets[1:])
+    literals = np.fromiter(chain.from_iterable(sentence), dtype=np.int32, count=int(offsets[-1]))
 
-    # Initialize successor model as copy of model
-    successor_model = model[:]
+    return paddedMatrix(literals, offsets)
+
+
+def literalTable(models):
+    """
+    Converts a batch of models to the truth values of all literals, indexed by literal + N. Column N, i.e. literal 0
+    used as padding by clauseMatrix(), is always False.
+
+    :param models: M x N (boolean) numpy array, each row being a model ordered by variable number
+    :return table: M x (2N+1) (boolean) numpy array, table[m, literal+N] being the truth value of the literal in model m
+    """
+
+    # A single model is treated as a batch of one
+    models = np.atleast_2d(np.asarray(models, dtype=bool))
+    M, N = models.shape
+
+    # Negative literals -N..-1 in columns 0..N-1, i.e. the negated models in reverse variable order
+    table = np.zeros((M, 2*N+1), dtype=bool)
+    table[:, N+1:] = models
+    table[:, :N] = ~models[:, ::-1]
+
+    return table
+
+
+def evaluateTable(table, matrix):
+    """
+    Evaluates all clauses for a batch of literal truth tables at once, without any Python-level loop over the clauses.
+    Also works for partial assignments, of which the unassigned variables have both literals False.
+
+    :param table: M x (2N+1) (boolean) numpy array of literal truth values indexed by literal + N, see literalTable()
+    :param matrix: C x k numpy array of literals, see clauseMatrix()
+    :return: M x C (boolean) numpy array, True where the clause is satisfied
+    """
+
+    table = np.atleast_2d(table)
+    N = (table.shape[1]-1) // 2
+
+    # Look up the truth value of every literal for every table, i.e. an M x C x k array, a clause being True if any of
+    # its literals is True. NOTE: Padding zeros look up column N, which is False
+    return table[:, matrix + N].any(axis=2)
+
+
+def evaluateBatch(models, matrix):
+    """
+    Evaluates all clauses for a batch of models at once, see evaluateTable().
+
+    :param models: M x N (boolean) numpy array, each row being a model ordered by variable number
+    :param matrix: C x k numpy array of literals, see clauseMatrix()
+    :return: M x C (boolean) numpy array, True where the clause is satisfied by the model
+    """
+
+    return evaluateTable(literalTable(models), matrix)
+
+
+def numSatisfiedClausesBatch(models, matrix):
+    """
+    Counts the number of clauses satisfied by each model of a batch of models.
+
+    :param models: M x N (boolean) numpy array, each row being a model ordered by variable number
+    :param matrix: C x k numpy array of literals, see clauseMatrix()
+    :return: numpy array of length M with the number of satisfied clauses per model
+    """
+
+    return evaluateBatch(models, matrix).sum(axis=1)
+
+
+def satisfiesBatch(models, matrix):
+    """
+    Checks for each model of a batch of models whether it satisfies all clauses.
+
+    :param models: M x N (boolean) numpy array, each row being a model ordered by variable number
+    :param matrix: C x k numpy array of literals, see clauseMatrix()
+    :return: (boolean) numpy array of length M, True where the model satisfies the sentence
+    """
+
+    return evaluateBatch(models, matrix).all(axis=1)
+
+
+def GSATScoresBatch(N, models, matrix):
+    """
+    Computes the true literal counts per clause and the make and break counts of all variables (see GSATScores()) for a
+    batch of models at once, e.g. the random models of several GSAT restarts.
+
+    :param N: number of variables
+    :param models: M x N (boolean) numpy array, each row being a model ordered by variable number
+    :param matrix: C x k numpy array of literals of clauses without duplicate literals, see clauseMatrix()
+    :return numTrue: M x C numpy array of the number of True literals per clause
+    :return makeCount: M x (N+1) numpy array of make counts, indexed by variable number (index 0 is 0)
+    :return breakCount: M x (N+1) numpy array of break counts, indexed by variable number (index 0 is 0)
+    :return numFalse: numpy array of length M with the number of False clauses per model
+    """
+
+    literalsTrue = literalTable(models)[:, matrix + N]
+    numTrue = literalsTrue.sum(axis=2)
+    M = len(numTrue)
+    variables = np.abs(matrix)
+
+    # Every variable of a False clause makes it, counted per model by offsetting the variables by m*(N+1). NOTE: The
+    # padding zeros are counted at index 0, which is reset
+    models, clauses = np.nonzero(numTrue == 0)
+    makeCount = np.bincount((variables[clauses] + (N+1)*models[:, None]).ravel(), minlength=M*(N+1))
+    makeCount = makeCount.reshape(M, N+1)
+    makeCount[:, 0] = 0
+
+    # The variable of the only True literal of a clause breaks it
+    models, clauses = np.nonzero(numTrue == 1)
+    breakers = variables[clauses, literalsTrue[models, clauses].argmax(axis=1)] if len(clauses) else clauses
+    breakCount = np.bincount(breakers + (N+1)*models, minlength=M*(N+1)).reshape(M, N+1)
+
+    return numTrue, makeCount, breakCount, (numTrue == 0).sum(axis=1)
 
-    # Loop through the variables
-    for variable in range(1,len(model)+1):
-        # Create copy of model without reference
-        tmp_model = model[:]
 
-        # Flip truth assignment for this variable. NOTE: -1 because index starts at 0 while variables start at 1
-        tmp_model[variable-1] = not tmp_model[variable-1]
+def flipNeighbours(model, variables):
+    """
+    Generates the successors of a model obtained by flipping each of the given variables, one successor per variable.
+
+    :param model: list of (boolean) truth assignments ordered by variable number
+    :param variables: list of variables to flip
+    :return: M x N (boolean) numpy array, row m being the model with variables[m] flipped
+    """
+
+    neighbours = np.tile(np.asarray(model, dtype=bool), (len(variables), 1))
 
-        # Count number of satisfied clauses for this successor and store in dictionary
-        satisfiedClauses[variable] = numSatisfiedClauses(tmp_model,tmp_sentence)
+    # Flip one variable per row. NOTE: -1 because index starts at 0 while variables start at 1
+    rows = np.arange(len(variables))
+    columns = np.asarray(variables) - 1
+    neighbours[rows, columns] = ~neighbours[rows, columns]
 
-    # Find successor with maximum number of satisfied clauses
+    return neighbours
 
-    # Get keys (i.e. variables) corresponding to best successors when flipped. NOTE: max is assigned to variable m such
-    # that it is only computed once
-    bestVars = [key for m in [max(satisfiedClauses.values())] for key,val in satisfiedClauses.items() if val == m]
 
-    # If multiple best successors, choose one randomly
+def randBestFlip(model, matrix, variables):
+    """
+    Determines the random best successor of the current model among the successors obtained by flipping the given
+    variables. All successors are scored at once using the vectorized clause evaluation.
+
+    :param model: list of (boolean) truth assignments ordered by variable number
+    :param matrix: C x k numpy array of literals, see clauseMatrix()
+    :param variables: list of candidate variables to flip
+    :return successor_model: random best successor of input model, i.e. copy with one flipped (boolean) truth assignment
+    """
+
+    # Count number of satisfied clauses for all successors in a single call
+    satisfiedClauses = numSatisfiedClausesBatch(flipNeighbours(model, variables), matrix)
+
+    # Get variables corresponding to best successors when flipped and, if multiple, choose one randomly
+    bestVars = [variables[m] for m in np.flatnonzero(satisfiedClauses == satisfiedClauses.max())]
     randBestVar = choice(bestVars)
 
-    # Flip the variable in the model. NOTE: Again -1, because variables start at 1 and index at 0
+    # Flip the variable in a copy of the model. NOTE: Again -1, because variables start at 1 and index at 0
+    successor_model = model[:]
     successor_model[randBestVar-1] = not model[randBestVar-1]
 
-    # Return random best successor model
     return successor_model
 
 
-def randBestSuccessor2(clause, model, sentence):
+def randBestSuccessor(model, sentence, matrix=None):
+    """
+    Determines random best successor of the current model by flipping the variable assignments one by one and checking
+    which variable flip results in the model with the highest number of satisfied clauses, see randBestFlip().
+
+    :param model: list of (boolean) truth assignments ordered by variable number
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param matrix: optional clause matrix of the sentence (see clauseMatrix()), built if not given
+    :return successor_model: random best successor of input model, i.e. copy with one flipped (boolean) truth assignment
+    """
+
+    if matrix is None:
+        matrix = clauseMatrix(sentence)
+
+    return randBestFlip(model, matrix, list(range(1,len(model)+1)))
+
+
+def randBestSuccessor2(clause, model, sentence, matrix=None):
     """
     Determines random best successor of the current model by flipping the variable assignments of the variables in the
     specified clause one by one and checking which variable flip results in the model with the highest number of
@@ -259,282 +394,1269 @@ def randBestSuccessor2(clause, model, sentence):
 
     :param clause: list of three literals
     :param model: list of (boolean) truth assignments ordered by variable number
-    :param sentence: list of clauses with literals represented by positive or negative integers
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param matrix: optional clause matrix of the sentence (see clauseMatrix()), built if not given
     :return successor_model: random best successor of input model, i.e. copy with one flipped (boolean) truth assignment
     """
 
-    # Create copy of sentence without reference
-    tmp_sentence = deepcopy(sentence)
+    if matrix is None:
+        matrix = clauseMatrix(sentence)
 
-    # Create dictionary for storing the number of satisfied clauses for each successor
-    satisfiedClauses = dict()
+    # Remove duplicate variables while keeping the clause order
+    return randBestFlip(model, matrix, list(dict.fromkeys(map(abs,clause))))
 
-    # Initialize successor model as copy of model
-    successor_model = model[:]
 
-    # Loop through the variables in the clause
-    for variable in list(map(abs,clause)):
-        # Create copy of model without reference
-        tmp_model = model[:]
+def randFalseClause(model, sentence):
+    """
+    Returns a random choice of one of the clauses in the sentence that is not satisfied, i.e. that is False.
 
-        # Flip truth assignment for this variable. NOTE: -1 because index starts at 0 while variables start at 1
-        tmp_model[variable-1] = not tmp_model[variable-1]
+    :param model: list of (boolean) truth assignments ordered by variable number
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :return randomFalseClause: random choice of one of the clauses of the sentence that is False
+    """
 
-        # Count number of satisfied clauses for this successor and store in dictionary
-        satisfiedClauses[variable] = numSatisfiedClauses(tmp_model,tmp_sentence)
+    # Evaluate all clauses at once and choose one of the False clauses randomly
+    falseClauses = np.flatnonzero(~evaluateBatch(model, clauseMatrix(sentence))[0])
+    randomFalseClause = sentence[int(choice(falseClauses))]
 
-    # Find successor with maximum number of satisfied clauses
+    return randomFalseClause
 
-    # Get keys (i.e. variables) corresponding to best successors when flipped. NOTE: max is assigned to variable m such
-    # that it is only computed once
-    bestVars = [key for m in [max(satisfiedClauses.values())] for key,val in satisfiedClauses.items() if val == m]
 
-    # If multiple best successors, choose one randomly
-    randBestVar = choice(bestVars)
+def occurrenceIndex(N, sentence):
+    """
+    Builds the literal occurrence index of a sentence, i.e. for every literal the list of (indices of) clauses in which
+    it occurs. Duplicate literals are removed from the clauses and tautologies (clauses containing both a literal and
+    its negation) are left out, because they are satisfied by every model and never influence the local search.
 
-    # Flip the variable in the model. NOTE: Again -1, because variables start at 1 and index at 0
-    successor_model[randBestVar-1] = not model[randBestVar-1]
+    NOTE: The occurrence lists are stored in a single list of length 2N+1 that is indexed directly by the literal.
+    Positive literals 1..N use indices 1..N and negative literals -1..-N use Python's negative indexing, i.e. indices
+    2N..N+1, so both signs can be looked up without any offset computation.
 
-    # Return random best successor model
-    return successor_model
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :return clauses: list of clauses without duplicate literals and tautologies
+    :return occurrences: list of clause indices for every literal, indexed by the literal itself
+    """
 
+    # A CNF object without duplicate literals and tautologies already holds the index, so it is shared instead of copied
+    if isinstance(sentence, CNF) and sentence.simple:
+        return sentence, sentence.occurrences
 
-def randFalseClause(model, sentence):
+    clauses = []
+    occurrences = [[] for i in range(2*N+1)]
+
+    for clause in sentence:
+        # Remove duplicate literals while keeping the original literal order
+        literals = list(dict.fromkeys(clause))
+
+        # Skip tautologies
+        if any(-literal in literals for literal in literals):
+            continue
+
+        # Register clause in the occurrence lists of its literals
+        for literal in literals:
+            occurrences[literal].append(len(clauses))
+        clauses.append(literals)
+
+    return clauses, occurrences
+
+
+def trueLiteralCounts(model, clauses):
     """
-    Returns a random choice of one of the clauses in the sentence that is not satisfied, i.e. that is False.
+    Counts for every clause the number of literals that are True under the model.
 
     :param model: list of (boolean) truth assignments ordered by variable number
-    :param sentence: list of clauses with literals represented by positive or negative integers
-    :return randomFalseClause: random choice of one of the clauses of the sentence that is False
+    :param clauses: list of clauses with literals represented by positive or negative integers
+    :return numTrue: list of the number of True literals per clause
     """
 
-    # Assign True/False to the variables in the sentence according to the model
-    tmp_sentence = assign(model,sentence)
+    # A literal is True if its sign matches the truth assignment of its variable
+    return [sum((literal > 0) == model[abs(literal)-1] for literal in clause) for clause in clauses]
 
-    # List all False clauses in unassigned form, i.e. with the original literals/symbols instead of True/False
-    falseClauses = []
-    for i in range(len(tmp_sentence)):
-        if all(literal is False for literal in tmp_sentence[i]):
-            falseClauses.append(sentence[i])
 
-    # Choose one of the False clauses randomly
-    randomFalseClause = choice(falseClauses)
+def GSATScores(N, model, clauses, numTrue):
+    """
+    Computes the make and break counts of all variables for the current model. The make count of a variable is the
+    number of False clauses that become True when flipping it, the break count is the number of True clauses that become
+    False, i.e. the clauses in which the variable provides the only True literal. The score of a variable is the change
+    in the number of satisfied clauses when flipping it, i.e. make - break.
 
-    return randomFalseClause
+    :param N: number of variables
+    :param model: list of (boolean) truth assignments ordered by variable number
+    :param clauses: list of clauses with literals represented by positive or negative integers
+    :param numTrue: list of the number of True literals per clause
+    :return makeCount: list of make counts, indexed by variable number
+    :return breakCount: list of break counts, indexed by variable number
+    :return score: list of scores, indexed by variable number. NOTE: index 0 holds a score lower than any real score,
+    such that it is never selected as best variable
+    :return numFalse: number of False clauses
+    """
+
+    makeCount = [0]*(N+1)
+    breakCount = [0]*(N+1)
+    numFalse = 0
+
+    for i in range(len(clauses)):
+        # False clause: flipping any of its variables makes it True
+        if numTrue[i] == 0:
+            numFalse += 1
+            for literal in clauses[i]:
+                makeCount[abs(literal)] += 1
+        # Clause with a single True literal: flipping that variable breaks it
+        elif numTrue[i] == 1:
+            for literal in clauses[i]:
+                if (literal > 0) == model[abs(literal)-1]:
+                    breakCount[abs(literal)] += 1
+                    break
+
+    score = [makeCount[i] - breakCount[i] for i in range(N+1)]
+    score[0] = -len(clauses)-1
+
+    return makeCount, breakCount, score, numFalse
 
 
-def GSAT(N, sentence, max_restarts, max_climbs):
+def GSATFlip(variable, model, clauses, occurrences, numTrue, makeCount, breakCount, score):
+    """
+    Flips a variable in the model and updates the true literal counts, make/break counts and scores. Only the clauses in
+    which the variable occurs are visited.
+
+    :param variable: variable to flip
+    :param model: list of (boolean) truth assignments ordered by variable number, modified in place
+    :param clauses: list of clauses with literals represented by positive or negative integers
+    :param occurrences: list of clause indices for every literal, indexed by the literal itself
+    :param numTrue: list of the number of True literals per clause, modified in place
+    :param makeCount: list of make counts, indexed by variable number, modified in place
+    :param breakCount: list of break counts, indexed by variable number, modified in place
+    :param score: list of scores, indexed by variable number, modified in place
+    :return: change in the number of False clauses
+    """
+
+    # Flip truth assignment. NOTE: -1 because index starts at 0 while variables start at 1
+    model[variable-1] = not model[variable-1]
+
+    # Literal that became True and literal that became False by the flip
+    trueLiteral = variable if model[variable-1] else -variable
+    deltaFalse = 0
+
+    # Clauses containing the literal that became True
+    for i in occurrences[trueLiteral]:
+        numTrue[i] += 1
+        # Clause became True: its variables no longer make it, and the flipped variable is now the only True literal
+        if numTrue[i] == 1:
+            deltaFalse -= 1
+            for literal in clauses[i]:
+                makeCount[abs(literal)] -= 1
+                score[abs(literal)] -= 1
+            breakCount[variable] += 1
+            score[variable] -= 1
+        # Clause had a single True literal, which is no longer critical
+        elif numTrue[i] == 2:
+            for literal in clauses[i]:
+                if literal != trueLiteral and (literal > 0) == model[abs(literal)-1]:
+                    breakCount[abs(literal)] -= 1
+                    score[abs(literal)] += 1
+                    break
+
+    # Clauses containing the literal that became False
+    for i in occurrences[-trueLiteral]:
+        numTrue[i] -= 1
+        # Clause became False: the flipped variable no longer breaks it and all its variables now make it
+        if numTrue[i] == 0:
+            deltaFalse += 1
+            for literal in clauses[i]:
+                makeCount[abs(literal)] += 1
+                score[abs(literal)] += 1
+            breakCount[variable] -= 1
+            score[variable] += 1
+        # Clause is left with a single True literal, which becomes critical
+        elif numTrue[i] == 1:
+            for literal in clauses[i]:
+                if (literal > 0) == model[abs(literal)-1]:
+                    breakCount[abs(literal)] += 1
+                    score[abs(literal)] -= 1
+                    break
+
+    return deltaFalse
+
+
+def scoreBuckets(N, score):
+    """
+    Groups the variables by score, such that the variables with the highest score are found without scanning all
+    variables. Every bucket is a list of variables together with the position of every variable in its bucket, such
+    that variables can be moved between buckets (by swapping with the last element) in O(1), like falseClauseSet().
+
+    :param N: number of variables
+    :param score: list of scores, indexed by variable number
+    :return buckets: dictionary of the non-empty buckets, score -> list of variables with that score
+    :return bucketPos: list of the position of every variable in its bucket, indexed by variable number
+    """
+
+    buckets = dict()
+    bucketPos = [0]*(N+1)
+    for variable in range(1,N+1):
+        bucket = buckets.setdefault(score[variable], [])
+        bucketPos[variable] = len(bucket)
+        bucket.append(variable)
+
+    return buckets, bucketPos
+
+
+def GSATBuckets(variable, clauses, occurrences, score, bucketScore, buckets, bucketPos):
+    """
+    Moves the variables whose score was changed by flipping a variable (see GSATFlip()) to the bucket of their new
+    score. Only the variables sharing a clause with the flipped variable, including itself, can have changed.
+
+    :param variable: flipped variable
+    :param clauses: list of clauses with literals represented by positive or negative integers
+    :param occurrences: list of clause indices for every literal, indexed by the literal itself
+    :param score: list of scores, indexed by variable number
+    :param bucketScore: list of the score of the bucket of every variable, indexed by variable number, modified in place
+    :param buckets: dictionary of the non-empty buckets, see scoreBuckets(), modified in place
+    :param bucketPos: list of the position of every variable in its bucket, modified in place
+    :return:
+    """
+
+    for i in chain(occurrences[variable], occurrences[-variable]):
+        for literal in clauses[i]:
+            v = abs(literal)
+            if score[v] == bucketScore[v]:
+                continue
+
+            # Remove the variable from its bucket by moving the last variable into its position, dropping empty buckets
+            bucket = buckets[bucketScore[v]]
+            last = bucket.pop()
+            if last != v:
+                bucket[bucketPos[v]] = last
+                bucketPos[last] = bucketPos[v]
+            elif not bucket:
+                del buckets[bucketScore[v]]
+
+            # Append it to the bucket of its new score
+            bucket = buckets.setdefault(score[v], [])
+            bucketPos[v] = len(bucket)
+            bucket.append(v)
+            bucketScore[v] = score[v]
+
+
+def falseClauseSet(numTrue):
+    """
+    Builds the set of False clauses as a list of clause indices together with the position of every clause in that list,
+    such that clauses can be added, removed (by swapping with the last element) and randomly chosen in O(1).
+
+    :param numTrue: list of the number of True literals per clause
+    :return falseClauses: list of indices of the False clauses
+    :return falsePos: list of the position of every clause in falseClauses, or -1 if the clause is True
+    """
+
+    falseClauses = [i for i in range(len(numTrue)) if numTrue[i] == 0]
+    falsePos = [-1]*len(numTrue)
+    for j in range(len(falseClauses)):
+        falsePos[falseClauses[j]] = j
+
+    return falseClauses, falsePos
+
+
+def WalkSATScore(variable, model, occurrences, numTrue):
+    """
+    Computes the change in the number of satisfied clauses when flipping a variable, i.e. make - break, by only visiting
+    the clauses in which the variable occurs.
+
+    :param variable: variable to evaluate
+    :param model: list of (boolean) truth assignments ordered by variable number
+    :param occurrences: list of clause indices for every literal, indexed by the literal itself
+    :param numTrue: list of the number of True literals per clause
+    :return: number of clauses made True minus number of clauses made False by the flip
+    """
+
+    # Literal of the variable that is currently True
+    trueLiteral = variable if model[variable-1] else -variable
+
+    # Make: False clauses containing the currently False literal. Break: clauses in which the True literal is the only
+    # True literal
+    make = sum(1 for i in occurrences[-trueLiteral] if numTrue[i] == 0)
+    brk = sum(1 for i in occurrences[trueLiteral] if numTrue[i] == 1)
+
+    return make - brk
+
+
+def WalkSATFlip(variable, model, occurrences, numTrue, falseClauses, falsePos):
+    """
+    Flips a variable in the model and updates the true literal counts and the set of False clauses. Only the clauses in
+    which the variable occurs are visited.
+
+    :param variable: variable to flip
+    :param model: list of (boolean) truth assignments ordered by variable number, modified in place
+    :param occurrences: list of clause indices for every literal, indexed by the literal itself
+    :param numTrue: list of the number of True literals per clause, modified in place
+    :param falseClauses: list of indices of the False clauses, modified in place
+    :param falsePos: list of the position of every clause in falseClauses, modified in place
+    :return:
+    """
+
+    # Flip truth assignment. NOTE: -1 because index starts at 0 while variables start at 1
+    model[variable-1] = not model[variable-1]
+    trueLiteral = variable if model[variable-1] else -variable
+
+    # Clauses that became True are removed from the set by moving the last False clause into their position
+    for i in occurrences[trueLiteral]:
+        numTrue[i] += 1
+        if numTrue[i] == 1:
+            last = falseClauses.pop()
+            if last != i:
+                falseClauses[falsePos[i]] = last
+                falsePos[last] = falsePos[i]
+            falsePos[i] = -1
+
+    # Clauses that became False are appended to the set
+    for i in occurrences[-trueLiteral]:
+        numTrue[i] -= 1
+        if numTrue[i] == 0:
+            falsePos[i] = len(falseClauses)
+            falseClauses.append(i)
+
+
+def addStats(stats, counters):
+    """
+    Adds search statistics to a statistics dictionary, e.g. of several runs or workers. Counts are summed, except for
+    the lowest number of False clauses (best_unsat), the lowest total weight of False clauses (best_cost) and the
+    maximum search depth (max_depth), of which the minimum and maximum are kept. Other values (e.g. strings) are
+    overwritten.
+
+    :param stats: statistics dictionary, modified in place
+    :param counters: dictionary of statistics to add
+    :return:
+    """
+
+    for key, value in counters.items():
+        if key not in stats or isinstance(value, bool) or not isinstance(value, (int, float)):
+            stats[key] = value
+        elif key in ('best_unsat', 'best_cost'):
+            stats[key] = min(stats[key], value)
+        elif key == 'max_depth':
+            stats[key] = max(stats[key], value)
+        else:
+            stats[key] += value
+
+
+def updateIncumbent(incumbent, model, unsat):
+    """
+    Stores a copy of the model in the incumbent dictionary if it has fewer False clauses than the stored one, such that
+    an anytime search can return the best assignment found when it is stopped before finding a solution.
+
+    :param incumbent: dictionary with the best model ('model') and its number of False clauses ('unsat'), or empty
+    :param model: list of (boolean) truth assignments ordered by variable number
+    :param unsat: number of False clauses of the model
+    :return:
+    """
+
+    if 'unsat' not in incumbent or unsat < incumbent['unsat']:
+        incumbent['model'] = list(model)
+        incumbent['unsat'] = unsat
+
+
+def GSAT(N, sentence, max_restarts, max_climbs, stop=None, stats=None, callback=None, interval=1000, incumbent=None):
     """
     GSAT algorithm. This random-restart, hill-climbing search algorithm returns a truth assignment that satisfies the
     sentence or returns False if no solution was found within the maximum number of restarts and climbs.
 
     :param N: number of variables
-    :param sentence: list of clauses with literals represented by positive or negative integers
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
     :param max_restarts: max. number of restarts, i.e. random truth assignments / models
     :param max_climbs: max. number of climbs, i.e. variable flips / successors
+    :param stop: optional event (e.g. multiprocessing.Event) that makes the search give up when set, checked at every
+    restart and every 256 climbs
+    :param stats: optional dictionary to which the search statistics are added: the number of restarts, flips (every
+    climb is a flip) and improving flips (flips that strictly decrease the number of False clauses) and the lowest
+    number of False clauses reached
+    :param callback: optional function called every interval flips as callback(stats, best), stats being a dictionary
+    with the statistics so far and best the lowest number of False clauses reached
+    :param interval: number of flips between calls of the callback
+    :param incumbent: optional dictionary in which the best model found and its number of False clauses are stored,
+    see updateIncumbent()
     :return model: model satisfying the sentence, i.e. list of (boolean) truth assignments ordered by variable number
     :return: -1 if no solution found within max_climbs and max_restarts
     """
 
+    # Build the literal occurrence index and the clause matrix once, they do not depend on the model
+    clauses, occurrences = occurrenceIndex(N, sentence)
+    matrix = clauseMatrix(clauses)
+
+    solution = -1
+    restarts = 0
+    flips = 0
+    improving = 0
+    best = len(clauses)     # lowest number of False clauses reached
+    batch = 0               # position of the next restart in the current batch of restart models
+    models = []
+
     for i in range(1,max_restarts+1):
-        model = randAssignment(N)
+        if stop is not None and stop.is_set():
+            break
+
+        # Draw the random models of the next restarts and compute their true literal counts per clause and make/break
+        # counts per variable at once
+        if batch == len(models):
+            models = np.random.random((min(RESTART_BATCH, max_restarts-i+1), N)) < 0.5
+            numTrues, makeCounts, breakCounts, numFalses = GSATScoresBatch(N, models, matrix)
+            batch = 0
+        model = models[batch].tolist()
+        numTrue = numTrues[batch].tolist()
+        makeCount = makeCounts[batch].tolist()
+        breakCount = breakCounts[batch].tolist()
+        numFalse = int(numFalses[batch])
+        batch += 1
+        restarts += 1
+
+        # Scores per variable, grouped in buckets. NOTE: index 0 holds a score lower than any real score, see
+        # GSATScores(), and is not in any bucket
+        score = [makeCount[v] - breakCount[v] for v in range(N+1)]
+        score[0] = -len(clauses)-1
+        buckets, bucketPos = scoreBuckets(N, score)
+        bucketScore = score[:]
+        best = min(best, numFalse)
+        if incumbent is not None:
+            updateIncumbent(incumbent, model, numFalse)
+
         for j in range(1,max_climbs+1):
-            if satisfies(model,sentence):
-                return model
+            if numFalse == 0:
+                solution = model
+                break
             else:
-                model = randBestSuccessor(model,sentence)
+                # Get variables whose flip results in the highest number of satisfied clauses, i.e. the bucket of the
+                # highest score, and choose one randomly. NOTE: The number of buckets is bounded by the range of the
+                # scores, which is much smaller than N
+                bestScore = max(buckets)
+                variable = choice(buckets[bestScore])
+                # Move to the random best successor, only updating the clauses in which the variable occurs and the
+                # buckets of the variables whose score changed
+                numFalse += GSATFlip(variable,model,clauses,occurrences,numTrue,makeCount,breakCount,score)
+                GSATBuckets(variable, clauses, occurrences, score, bucketScore, buckets, bucketPos)
+                flips += 1
+                if bestScore > 0:
+                    improving += 1
+                if numFalse < best:
+                    best = numFalse
+                    if incumbent is not None:
+                        updateIncumbent(incumbent, model, numFalse)
+                if callback is not None and flips % interval == 0:
+                    callback({'restarts': restarts, 'flips': flips, 'improving_flips': improving, 'best_unsat': best},
+                             best)
+                if stop is not None and j % 256 == 0 and stop.is_set():
+                    break
+
+        if solution != -1:
+            break
+
+    if stats is not None:
+        addStats(stats, {'restarts': restarts, 'flips': flips, 'improving_flips': improving, 'best_unsat': best})
 
     # Return -1 if failed to find a model that satisfies the sentence
-    return -1
+    return solution
 
 
-def WalkSAT(N, sentence, p, max_flips):
+def WalkSAT(N, sentence, p, max_flips, stop=None, stats=None, callback=None, interval=1000, incumbent=None):
     """
     WalkSAT algorithm. This local-search algorithm returns a truth assignment that satisfies the sentence or returns
     False if no solution was found within the maximum number of flips.
 
     :param N: number of variables
-    :param sentence: list of clauses with literals represented by positive or negative integers
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
     :param p: probability of performing a random variable flip rather than a greedy variable flip
     :param max_flips: maximum number of variable flips before giving up
+    :param stop: optional event (e.g. multiprocessing.Event) that makes the search give up when set, checked every 256
+    flips
+    :param stats: optional dictionary to which the search statistics are added: the number of flips, random and greedy
+    flips and the lowest number of False clauses reached
+    :param callback: optional function called every interval flips as callback(stats, best), stats being a dictionary
+    with the statistics so far and best the lowest number of False clauses reached
+    :param interval: number of flips between calls of the callback
+    :param incumbent: optional dictionary in which the best model found and its number of False clauses are stored,
+    see updateIncumbent()
     :return model: model satisfying the sentence, i.e. list of (boolean) truth assignments ordered by variable number
     :return: -1 if no solution found within max_flips
     """
 
+    # Build the literal occurrence index once, it does not depend on the model
+    clauses, occurrences = occurrenceIndex(N, sentence)
+
     model = randAssignment(N)
 
+    # Initialize the true literal counts per clause and the set of False clauses
+    numTrue = trueLiteralCounts(model,clauses)
+    falseClauses, falsePos = falseClauseSet(numTrue)
+
+    solution = -1
+    flips = 0
+    randomFlips = 0
+    best = len(falseClauses)    # lowest number of False clauses reached
+    if incumbent is not None:
+        updateIncumbent(incumbent, model, best)
+
     for i in range(1,max_flips+1):
-        if satisfies(model,sentence):
-            return model
+        if not falseClauses:
+            solution = model
+            break
         else:
             # Randomly choose False clause
-            clause = randFalseClause(model,sentence)
+            clause = clauses[choice(falseClauses)]
 
-            # With probability p, flip variable in model randomly chosen from clause
-            if pchoice([True,False],p=[p,1-p]):
+            # With probability p, flip variable in model randomly chosen from clause. NOTE: A single uniform draw
+            # instead of numpy.random.choice, which has a large overhead per call
+            if random() < p:
                 # Randomly choose variable from clause
                 variable = abs(choice(clause))
-                # Flip variable truth assignment in model
-                model[variable-1] = not model[variable-1]
+                randomFlips += 1
 
             # Else, flip variable in model chosen from clause that maximizes the number of satisfied clauses
             else:
-                model = randBestSuccessor2(clause,model,sentence)
+                scores = {abs(literal): WalkSATScore(abs(literal),model,occurrences,numTrue) for literal in clause}
+                bestVars = [key for m in [max(scores.values())] for key,val in scores.items() if val == m]
+                variable = choice(bestVars)
+
+            # Flip variable truth assignment in model, only updating the clauses in which the variable occurs
+            WalkSATFlip(variable,model,occurrences,numTrue,falseClauses,falsePos)
+            flips += 1
+            if len(falseClauses) < best:
+                best = len(falseClauses)
+                if incumbent is not None:
+                    updateIncumbent(incumbent, model, best)
+            if callback is not None and flips % interval == 0:
+                callback({'flips': flips, 'random_flips': randomFlips, 'greedy_flips': flips - randomFlips,
+                          'best_unsat': best}, best)
+            if stop is not None and i % 256 == 0 and stop.is_set():
+                break
+
+    if stats is not None:
+        addStats(stats, {'flips': flips, 'random_flips': randomFlips, 'greedy_flips': flips - randomFlips,
+                         'best_unsat': best})
 
     # Return -1 if failed to find a model that satisfies the sentence
-    return -1
+    return solution
 
 
-def DPLLPure(N, sentence, model):
+class DPLLEngine:
     """
-    Returns a list of pure symbols in a sentence, taking under consideration current model.
-
-    :param N: number of variables
-    :param sentence: list of clauses with literals represented by positive or negative integers
-    :param model: current model containing positive or negative integers
-    :return pureSymbols: a list of pure symbols
+    Iterative DPLL engine. The partial model is stored as an assignment array indexed by literal, unit propagation uses
+    two watched literals per clause and every assigned literal is recorded on a trail, such that backtracking only
+    unassigns the literals set since the last decision. Instead of recursing, the decisions are kept on an explicit
+    stack, so the search depth is not limited by Python's recursion limit. Branching is delegated to a heuristic from
+    heuristics.py, which is notified of every assignment and unassignment.
+
+    The engine counts its decisions, unit propagations, pure literal assignments, conflicts and backtracks and the
+    maximum search depth (number of decisions on the stack) in the stats dictionary. If a callback is given, it is
+    called every interval conflicts. If a stop event is given, the search gives up without a decision as soon as it is
+    set, checked at every conflict and every 256 decisions.
+
+    NOTE: Like the occurrence lists of the local search, all per-literal lists have length 2N+1 and are indexed directly
+    by the literal, negative literals using Python's negative indexing.
     """
-    pureSymbolsTmp = []
 
-    for clause in sentence:
-        clausePureTmp = []
-        for literal in clause:
-            if literal in model:  # if we find the literal in the model
-                clausePureTmp = []
-                break  # we don't need to check other literals, because the clause is true
-            elif -literal not in model:  # if -literal exists in model, than we shouldn't do nothing
-                if literal not in pureSymbolsTmp:
-                    clausePureTmp.append(literal)
-        pureSymbolsTmp.extend(clausePureTmp)
-
-    # perform a check for contradictory literals
-    pureSymbols = []
-    for symbol in pureSymbolsTmp:
-        if -symbol not in pureSymbolsTmp:
-            pureSymbols.append(symbol)
+    def __init__(self, N, sentence, heuristic='ordered', phase_saving=None, callback=None, interval=1000, stop=None):
+        """
+        Loads the sentence into the engine: removes duplicate literals and tautologies, sets up the watches and
+        enqueues the unit clauses.
+
+        :param N: number of variables
+        :param sentence: list of clauses with literals represented by positive or negative integers
+        :param heuristic: branching heuristic name ('ordered', 'VSIDS', 'MOMs', 'JW' or 'DLIS') or Heuristic object
+        :param phase_saving: True to enable phase saving, None for the default of the heuristic
+        :param callback: optional function called every interval conflicts as callback(stats, best), stats being a copy
+        of the statistics so far and best None, as a partial assignment has no number of False clauses
+        :param interval: number of conflicts between calls of the callback
+        :param stop: optional event (e.g. multiprocessing.Event or anytime.Budget) that makes the search give up when
+        set
+        """
+
+        self.N = N
+        self.value = [0]*(2*N+1)        # 1 if literal True, -1 if False, 0 if unassigned
+        self.reason = [-1]*(N+1)        # index of clause that implied the variable, -1 for decisions and root literals
+        self.trail = []                 # assigned literals in assignment order
+        self.decisions = []             # stack of [trail position, decision literal, both phases tried]
+        self.qhead = 0                  # position in trail of next literal to propagate
+        self.clauses = []               # clauses, the first two literals being the watched ones
+        self.watches = [[] for i in range(2*N+1)]   # clauses watching each literal
+        self.units = []                 # literals of unit clauses
+        self.unsat = False              # set if the sentence contains an empty clause or contradictory unit clauses
+        self.stats = {'decisions': 0, 'propagations': 0, 'pure_literals': 0, 'conflicts': 0, 'backtracks': 0,
+                      'max_depth': 0}
+        self.callback = callback
+        self.interval = interval
+        self.stop = stop
+
+        for clause in sentence:
+            self.addClause(clause)
+
+        self.heuristic = makeHeuristic(heuristic, phase_saving)
+        self.heuristic.attach(self)
+
+    def addClause(self, clause):
+        """
+        Adds a clause to the engine. Must be called at decision level 0.
+
+        :param clause: list of literals represented by positive or negative integers
+        :return: index of the clause, or -1 if it is not stored (tautology, unit or empty clause)
+        """
+
+        # Remove duplicate literals while keeping the original literal order and skip tautologies
+        literals = list(dict.fromkeys(clause))
+        if any(-literal in literals for literal in literals):
+            return -1
+
+        if len(literals) == 0:
+            self.unsat = True
+            return -1
+        if len(literals) == 1:
+            self.units.append(literals[0])
+            return -1
+
+        # Watch the first two literals
+        index = len(self.clauses)
+        self.clauses.append(literals)
+        self.watches[literals[0]].append(index)
+        self.watches[literals[1]].append(index)
+
+        return index
+
+    def assign(self, literal, reason):
+        """
+        Makes a literal True and records it on the trail.
+
+        :param literal: literal represented by a positive or negative integer
+        :param reason: index of the clause that implied the literal, or -1
+        :return:
+        """
+
+        self.value[literal] = 1
+        self.value[-literal] = -1
+        self.reason[abs(literal)] = reason
+        self.trail.append(literal)
+        self.heuristic.assigned(literal)
+
+    def propagate(self):
+        """
+        Performs unit propagation of all literals on the trail that have not been propagated yet. For every literal that
+        became False only the clauses watching it are visited: each of them either finds a new non-False literal to
+        watch, is already satisfied by its other watch, becomes unit (its other watch is implied) or is in conflict.
+
+        :return: index of the conflicting clause, or -1 if no conflict
+        """
+
+        value = self.value
+        clauses = self.clauses
+        watches = self.watches
+        propagations = 0
+
+        while self.qhead < len(self.trail):
+            falseLiteral = -self.trail[self.qhead]
+            self.qhead += 1
+
+            watchList = watches[falseLiteral]
+            i = 0   # read position in the watch list
+            j = 0   # write position in the watch list, i.e. clauses that keep watching the literal
+            while i < len(watchList):
+                c = watchList[i]
+                i += 1
+                clause = clauses[c]
+
+                # Make sure the False literal is the second watch
+                if clause[0] == falseLiteral:
+                    clause[0], clause[1] = clause[1], falseLiteral
+                first = clause[0]
+
+                # Clause already satisfied by the other watch
+                if value[first] == 1:
+                    watchList[j] = c
+                    j += 1
+                    continue
+
+                # Look for a new literal to watch that is not False
+                for k in range(2, len(clause)):
+                    if value[clause[k]] != -1:
+                        clause[1], clause[k] = clause[k], falseLiteral
+                        watches[clause[1]].append(c)
+                        break
+                else:
+                    # No new watch: the clause keeps watching the literal and is either unit or in conflict
+                    watchList[j] = c
+                    j += 1
+                    if value[first] == -1:
+                        # Conflict: keep the remaining watches and stop propagating
+                        while i < len(watchList):
+                            watchList[j] = watchList[i]
+                            i += 1
+                            j += 1
+                        del watchList[j:]
+                        self.qhead = len(self.trail)
+                        self.stats['propagations'] += propagations
+                        return c
+                    self.assign(first, c)
+                    propagations += 1
+
+            del watchList[j:]
+
+        self.stats['propagations'] += propagations
+        return -1
+
+    def undo(self, position):
+        """
+        Unassigns all literals on the trail from the given position onwards.
+
+        :param position: trail position to backtrack to
+        :return:
+        """
+
+        for literal in reversed(self.trail[position:]):
+            self.value[literal] = 0
+            self.value[-literal] = 0
+            self.reason[abs(literal)] = -1
+            self.heuristic.unassigned(literal)
+        del self.trail[position:]
+        self.qhead = position
+
+    def decide(self):
+        """
+        Chooses the next branching literal using the branching heuristic.
+
+        :return: branching literal, or 0 if all variables are assigned
+        """
+
+        return self.heuristic.decide()
+
+    def backtrack(self):
+        """
+        Chronological backtracking: undoes the most recent decision whose opposite phase has not been tried yet and
+        assigns that opposite phase.
+
+        :return: True if a new branch was entered, False if all branches have been exhausted
+        """
+
+        self.stats['backtracks'] += 1
+        while self.decisions:
+            position, literal, flipped = self.decisions.pop()
+            self.undo(position)
+            if not flipped:
+                self.decisions.append([position, -literal, True])
+                self.assign(-literal, -1)
+                return True
 
-    pureSymbols = sorted(pureSymbols, key=abs)
-    return pureSymbols
+        return False
 
+    def rootPure(self):
+        """
+        Assigns all pure literals of the sentence, i.e. literals whose negation does not occur in any clause. Only done
+        at decision level 0, before the search.
 
-def DPLLUnit(N, sentence, model):
-    """
-    Returns a list of unit clauses in a sentence, taking under consideration current model.
-    The list can contain contradictory clauses (e.g. 4 and -4) if it falls out of the model,
-    but that means that the model is not correct.
+        :return: list of pure literals assigned
+        """
 
-    :param N: number of variables
-    :param sentence: list of clauses with literals represented by positive or negative integers
-    :param model: current model containing positive or negative integers
-    :return unitClauses: a list of unit clauses
-    """
-    unitClauses = []
-    for clause in sentence:
-        clauseStatus = False
-        clauseUnitTmp = []  # initialize list, that will contain temporary candidates for unit clauses
-        for literal in clause:
-            if literal in model:  # if we find that it matches (so the clause is true)
-                clauseStatus = True
-                break
-            elif -literal not in model:  # if we don't find negation as well
-                clauseUnitTmp.append(literal)   # append to possible candidates
-        if len(clauseUnitTmp) == 1 and clauseStatus is False and clauseUnitTmp[0] not in unitClauses:     # if we have only one literal here, then this is a unit clause
-            unitClauses.append(clauseUnitTmp[0])
+        occurs = [False]*(2*self.N+1)
+        for clause in self.clauses:
+            for literal in clause:
+                occurs[literal] = True
+        for literal in self.units:
+            occurs[literal] = True
 
-    unitClauses = sorted(unitClauses, key=abs)
-    return unitClauses
+        pureSymbols = []
+        for variable in range(1, self.N+1):
+            for literal in (variable, -variable):
+                if occurs[literal] and not occurs[-literal] and self.value[literal] == 0:
+                    self.assign(literal, -1)
+                    pureSymbols.append(literal)
+        self.stats['pure_literals'] += len(pureSymbols)
 
+        return pureSymbols
 
-def DPLLExtend(model, symbols):
-    """
-    Returns a concatenated, sorted list consisting of all symbols from model and symbols.
+    def initialize(self, pure=True):
+        """
+        Assigns the literals of the unit clauses and the pure literals at decision level 0.
 
-    :param model: current model containing positive or negative integers
-    :param symbols: list of clauses with literals represented by positive or negative integers
-    :return sorted(tmp, key=abs): a list of list of all values
-    """
-    tmp = model+symbols
-    return sorted(tmp, key=abs)
+        :param pure: if False, do not assign the pure literals, e.g. because assumptions may contradict them
+        :return: False if the sentence contains an empty clause or contradictory unit clauses, True otherwise
+        """
 
+        if self.unsat:
+            return False
 
-def DPLL(N, sentence, model, modelsave, level):
-    """
-    DPLL recursive algorithm. Checks whether current model satisfies the sentence.
-    If not, check whether the model makes the sentence false if not, it modifies the model and reruns itself.
+        # Enqueue unit clauses, checking for contradictory ones
+        for literal in self.units:
+            if self.value[literal] == -1:
+                return False
+            if self.value[literal] == 0:
+                self.assign(literal, -1)
+        if pure:
+            self.rootPure()
 
-    :param N: number of variables
-    :param sentence: list of clauses with literals represented by positive or negative integers
-    :param model: current model containing positive or negative integers
-    :param modelsave: a reference to an object to be used to assign final solution to
-    :param level: an integer indicating the current stack depth
-    :return Boolean value: indicates whether current model satisfies the sentence or makes it false
-    """
-    nrClausesSatisfied = 0     # initialize variable
-    for clause in sentence:
-        for literal in clause:
-            if literal in model:  # if clause satisfied
-                nrClausesSatisfied += 1
-                break
-    if nrClausesSatisfied == len(sentence): # if all clauses satisfied
-        modelsave.extend(model)
         return True
 
-    for clause in sentence:
-        nrLiteralsNegated = 0
-        for literal in clause:
-            if -literal in model:
-                nrLiteralsNegated +=1
-        if nrLiteralsNegated == len(clause):
+    def conflict(self):
+        """
+        Counts a conflict and calls the callback every interval conflicts.
+
+        :return:
+        """
+
+        self.stats['conflicts'] += 1
+        if self.callback is not None and self.stats['conflicts'] % self.interval == 0:
+            self.callback(dict(self.stats), None)
+
+    def stopped(self):
+        """
+        Checks the stop event, called at every conflict and every 256 decisions.
+
+        :return: True if the search should give up, False otherwise
+        """
+
+        return self.stop is not None and self.stop.is_set()
+
+    def branch(self, literal):
+        """
+        Opens a new decision level by assigning a decision literal.
+
+        :param literal: decision literal represented by a positive or negative integer
+        :return:
+        """
+
+        self.decisions.append([len(self.trail), literal, False])
+        self.assign(literal, -1)
+        self.stats['decisions'] += 1
+        if len(self.decisions) > self.stats['max_depth']:
+            self.stats['max_depth'] = len(self.decisions)
+
+    def solve(self):
+        """
+        Runs the DPLL search.
+
+        :return: True if the sentence is satisfiable, False otherwise, None if stopped before a decision was reached
+        """
+
+        if not self.initialize():
             return False
 
-    # at this point of algorithm we have the situation, when model has too few propositions to finish the computations
+        while True:
+            conflict = self.propagate()
+            if conflict != -1:
+                self.conflict()
+                if self.stopped():
+                    return None
+                self.heuristic.conflict(self.clauses[conflict])
+                if not self.backtrack():
+                    return False
+                continue
 
-    symbols = DPLLPure(N, sentence, model)  # get the list of pure symbols
-    if len(symbols) > 0:    # if pure symbols found
-        return DPLL(N, sentence, DPLLExtend(model, symbols), modelsave, level+1)
+            literal = self.decide()
+            if literal == 0:
+                return True
+            if self.stats['decisions'] % 256 == 255 and self.stopped():
+                return None
+            self.branch(literal)
 
-    tmpUnitClauses = DPLLUnit(N, sentence, model)  # get the list of unit clauses (possibly with contradictory literals)
+    def model(self):
+        """
+        Returns the current assignment.
 
-    # perform a check for contradictory literals
-    symbols = []
-    for symbol in tmpUnitClauses:
-        if -symbol not in tmpUnitClauses:
-            if symbol not in symbols:
-                symbols.append(symbol)
-        else:
-            return False  # contradictory unit clauses detected
+        :return: list of assigned literals represented by positive or negative integers, sorted by variable
+        """
 
-    if len(symbols) > 0:    # if unit clauses found
-        return DPLL(N, sentence, DPLLExtend(model, symbols), modelsave, level+1)
+        return sorted(self.trail, key=abs)
 
-    for i in range(1, N+1):   # search for next unassigned literal
-        if i not in model and -i not in model:
-            symbol = i
-            break
-    else:
-        print('No more unassigned symbols left!')
-        return False
 
-    plus  = DPLL(N, sentence, DPLLExtend(model, [symbol]), modelsave, level+1)
-    if plus is False:
-        minus = DPLL(N, sentence, DPLLExtend(model, [-symbol]), modelsave, level+1)
-        return minus
+def DPLLInit(N, sentence, heuristic='ordered', phase_saving=None, stats=None, callback=None, interval=1000, stop=None):
+    """
+    DPLL initialization function.
+
+    :param N: number of symbols
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param heuristic: branching heuristic name ('ordered', 'VSIDS', 'MOMs', 'JW' or 'DLIS'), see heuristics.py
+    :param phase_saving: True to enable phase saving, None for the default of the heuristic
+    :param stats: optional dictionary to which the search statistics are added, see DPLLEngine
+    :param callback: optional function called every interval conflicts, see DPLLEngine
+    :param interval: number of conflicts between calls of the callback
+    :param stop: optional event (e.g. multiprocessing.Event or anytime.Budget) that makes the search give up when set
+    :return modelsave: a list containing the model (or empty list if no such assignment)
+    :return: -1 if stopped before a decision was reached
+    """
+    modelsave = []  # initialize a variable to assign correct model to
+
+    engine = DPLLEngine(N, sentence, heuristic, phase_saving, callback, interval, stop)
+    result = engine.solve()
+    if result:
+        modelsave.extend(engine.model())
+    elif result is None:
+        modelsave = -1
     else:
-        return plus
+        print("Sentence unsatisfiable")
+    if stats is not None:
+        addStats(stats, engine.stats)
 
+    return modelsave
 
 
-def DPLLInit(N, sentence):
+def luby(i):
     """
-    DPLL initialization function.
+    Returns the i-th element of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8, ... used as restart
+    schedule.
+
+    :param i: index in the sequence, starting at 1
+    :return: i-th element of the sequence
+    """
+
+    # Find the smallest k such that i <= 2^k - 1. If i = 2^k - 1, the element is 2^(k-1), otherwise the sequence repeats
+    # itself from the start after position 2^(k-1) - 1
+    while True:
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        if (1 << k) - 1 == i:
+            return 1 << (k-1)
+        i -= (1 << (k-1)) - 1
+
+
+class CDCLEngine(DPLLEngine):
+    """
+    Conflict-driven clause learning engine on top of the DPLL engine. On a conflict, a clause is learned using the first
+    unique implication point (1-UIP) and the search jumps back non-chronologically to the second highest decision level
+    in that clause. Branching uses VSIDS by default, bumping the variables involved in conflict analysis. Restarts
+    follow the Luby sequence and the learned clause database is bounded: whenever it exceeds its limit, the half of the
+    learned clauses with the highest literal block distance (LBD, the number of distinct decision levels in the clause)
+    is deleted at the next restart, ties broken by clause activity.
+
+    Besides the statistics of the DPLL engine, the engine counts its restarts, learned clauses and deleted learned
+    clauses. Backjumps are counted as backtracks.
+    """
+
+    def __init__(self, N, sentence, heuristic='VSIDS', phase_saving=None, restart_base=100, max_learnts=None,
+                 callback=None, interval=1000, stop=None):
+        """
+        Loads the sentence into the engine.
+
+        :param N: number of variables
+        :param sentence: list of clauses with literals represented by positive or negative integers
+        :param heuristic: branching heuristic name ('ordered', 'VSIDS', 'MOMs', 'JW' or 'DLIS') or Heuristic object
+        :param phase_saving: True to enable phase saving, None for the default of the heuristic
+        :param restart_base: number of conflicts per unit of the Luby restart sequence
+        :param max_learnts: initial limit on the number of learned clauses, grows by 10% at every database reduction.
+        Defaults to a third of the number of clauses, with a minimum of 100
+        :param callback: optional function called every interval conflicts, see DPLLEngine
+        :param interval: number of conflicts between calls of the callback
+        :param stop: optional event that makes the search give up when set, see DPLLEngine
+        """
+
+        super().__init__(N, sentence, heuristic, phase_saving, callback, interval, stop)
+        self.stats.update({'restarts': 0, 'learned': 0, 'deleted': 0})
+
+        self.level = [0]*(N+1)          # decision level at which each variable was assigned
+        self.seen = [False]*(N+1)       # marks used during conflict analysis
+        self.learnts = []               # indices of the learned clauses
+        self.lbd = dict()               # literal block distance of each learned clause
+        self.clauseActivity = dict()    # activity of each learned clause
+        self.clauseInc = 1.0
+        self.clauseDecay = 0.999
+        self.restartBase = restart_base
+        self.maxLearnts = max_learnts if max_learnts is not None else max(len(self.clauses)//3, 100)
+        self.failed = []                # failed assumptions of the last search, see solve()
+
+    def assign(self, literal, reason):
+        """
+        Makes a literal True, records it on the trail and stores its decision level.
+
+        :param literal: literal represented by a positive or negative integer
+        :param reason: index of the clause that implied the literal, or -1
+        :return:
+        """
+
+        self.value[literal] = 1
+        self.value[-literal] = -1
+        self.reason[abs(literal)] = reason
+        self.level[abs(literal)] = len(self.decisions)
+        self.trail.append(literal)
+        self.heuristic.assigned(literal)
+
+    def backjump(self, level):
+        """
+        Undoes all decision levels above the given level.
+
+        :param level: decision level to jump back to
+        :return:
+        """
+
+        if len(self.decisions) > level:
+            self.undo(self.decisions[level][0])
+            del self.decisions[level:]
+
+    def bumpClause(self, c):
+        """
+        Increases the activity of a learned clause, rescaling all clause activities if they grow too large.
+
+        :param c: clause index
+        :return:
+        """
+
+        self.clauseActivity[c] += self.clauseInc
+        if self.clauseActivity[c] > 1e20:
+            for key in self.clauseActivity:
+                self.clauseActivity[key] *= 1e-20
+            self.clauseInc *= 1e-20
+
+    def analyze(self, conflict):
+        """
+        Derives the 1-UIP learned clause from a conflict by resolving the conflicting clause with the reasons of the
+        literals of the current decision level, in reverse trail order, until a single literal of that level is left.
+
+        :param conflict: index of the conflicting clause
+        :return learnt: learned clause, the asserting literal first and a literal of the backjump level second
+        :return level: decision level to jump back to
+        """
+
+        seen = self.seen
+        level = self.level
+        currentLevel = len(self.decisions)
+
+        learnt = [0]    # placeholder for the asserting literal
+        counter = 0     # number of literals of the current level still to be resolved
+        literal = 0
+        index = len(self.trail) - 1
+        c = conflict
+
+        while True:
+            if c in self.clauseActivity:
+                self.bumpClause(c)
+
+            # For reason clauses the first literal is the implied one, which is being resolved on
+            for q in self.clauses[c][0 if literal == 0 else 1:]:
+                variable = abs(q)
+                if not seen[variable] and level[variable] > 0:
+                    seen[variable] = True
+                    self.heuristic.bump(variable)
+                    if level[variable] == currentLevel:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+
+            # Select the next literal of the current level to resolve on, walking back the trail
+            while not seen[abs(self.trail[index])]:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            seen[abs(literal)] = False
+            counter -= 1
+            if counter == 0:
+                break
+            c = self.reason[abs(literal)]
+
+        # The last remaining literal of the current level is the UIP, its negation is asserted after the backjump
+        learnt[0] = -literal
+        for q in learnt[1:]:
+            seen[abs(q)] = False
+
+        # Jump back to the highest level among the other literals, which is watched next to the asserting literal
+        if len(learnt) == 1:
+            return learnt, 0
+        i = max(range(1, len(learnt)), key=lambda j: level[abs(learnt[j])])
+        learnt[1], learnt[i] = learnt[i], learnt[1]
+
+        return learnt, level[abs(learnt[1])]
+
+    def addLearnt(self, learnt):
+        """
+        Adds a learned clause to the clause database and watches its first two literals.
+
+        :param learnt: learned clause, the asserting literal first
+        :return: index of the learned clause
+        """
+
+        c = len(self.clauses)
+        self.clauses.append(learnt)
+        self.watches[learnt[0]].append(c)
+        self.watches[learnt[1]].append(c)
+        self.learnts.append(c)
+        self.lbd[c] = len(set(self.level[abs(literal)] for literal in learnt))
+        self.clauseActivity[c] = 0.0
+        self.bumpClause(c)
+
+        return c
+
+    def reduceDB(self):
+        """
+        Deletes the worst half of the learned clauses (highest LBD first, then lowest activity), keeping the clauses
+        with an LBD of at most 2. Must be called at decision level 0, where no learned clause is the reason of an
+        assignment used by conflict analysis, such that the clause indices can be compacted.
+
+        :return:
+        """
+
+        ranked = sorted(self.learnts, key=lambda c: (self.lbd[c], -self.clauseActivity[c]))
+        delete = set(c for c in ranked[len(ranked)//2:] if self.lbd[c] > 2)
+        self.stats['deleted'] += len(delete)
+        self.removeClauses(delete)
+
+        self.maxLearnts = int(self.maxLearnts*1.1)
+
+    def removeClauses(self, delete):
+        """
+        Removes clauses from the clause database, compacting the clause indices and rebuilding the watches. Must be
+        called at decision level 0.
+
+        :param delete: set of indices of the clauses to remove
+        :return: dictionary mapping the old index of every remaining clause to its new index
+        """
+
+        # Compact the clause database and renumber the remaining learned clauses
+        newIndex = dict()
+        clauses = []
+        for c in range(len(self.clauses)):
+            if c not in delete:
+                newIndex[c] = len(clauses)
+                clauses.append(self.clauses[c])
+        self.clauses = clauses
+        self.learnts = [newIndex[c] for c in self.learnts if c not in delete]
+        self.lbd = {newIndex[c]: lbd for c, lbd in self.lbd.items() if c not in delete}
+        self.clauseActivity = {newIndex[c]: a for c, a in self.clauseActivity.items() if c not in delete}
+
+        # Rebuild the watches from the first two literals of every clause. Reasons at level 0 are never analyzed
+        self.watches = [[] for i in range(2*self.N+1)]
+        for c in range(len(self.clauses)):
+            self.watches[self.clauses[c][0]].append(c)
+            self.watches[self.clauses[c][1]].append(c)
+        for literal in self.trail:
+            self.reason[abs(literal)] = -1
+
+        return newIndex
+
+    def analyzeFinal(self, assumption):
+        """
+        Derives the assumptions responsible for an assumption being False, by walking back the trail through the
+        reasons of the literals implying its negation. As the assumptions are decided first, every decision found on
+        the way is an assumption.
+
+        :param assumption: assumption literal that is False
+        :return: list of failed assumptions, starting with the given one
+        """
+
+        failed = [assumption]
+        if self.level[abs(assumption)] == 0:
+            return failed
+
+        seen = self.seen
+        seen[abs(assumption)] = True
+        for i in range(len(self.trail)-1, self.decisions[0][0]-1, -1):
+            literal = self.trail[i]
+            variable = abs(literal)
+            if seen[variable]:
+                if self.reason[variable] == -1:
+                    if literal not in failed:
+                        failed.append(literal)
+                else:
+                    for q in self.clauses[self.reason[variable]][1:]:
+                        if self.level[abs(q)] > 0:
+                            seen[abs(q)] = True
+                seen[variable] = False
+
+        return failed
+
+    def solve(self, assumptions=()):
+        """
+        Runs the CDCL search, optionally under assumptions: literals that are decided first, each at its own decision
+        level, before any other decision. If the sentence is unsatisfiable under the assumptions, the failed assumptions
+        (a subset of the assumptions that together cannot be satisfied) are stored in failed.
+
+        :param assumptions: list of literals represented by positive or negative integers
+        :return: True if the sentence is satisfiable (under the assumptions), False otherwise, None if stopped before a
+        decision was reached
+        """
+
+        self.failed = []
+        # NOTE: Pure literals are only fixed without assumptions, as an assumption may be the negation of one
+        if not self.initialize(not assumptions):
+            return False
+
+        restarts = 0
+        conflicts = 0   # conflicts since the last restart
+        restartLimit = self.restartBase*luby(1)
+
+        while True:
+            conflict = self.propagate()
+            if conflict != -1:
+                # Conflict at decision level 0: the sentence is unsatisfiable
+                if not self.decisions:
+                    return False
+                conflicts += 1
+                self.conflict()
+                if self.stopped():
+                    return None
+
+                learnt, level = self.analyze(conflict)
+                self.backjump(level)
+                self.stats['backtracks'] += 1
+                if len(learnt) == 1:
+                    self.assign(learnt[0], -1)
+                else:
+                    self.assign(learnt[0], self.addLearnt(learnt))
+                    self.stats['learned'] += 1
+
+                self.heuristic.decay()
+                self.clauseInc /= self.clauseDecay
+                continue
+
+            # Restart, reducing the learned clause database if it has grown beyond its limit
+            if conflicts >= restartLimit:
+                self.backjump(0)
+                if len(self.learnts) > self.maxLearnts:
+                    self.reduceDB()
+                restarts += 1
+                self.stats['restarts'] += 1
+                conflicts = 0
+                restartLimit = self.restartBase*luby(restarts+1)
+                continue
+
+            # Decide the assumptions first. NOTE: A True assumption gets an empty decision level, such that the first
+            # len(assumptions) decision levels always belong to the assumptions
+            literal = 0
+            while len(self.decisions) < len(assumptions):
+                assumption = assumptions[len(self.decisions)]
+                if self.value[assumption] == 1:
+                    self.decisions.append([len(self.trail), assumption, True])
+                elif self.value[assumption] == -1:
+                    self.failed = self.analyzeFinal(assumption)
+                    return False
+                else:
+                    literal = assumption
+                    break
+
+            if literal == 0:
+                literal = self.decide()
+                if literal == 0:
+                    return True
+            if self.stats['decisions'] % 256 == 255 and self.stopped():
+                return None
+            self.branch(literal)
+
+
+def CDCLInit(N, sentence, heuristic='VSIDS', phase_saving=None, stats=None, callback=None, interval=1000, stop=None):
+    """
+    CDCL initialization function.
 
     :param N: number of symbols
-    :param sentence: list of clauses with literals represented by positive or negative integers
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param heuristic: branching heuristic name ('ordered', 'VSIDS', 'MOMs', 'JW' or 'DLIS'), see heuristics.py
+    :param phase_saving: True to enable phase saving, None for the default of the heuristic
+    :param stats: optional dictionary to which the search statistics are added, see CDCLEngine
+    :param callback: optional function called every interval conflicts, see DPLLEngine
+    :param interval: number of conflicts between calls of the callback
+    :param stop: optional event (e.g. multiprocessing.Event or anytime.Budget) that makes the search give up when set
     :return modelsave: a list containing the model (or empty list if no such assignment)
+    :return: -1 if stopped before a decision was reached
     """
     modelsave = []  # initialize a variable to assign correct model to
 
-    if not DPLL(N, sentence, [], modelsave, 1):
+    engine = CDCLEngine(N, sentence, heuristic, phase_saving, callback=callback, interval=interval, stop=stop)
+    result = engine.solve()
+    if result:
+        modelsave.extend(engine.model())
+    elif result is None:
+        modelsave = -1
+    else:
         print("Sentence unsatisfiable")
+    if stats is not None:
+        addStats(stats, engine.stats)
 
     return modelsave
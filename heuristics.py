@@ -0,0 +1,390 @@
+########################################################################################################################
+#
+#   File name:      heuristics.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the branching heuristics used by the DPLL and CDCL engines in functions.py: the original ordered
+heuristic, MOMs, Jeroslow-Wang, DLIS and VSIDS. Every heuristic is attached to an engine and is notified of every
+assignment and unassignment, such that its scores are kept up to date incrementally instead of being recomputed at every
+node of the search tree.
+"""
+
+from heapq import heapify, heappush, heappop
+
+
+class Heuristic:
+    """
+    Base class of the branching heuristics: branches on the lowest-numbered unassigned variable, positive phase first,
+    which is the order used by the original DPLL algorithm.
+
+    With phase saving enabled, the polarity chosen by the heuristic is overridden by the last value the variable had
+    before it was unassigned.
+    """
+
+    name = 'ordered'
+    defaultPhaseSaving = False
+
+    def __init__(self, phase_saving=None):
+        """
+        :param phase_saving: True to enable phase saving, None for the default of the heuristic
+        """
+
+        self.phaseSaving = self.defaultPhaseSaving if phase_saving is None else phase_saving
+
+    def attach(self, engine):
+        """
+        Attaches the heuristic to an engine, before any literal is assigned.
+
+        :param engine: DPLLEngine (or subclass) whose clauses have been loaded
+        :return:
+        """
+
+        self.engine = engine
+        self.N = engine.N
+        self.value = engine.value
+        self.phase = [0]*(engine.N+1)   # saved phase: 1 if last True, -1 if last False, 0 if never assigned
+        self.cursor = 1                 # lowest variable that might still be unassigned
+
+    def assigned(self, literal):
+        """
+        Called by the engine after a literal has been made True.
+
+        :param literal: literal represented by a positive or negative integer
+        :return:
+        """
+
+        pass
+
+    def unassigned(self, literal):
+        """
+        Called by the engine after a literal has been unassigned. Saves its phase.
+
+        :param literal: literal represented by a positive or negative integer
+        :return:
+        """
+
+        self.phase[abs(literal)] = 1 if literal > 0 else -1
+        if abs(literal) < self.cursor:
+            self.cursor = abs(literal)
+
+    def bump(self, variable):
+        """
+        Called by conflict analysis for every variable involved in a conflict.
+
+        :param variable: variable number
+        :return:
+        """
+
+        pass
+
+    def decay(self):
+        """
+        Called by the engine after every conflict.
+
+        :return:
+        """
+
+        pass
+
+    def conflict(self, clause):
+        """
+        Called by the (chronological) DPLL engine on a conflict: bumps all variables of the conflicting clause.
+
+        :param clause: list of literals of the conflicting clause
+        :return:
+        """
+
+        for literal in clause:
+            self.bump(abs(literal))
+        self.decay()
+
+    def select(self):
+        """
+        Selects the branching literal according to the heuristic.
+
+        :return: literal represented by a positive or negative integer, or 0 if all variables are assigned
+        """
+
+        while self.cursor <= self.N and self.value[self.cursor] != 0:
+            self.cursor += 1
+        if self.cursor > self.N:
+            return 0
+        return self.cursor
+
+    def decide(self):
+        """
+        Returns the branching literal, with its polarity replaced by the saved phase if phase saving is enabled.
+
+        :return: literal represented by a positive or negative integer, or 0 if all variables are assigned
+        """
+
+        literal = self.select()
+        if self.phaseSaving and literal != 0 and self.phase[abs(literal)] != 0:
+            return abs(literal)*self.phase[abs(literal)]
+        return literal
+
+
+class VSIDSHeuristic(Heuristic):
+    """
+    Variable State Independent Decaying Sum: branches on the unassigned variable with the highest activity. Activities
+    are bumped for the variables involved in conflicts and decay geometrically, which is implemented by growing the bump
+    instead of scaling down all activities. The unassigned variables are kept in a max-heap with lazy deletion: assigned
+    variables and outdated activities are discarded when they reach the top.
+    """
+
+    name = 'VSIDS'
+    defaultPhaseSaving = True
+
+    def __init__(self, phase_saving=None, decay=0.95):
+        """
+        :param phase_saving: True to enable phase saving, None for the default of the heuristic
+        :param decay: activity decay factor per conflict
+        """
+
+        super().__init__(phase_saving)
+        self.decayFactor = decay
+
+    def attach(self, engine):
+        super().attach(engine)
+        self.activity = [0.0]*(self.N+1)
+        self.increment = 1.0
+        self.heap = [(0.0, variable) for variable in range(1, self.N+1)]
+
+    def rebuild(self):
+        """
+        Rebuilds the heap from the unassigned variables, dropping all outdated entries.
+
+        :return:
+        """
+
+        self.heap = [(-self.activity[v], v) for v in range(1, self.N+1) if self.value[v] == 0]
+        heapify(self.heap)
+
+    def unassigned(self, literal):
+        super().unassigned(literal)
+        heappush(self.heap, (-self.activity[abs(literal)], abs(literal)))
+
+    def bump(self, variable):
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            # Rescale all activities, which invalidates every heap entry
+            self.activity = [a*1e-100 for a in self.activity]
+            self.increment *= 1e-100
+            self.rebuild()
+        elif self.value[variable] == 0:
+            heappush(self.heap, (-self.activity[variable], variable))
+            if len(self.heap) > 4*self.N + 64:
+                self.rebuild()
+
+    def decay(self):
+        self.increment /= self.decayFactor
+
+    def select(self):
+        heap = self.heap
+        while heap:
+            activity, variable = heap[0]
+            if self.value[variable] == 0 and -activity == self.activity[variable]:
+                return variable
+            heappop(heap)
+        return 0
+
+
+class ClauseCountHeuristic(Heuristic):
+    """
+    Base class of the heuristics based on the clauses that are not yet satisfied (MOMs, Jeroslow-Wang and DLIS). For
+    every clause the number of True literals and the number of non-False literals (its current size) are maintained, as
+    well as for every clause size and literal the number of unsatisfied clauses of that size containing the literal.
+    These counts are updated on every assignment and unassignment by only visiting the clauses of the literal.
+
+    NOTE: Only the clauses loaded when the heuristic is attached are counted, clauses learned during the search are not.
+    """
+
+    def attach(self, engine):
+        super().attach(engine)
+        self.clauses = [clause[:] for clause in engine.clauses]
+        self.maxSize = max(map(len, self.clauses), default=0)
+
+        self.occurrences = [[] for i in range(2*self.N+1)]
+        for c in range(len(self.clauses)):
+            for literal in self.clauses[c]:
+                self.occurrences[literal].append(c)
+
+        self.numTrue = [0]*len(self.clauses)
+        self.size = [len(clause) for clause in self.clauses]
+        # count[k][literal]: number of unsatisfied clauses of current size k containing the (non-False) literal
+        self.count = [[0]*(2*self.N+1) for k in range(self.maxSize+1)]
+        # clausesOfSize[k]: number of unsatisfied clauses of current size k
+        self.clausesOfSize = [0]*(self.maxSize+1)
+        for clause in self.clauses:
+            self.clausesOfSize[len(clause)] += 1
+            for literal in clause:
+                self.count[len(clause)][literal] += 1
+
+    def assigned(self, literal):
+        value = self.value
+        count = self.count
+
+        # Clauses that became satisfied no longer count for their non-False literals
+        for c in self.occurrences[literal]:
+            self.numTrue[c] += 1
+            if self.numTrue[c] == 1:
+                size = self.size[c]
+                self.clausesOfSize[size] -= 1
+                for q in self.clauses[c]:
+                    if value[q] != -1:
+                        count[size][q] -= 1
+
+        # Unsatisfied clauses containing the literal that became False shrink by one
+        for c in self.occurrences[-literal]:
+            size = self.size[c]
+            self.size[c] = size - 1
+            if self.numTrue[c] == 0:
+                self.clausesOfSize[size] -= 1
+                self.clausesOfSize[size-1] += 1
+                count[size][-literal] -= 1
+                for q in self.clauses[c]:
+                    if value[q] == 0:
+                        count[size][q] -= 1
+                        count[size-1][q] += 1
+
+    def unassigned(self, literal):
+        super().unassigned(literal)
+        value = self.value
+        count = self.count
+
+        # Reverse of assigned(): the literal that was False becomes non-False again
+        for c in self.occurrences[-literal]:
+            size = self.size[c] + 1
+            self.size[c] = size
+            if self.numTrue[c] == 0:
+                self.clausesOfSize[size-1] -= 1
+                self.clausesOfSize[size] += 1
+                count[size][-literal] += 1
+                for q in self.clauses[c]:
+                    if value[q] == 0 and q != -literal:
+                        count[size-1][q] -= 1
+                        count[size][q] += 1
+
+        # Clauses that are no longer satisfied count again for their non-False literals
+        for c in self.occurrences[literal]:
+            self.numTrue[c] -= 1
+            if self.numTrue[c] == 0:
+                size = self.size[c]
+                self.clausesOfSize[size] += 1
+                for q in self.clauses[c]:
+                    if value[q] != -1:
+                        count[size][q] += 1
+
+    def unassignedVariables(self):
+        """
+        :return: generator of the unassigned variables
+        """
+
+        value = self.value
+        return (variable for variable in range(1, self.N+1) if value[variable] == 0)
+
+
+class MOMsHeuristic(ClauseCountHeuristic):
+    """
+    Maximum Occurrences in clauses of Minimum Size: branches on the variable occurring most often in the smallest
+    unsatisfied clauses, using the score (f(x) + f(-x))*2^k + f(x)*f(-x), with f the number of occurrences in those
+    clauses. The phase with the most occurrences is tried first.
+    """
+
+    name = 'MOMs'
+
+    def __init__(self, phase_saving=None, k=4):
+        """
+        :param phase_saving: True to enable phase saving, None for the default of the heuristic
+        :param k: exponent of the MOMs score, balancing total occurrences against balanced occurrences
+        """
+
+        super().__init__(phase_saving)
+        self.k = k
+
+    def select(self):
+        # Smallest size of the unsatisfied clauses that still have unassigned literals
+        size = next((s for s in range(1, self.maxSize+1) if self.clausesOfSize[s] > 0), 0)
+        if size == 0:
+            return super().select()
+
+        f = self.count[size]
+        weight = 1 << self.k
+        variable = max(self.unassignedVariables(), key=lambda v: (f[v]+f[-v])*weight + f[v]*f[-v], default=0)
+        if variable == 0:
+            return 0
+        return variable if f[variable] >= f[-variable] else -variable
+
+
+class JWHeuristic(ClauseCountHeuristic):
+    """
+    Two-sided Jeroslow-Wang: every unsatisfied clause of size s adds 2^-s to the score J of each of its non-False
+    literals. Branches on the variable with the highest J(x) + J(-x), trying the literal with the highest J first.
+    """
+
+    name = 'JW'
+
+    def J(self, literal):
+        """
+        :param literal: literal represented by a positive or negative integer
+        :return: Jeroslow-Wang score of the literal
+        """
+
+        return sum(self.count[s][literal]*2.0**-s for s in range(1, self.maxSize+1))
+
+    def select(self):
+        J = self.J
+        variable = max(self.unassignedVariables(), key=lambda v: J(v) + J(-v), default=0)
+        if variable == 0:
+            return 0
+        return variable if J(variable) >= J(-variable) else -variable
+
+
+class DLISHeuristic(ClauseCountHeuristic):
+    """
+    Dynamic Largest Individual Sum: branches on the literal occurring in the largest number of unsatisfied clauses.
+    """
+
+    name = 'DLIS'
+
+    def select(self):
+        count = self.count
+        sizes = range(1, self.maxSize+1)
+        best = 0
+        bestScore = -1
+        for variable in self.unassignedVariables():
+            for literal in (variable, -variable):
+                score = sum(count[s][literal] for s in sizes)
+                if score > bestScore:
+                    best = literal
+                    bestScore = score
+        return best
+
+
+# Available heuristics by name
+HEURISTICS = {heuristic.name: heuristic for heuristic in
+              [Heuristic, VSIDSHeuristic, MOMsHeuristic, JWHeuristic, DLISHeuristic]}
+
+
+def makeHeuristic(heuristic, phase_saving=None):
+    """
+    Creates a branching heuristic from its name, or returns the given heuristic object.
+
+    :param heuristic: heuristic name ('ordered', 'VSIDS', 'MOMs', 'JW' or 'DLIS') or Heuristic object
+    :param phase_saving: True to enable phase saving, None for the default of the heuristic
+    :return: Heuristic object
+    """
+
+    if isinstance(heuristic, Heuristic):
+        return heuristic
+    if heuristic not in HEURISTICS:
+        raise ValueError('Unknown branching heuristic: '+str(heuristic)+'. Choose from '+', '.join(HEURISTICS))
+    return HEURISTICS[heuristic](phase_saving)
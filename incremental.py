@@ -0,0 +1,188 @@
+########################################################################################################################
+#
+#   File name:      incremental.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the incremental solver: a CDCL engine that loads a sentence once and then answers many related
+queries, keeping its watches, heuristic scores and learned clauses between them. Queries can fix literals through
+assumptions, clauses can be added at any time and groups of clauses can be pushed and popped.
+"""
+
+from functions import CDCLEngine
+
+
+class IncrementalSolver(CDCLEngine):
+    """
+    Incremental CDCL solver. Usage:
+
+        solver = IncrementalSolver(N, sentence)
+        solver.solve([1, -3])       # satisfiable with variable 1 True and variable 3 False?
+        solver.failed               # if not, the assumptions that caused it, e.g. [-3, 1]
+        solver.push()
+        solver.addClause([2, 3])    # only until the next pop()
+        solver.solve()
+        solver.model()
+        solver.pop()
+
+    A group of clauses is everything added to the clause database after a push(): the added clauses, the clauses
+    learned from them (and all other clauses learned since) and the literals fixed at decision level 0. pop() removes
+    all of these, the clauses learned before the push() remain valid and are kept.
+
+    NOTE: Pure literals are not assigned, as a literal that is pure now need not be pure after clauses are added. The
+    clause count heuristics (MOMs, JW, DLIS) only count the clauses of the initial sentence.
+    """
+
+    def __init__(self, N, sentence=(), heuristic='VSIDS', phase_saving=None, **options):
+        """
+        Loads the sentence into the solver and assigns its unit clauses.
+
+        :param N: number of variables
+        :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+        :param heuristic: branching heuristic name ('ordered', 'VSIDS', 'MOMs', 'JW' or 'DLIS') or Heuristic object
+        :param phase_saving: True to enable phase saving, None for the default of the heuristic
+        :param options: other keyword arguments of CDCLEngine, e.g. restart_base
+        """
+
+        # NOTE: Until the sentence is loaded, addClause() is the one of the engine
+        self.loaded = False
+        super().__init__(N, sentence, heuristic, phase_saving, **options)
+        self.groups = []    # stack of the solver state at every push()
+        self.loaded = True
+
+        for literal in self.units:
+            if self.value[literal] == -1:
+                self.unsat = True
+            elif self.value[literal] == 0:
+                self.assign(literal, -1)
+
+    def initialize(self, pure=False):
+        """
+        The unit clauses are assigned when they are added, and pure literals are not assigned, see IncrementalSolver.
+
+        :param pure: ignored, pure literals are never assigned
+        :return: False if the clauses contain an empty clause or contradictory unit clauses, True otherwise
+        """
+
+        return not self.unsat
+
+    def checkLiterals(self, literals):
+        """
+        :param literals: list of literals represented by positive or negative integers
+        :return:
+        """
+
+        for literal in literals:
+            if not isinstance(literal, int) or literal == 0 or abs(literal) > self.N:
+                raise ValueError('Invalid literal: '+str(literal)+'. Literals are non-zero integers between -'+
+                                 str(self.N)+' and '+str(self.N))
+
+    def addClause(self, clause):
+        """
+        Adds a clause. The clause is simplified with the literals fixed at decision level 0: it is skipped if it is
+        satisfied, and its False literals are removed.
+
+        :param clause: list of literals represented by positive or negative integers
+        :return: index of the clause, or -1 if it is not stored (satisfied, tautology, unit or empty clause)
+        """
+
+        if not self.loaded:
+            return super().addClause(clause)
+
+        clause = list(clause)
+        self.checkLiterals(clause)
+        self.backjump(0)
+
+        literals = list(dict.fromkeys(clause))
+        if any(-literal in literals for literal in literals) or any(self.value[literal] == 1 for literal in literals):
+            return -1
+        literals = [literal for literal in literals if self.value[literal] == 0]
+
+        if len(literals) == 0:
+            self.unsat = True
+            return -1
+        if len(literals) == 1:
+            self.units.append(literals[0])
+            self.assign(literals[0], -1)
+            return -1
+
+        return super().addClause(literals)
+
+    def push(self):
+        """
+        Starts a new group of clauses.
+
+        :return: number of groups
+        """
+
+        # Propagate the fixed literals first, such that pop() can return to a fully propagated state
+        self.backjump(0)
+        if not self.unsat and self.propagate() != -1:
+            self.unsat = True
+        self.groups.append((len(self.clauses), len(self.trail), len(self.units), self.unsat))
+
+        return len(self.groups)
+
+    def pop(self):
+        """
+        Removes the most recent group of clauses, together with all clauses learned and literals fixed since it was
+        started.
+
+        :return: number of groups left
+        """
+
+        if not self.groups:
+            raise ValueError('No group of clauses to pop')
+
+        self.backjump(0)
+        numClauses, numTrail, numUnits, unsat = self.groups.pop()
+
+        # Unassign the literals fixed since the push(), then remove the clauses
+        self.undo(numTrail)
+        del self.units[numUnits:]
+        self.unsat = unsat
+        self.removeClauses(set(range(numClauses, len(self.clauses))))
+
+        return len(self.groups)
+
+    def removeClauses(self, delete):
+        """
+        Removes clauses from the clause database, keeping the group boundaries consistent with the compacted clause
+        indices. See CDCLEngine.removeClauses().
+
+        :param delete: set of indices of the clauses to remove
+        :return: dictionary mapping the old index of every remaining clause to its new index
+        """
+
+        self.groups = [(sum(1 for c in range(numClauses) if c not in delete), numTrail, numUnits, unsat)
+                       for numClauses, numTrail, numUnits, unsat in self.groups]
+
+        return super().removeClauses(delete)
+
+    def solve(self, assumptions=None):
+        """
+        Solves the current clauses under the given assumptions. If the clauses are unsatisfiable under the assumptions,
+        the failed assumptions are stored in failed. If failed is empty, the clauses are unsatisfiable regardless of the
+        assumptions, until the current group is popped.
+
+        :param assumptions: optional list of literals represented by positive or negative integers
+        :return: True if satisfiable, in which case model() returns the model, False otherwise, None if stopped by the
+        stop event (see DPLLEngine) before a decision was reached
+        """
+
+        assumptions = list(assumptions) if assumptions is not None else []
+        self.checkLiterals(assumptions)
+        self.backjump(0)
+
+        satisfiable = super().solve(assumptions)
+        if satisfiable is False and not self.failed:
+            self.unsat = True
+
+        return satisfiable
@@ -0,0 +1,418 @@
+########################################################################################################################
+#
+#   File name:      localsearch.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the local search algorithms besides GSAT and WalkSAT: ProbSAT, which picks the variable to flip from
+a False clause with a probability depending only on its break count, Novelty+, optionally with adaptive noise, and
+MaxWalkSAT, which minimizes the total weight of the False clauses (weighted MaxSAT). They share the incremental clause
+bookkeeping of WalkSAT (see functions.py) and draw all random numbers from a seedable stream of pre-generated uniform
+numbers, instead of calling the random number generator of a library at every flip.
+"""
+
+import random
+import numpy as np
+from functions import occurrenceIndex, trueLiteralCounts, falseClauseSet, WalkSATScore, WalkSATFlip, addStats, \
+    updateIncumbent
+
+
+class RandomStream:
+    """
+    Stream of uniform random numbers in [0, 1), generated in large buffers by NumPy's default generator.
+    """
+
+    def __init__(self, seed=None, size=65536):
+        """
+        :param seed: random seed, or None to draw the seed from Python's random module (such that random.seed() makes
+        the stream reproducible as well)
+        :param size: number of random numbers generated at once
+        """
+
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.generator = np.random.default_rng(seed)
+        self.size = size
+        self.refill()
+
+    def refill(self):
+        """
+        Generates a new buffer of random numbers.
+
+        :return:
+        """
+
+        # NOTE: A list of Python floats is faster to index than a NumPy array
+        self.buffer = self.generator.random(self.size).tolist()
+        self.position = 0
+
+    def random(self):
+        """
+        :return: next random number in [0, 1)
+        """
+
+        if self.position == self.size:
+            self.refill()
+        u = self.buffer[self.position]
+        self.position += 1
+        return u
+
+
+def randomModel(N, stream):
+    """
+    Generates a random truth assignment for the N variables.
+
+    :param N: number of variables
+    :param stream: RandomStream object
+    :return model: list of (boolean) truth assignments for all variables
+    """
+
+    return [stream.random() < 0.5 for i in range(N)]
+
+
+def breakCount(literal, occurrences, numTrue):
+    """
+    Computes the number of clauses made False when flipping the variable of a False literal, i.e. the clauses in which
+    the negated literal is the only True literal.
+
+    :param literal: False literal
+    :param occurrences: list of clause indices for every literal, indexed by the literal itself
+    :param numTrue: list of the number of True literals per clause
+    :return: break count
+    """
+
+    return sum(1 for i in occurrences[-literal] if numTrue[i] == 1)
+
+
+def probabilityTable(size, mode='poly', cb=None, eps=1.0):
+    """
+    Computes the (unnormalized) ProbSAT flip probability for every break count: (eps + break)^-cb for the polynomial
+    and cb^-break for the exponential function.
+
+    :param size: number of break counts, i.e. maximum break count + 1
+    :param mode: 'poly' or 'exp'
+    :param cb: base of the probability function, defaults to 2.38 (poly) or 2.5 (exp), tuned for 3-SAT
+    :param eps: offset of the polynomial function
+    :return: list of probabilities indexed by break count
+    """
+
+    if mode == 'poly':
+        cb = 2.38 if cb is None else cb
+        return [(eps + b)**-cb for b in range(size)]
+    elif mode == 'exp':
+        cb = 2.5 if cb is None else cb
+        return [cb**-b for b in range(size)]
+    else:
+        raise ValueError('Unknown ProbSAT mode: '+str(mode)+'. Choose from poly, exp')
+
+
+def ProbSAT(N, sentence, max_flips, mode='poly', cb=None, eps=1.0, seed=None, stop=None, stats=None, callback=None,
+            interval=1000, incumbent=None):
+    """
+    ProbSAT algorithm. Like WalkSAT, picks a random False clause at every step, but chooses the variable to flip from it
+    with a probability depending only on its break count, looked up in a precomputed table.
+
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param max_flips: maximum number of variable flips before giving up
+    :param mode: probability function, 'poly' (polynomial) or 'exp' (exponential), see probabilityTable()
+    :param cb: base of the probability function, None for the default of the mode
+    :param eps: offset of the polynomial probability function
+    :param seed: random seed, or None to draw it from Python's random module
+    :param stop: optional event (e.g. multiprocessing.Event) that makes the search give up when set, checked every 256
+    flips
+    :param stats: optional dictionary to which the number of flips and the lowest number of False clauses reached are
+    added
+    :param callback: optional function called every interval flips as callback(stats, best), see WalkSAT()
+    :param interval: number of flips between calls of the callback
+    :param incumbent: optional dictionary in which the best model found and its number of False clauses are stored,
+    see functions.updateIncumbent()
+    :return model: model satisfying the sentence, i.e. list of (boolean) truth assignments ordered by variable number
+    :return: -1 if no solution found within max_flips
+    """
+
+    clauses, occurrences = occurrenceIndex(N, sentence)
+    stream = RandomStream(seed)
+    rand = stream.random
+
+    model = randomModel(N, stream)
+    numTrue = trueLiteralCounts(model, clauses)
+    falseClauses, falsePos = falseClauseSet(numTrue)
+
+    # A break count never exceeds the number of occurrences of a literal
+    table = probabilityTable(max(map(len, occurrences), default=0) + 1, mode, cb, eps)
+
+    solution = -1
+    flips = 0
+    best = len(falseClauses)
+    if incumbent is not None:
+        updateIncumbent(incumbent, model, best)
+
+    for i in range(1, max_flips+1):
+        if not falseClauses:
+            solution = model
+            break
+
+        clause = clauses[falseClauses[int(rand()*len(falseClauses))]]
+
+        # Choose a literal with probability proportional to the probability of its break count
+        weights = [table[breakCount(literal, occurrences, numTrue)] for literal in clause]
+        r = rand()*sum(weights)
+        for literal, weight in zip(clause, weights):
+            r -= weight
+            if r < 0:
+                break
+
+        WalkSATFlip(abs(literal), model, occurrences, numTrue, falseClauses, falsePos)
+        flips += 1
+        if len(falseClauses) < best:
+            best = len(falseClauses)
+            if incumbent is not None:
+                updateIncumbent(incumbent, model, best)
+        if callback is not None and flips % interval == 0:
+            callback({'flips': flips, 'best_unsat': best}, best)
+        if stop is not None and i % 256 == 0 and stop.is_set():
+            break
+
+    if solution == -1 and not falseClauses:
+        solution = model
+
+    if stats is not None:
+        addStats(stats, {'flips': flips, 'best_unsat': best})
+
+    return solution
+
+
+def NoveltyPlus(N, sentence, max_flips, noise=0.5, wp=0.01, adaptive=False, seed=None, stop=None, stats=None,
+                callback=None, interval=1000, incumbent=None):
+    """
+    Novelty+ algorithm. Picks a random False clause at every step. With probability wp, a random variable of the clause
+    is flipped (random walk). Otherwise the variables of the clause are ranked by score (make - break), ties broken in
+    favour of the variable flipped longest ago: the best variable is flipped unless it is the most recently flipped
+    variable of the clause, in which case the second best is flipped with probability noise.
+
+    With adaptive noise, the noise starts at 0, is increased when the number of False clauses has not improved for C/6
+    flips and decreased at every improvement.
+
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param max_flips: maximum number of variable flips before giving up
+    :param noise: probability of flipping the second best variable if the best one was flipped most recently
+    :param wp: random walk probability
+    :param adaptive: if True, adapt the noise during the search instead of using a fixed noise
+    :param seed: random seed, or None to draw it from Python's random module
+    :param stop: optional event (e.g. multiprocessing.Event) that makes the search give up when set, checked every 256
+    flips
+    :param stats: optional dictionary to which the number of flips, random walk flips, greedy flips and noise flips
+    (second best variable) and the lowest number of False clauses reached are added
+    :param callback: optional function called every interval flips as callback(stats, best), see WalkSAT(). The
+    statistics also contain the current noise
+    :param interval: number of flips between calls of the callback
+    :param incumbent: optional dictionary in which the best model found and its number of False clauses are stored,
+    see functions.updateIncumbent()
+    :return model: model satisfying the sentence, i.e. list of (boolean) truth assignments ordered by variable number
+    :return: -1 if no solution found within max_flips
+    """
+
+    clauses, occurrences = occurrenceIndex(N, sentence)
+    stream = RandomStream(seed)
+    rand = stream.random
+
+    model = randomModel(N, stream)
+    numTrue = trueLiteralCounts(model, clauses)
+    falseClauses, falsePos = falseClauseSet(numTrue)
+
+    lastFlip = [0]*(N+1)    # step at which each variable was last flipped, 0 if never
+
+    # Adaptive noise settings (Hoos, 2002)
+    phi = 0.2
+    theta = len(clauses)/6
+    if adaptive:
+        noise = 0.0
+    lastAdaptation = 0
+    adaptationFalse = len(falseClauses)
+
+    solution = -1
+    flips = 0
+    randomFlips = 0
+    noiseFlips = 0
+    best = len(falseClauses)
+    if incumbent is not None:
+        updateIncumbent(incumbent, model, best)
+
+    for i in range(1, max_flips+1):
+        if not falseClauses:
+            solution = model
+            break
+
+        clause = clauses[falseClauses[int(rand()*len(falseClauses))]]
+        variables = list(dict.fromkeys(abs(literal) for literal in clause))
+
+        if rand() < wp:
+            # Random walk
+            variable = variables[int(rand()*len(variables))]
+            randomFlips += 1
+        else:
+            # Rank by score, ties broken by age, and find the most recently flipped variable
+            ranked = sorted(variables, key=lambda v: (-WalkSATScore(v, model, occurrences, numTrue), lastFlip[v]))
+            youngest = max(variables, key=lambda v: lastFlip[v])
+            variable = ranked[0]
+            if variable == youngest and len(ranked) > 1 and rand() < noise:
+                variable = ranked[1]
+                noiseFlips += 1
+
+        WalkSATFlip(variable, model, occurrences, numTrue, falseClauses, falsePos)
+        lastFlip[variable] = i
+        flips += 1
+        if len(falseClauses) < best:
+            best = len(falseClauses)
+            if incumbent is not None:
+                updateIncumbent(incumbent, model, best)
+
+        if adaptive:
+            if len(falseClauses) < adaptationFalse:
+                noise -= noise*phi/2
+                lastAdaptation = i
+                adaptationFalse = len(falseClauses)
+            elif i - lastAdaptation > theta:
+                noise += (1 - noise)*phi
+                lastAdaptation = i
+                adaptationFalse = len(falseClauses)
+
+        if callback is not None and flips % interval == 0:
+            callback({'flips': flips, 'random_flips': randomFlips, 'greedy_flips': flips - randomFlips,
+                      'noise_flips': noiseFlips, 'best_unsat': best, 'noise': noise}, best)
+        if stop is not None and i % 256 == 0 and stop.is_set():
+            break
+
+    if solution == -1 and not falseClauses:
+        solution = model
+
+    if stats is not None:
+        addStats(stats, {'flips': flips, 'random_flips': randomFlips, 'greedy_flips': flips - randomFlips,
+                         'noise_flips': noiseFlips, 'best_unsat': best})
+
+    return solution
+
+
+def weightedScore(variable, model, occurrences, numTrue, weights):
+    """
+    Computes the change in the total weight of the satisfied clauses when flipping a variable, i.e. the weighted make -
+    break, see functions.WalkSATScore().
+
+    :param variable: variable to evaluate
+    :param model: list of (boolean) truth assignments ordered by variable number
+    :param occurrences: list of clause indices for every literal, indexed by the literal itself
+    :param numTrue: list of the number of True literals per clause
+    :param weights: list of clause weights
+    :return: weight of the clauses made True minus weight of the clauses made False by the flip
+    """
+
+    trueLiteral = variable if model[variable-1] else -variable
+
+    make = sum(weights[i] for i in occurrences[-trueLiteral] if numTrue[i] == 0)
+    brk = sum(weights[i] for i in occurrences[trueLiteral] if numTrue[i] == 1)
+
+    return make - brk
+
+
+def MaxWalkSAT(N, sentence, weights, max_flips, p=0.5, seed=None, stop=None, stats=None, callback=None, interval=1000,
+               incumbent=None):
+    """
+    MaxWalkSAT algorithm for weighted MaxSAT. Like WalkSAT, picks a random False clause at every step and flips a random
+    variable of it with probability p, but otherwise flips the variable that maximizes the total weight of the satisfied
+    clauses. The best model, i.e. the one with the lowest total weight of False clauses (cost), is kept in incumbent.
+
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param weights: list of positive clause weights (integers or floats), one per clause of the sentence
+    :param max_flips: maximum number of variable flips before giving up
+    :param p: probability of performing a random variable flip rather than a greedy variable flip
+    :param seed: random seed, or None to draw it from Python's random module
+    :param stop: optional event (e.g. multiprocessing.Event) that makes the search give up when set, checked every 256
+    flips
+    :param stats: optional dictionary to which the number of flips, random and greedy flips, the lowest number of False
+    clauses and the lowest cost reached are added
+    :param callback: optional function called every interval flips as callback(stats, best), best being the lowest cost
+    reached
+    :param interval: number of flips between calls of the callback
+    :param incumbent: optional dictionary in which the best model found, its number of False clauses ('unsat') and its
+    cost ('cost') are stored
+    :return model: model satisfying the sentence, i.e. list of (boolean) truth assignments ordered by variable number
+    :return: -1 if no solution found within max_flips
+    """
+
+    sentence = list(sentence)
+    if len(weights) != len(sentence):
+        raise ValueError('Number of weights ('+str(len(weights))+') differs from number of clauses ('+
+                         str(len(sentence))+')')
+
+    # Leave out the tautologies together with their weights, such that the weights stay aligned with the clauses
+    pairs = [(clause, weight) for clause, weight in zip(sentence, weights)
+             if not any(-literal in clause for literal in clause)]
+    clauses, occurrences = occurrenceIndex(N, [clause for clause, weight in pairs])
+    weights = [weight for clause, weight in pairs]
+
+    stream = RandomStream(seed)
+    rand = stream.random
+
+    model = randomModel(N, stream)
+    numTrue = trueLiteralCounts(model, clauses)
+    falseClauses, falsePos = falseClauseSet(numTrue)
+    cost = sum(weights[i] for i in falseClauses)
+
+    solution = -1
+    flips = 0
+    randomFlips = 0
+    best = len(falseClauses)
+    bestCost = cost
+    if incumbent is not None:
+        incumbent.update(model=list(model), unsat=best, cost=cost)
+
+    for i in range(1, max_flips+1):
+        if not falseClauses:
+            solution = model
+            break
+
+        clause = clauses[falseClauses[int(rand()*len(falseClauses))]]
+
+        if rand() < p:
+            variable = abs(clause[int(rand()*len(clause))])
+            randomFlips += 1
+            score = weightedScore(variable, model, occurrences, numTrue, weights)
+        else:
+            scores = [weightedScore(abs(literal), model, occurrences, numTrue, weights) for literal in clause]
+            score = max(scores)
+            bestVars = [abs(literal) for literal, s in zip(clause, scores) if s == score]
+            variable = bestVars[int(rand()*len(bestVars))]
+
+        # NOTE: The score is the decrease of the cost, so the cost is updated without visiting the False clauses
+        WalkSATFlip(variable, model, occurrences, numTrue, falseClauses, falsePos)
+        cost -= score
+        flips += 1
+        best = min(best, len(falseClauses))
+        if cost < bestCost:
+            bestCost = cost
+            if incumbent is not None:
+                incumbent.update(model=list(model), unsat=len(falseClauses), cost=cost)
+        if callback is not None and flips % interval == 0:
+            callback({'flips': flips, 'random_flips': randomFlips, 'greedy_flips': flips - randomFlips,
+                      'best_unsat': best, 'best_cost': bestCost}, bestCost)
+        if stop is not None and i % 256 == 0 and stop.is_set():
+            break
+
+    if solution == -1 and not falseClauses:
+        solution = model
+
+    if stats is not None:
+        addStats(stats, {'flips': flips, 'random_flips': randomFlips, 'greedy_flips': flips - randomFlips,
+                         'best_unsat': best, 'best_cost': bestCost})
+
+    return solution
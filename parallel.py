@@ -0,0 +1,176 @@
+########################################################################################################################
+#
+#   File name:      parallel.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the parallel modes of the local search algorithms: the restarts of GSAT and the walk of WalkSAT are
+independent, so the max_restarts / max_flips budget is spread over independent workers in separate processes, each with
+its own reproducible seed. As soon as one worker finds a model, all workers are stopped and the model of the first
+worker to report one is returned. A worker that crashes counts as a failed worker, the others carry on.
+
+The parallel modes are selected as the ParallelGSAT and ParallelWalkSAT algorithms of SAT.py, see batch.runAlgorithm().
+"""
+
+import random
+from multiprocessing import Event, Pipe, Process
+from multiprocessing.connection import wait
+from time import perf_counter
+import numpy.random
+from functions import GSAT, WalkSAT, addStats
+from batch import numWorkers
+
+
+def localSearchWorker(algorithm, N, sentence, budget, params, seed, stop, connection):
+    """
+    Worker process of the parallel local search: seeds the random number generators, runs GSAT with its share of the
+    restarts or WalkSAT with its share of the flips and sends the result to the parent process. If a model is found, the
+    other workers are stopped through the shared event.
+
+    :param algorithm: algorithm name string (GSAT or WalkSAT)
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers
+    :param budget: number of restarts (GSAT) or flips (WalkSAT) of this worker
+    :param params: max_climbs (GSAT) or p (WalkSAT)
+    :param seed: random seed of this worker
+    :param stop: shared event, set when any worker has found a model
+    :param connection: pipe connection to the parent process
+    :return:
+    """
+
+    random.seed(seed)
+    numpy.random.seed(seed)
+
+    stats = dict()
+    if algorithm == 'GSAT':
+        V = GSAT(N, sentence, budget, params, stop, stats)
+    else:
+        V = WalkSAT(N, sentence, params, budget, stop, stats)
+
+    if V != -1:
+        stop.set()
+
+    connection.send((V, stats))
+    connection.close()
+
+
+def splitBudget(total, workers):
+    """
+    Spreads a budget as evenly as possible over the workers.
+
+    :param total: total budget
+    :param workers: number of workers, at least 1
+    :return: list of budgets per worker, leaving out workers without budget
+    """
+
+    if workers < 1:
+        raise ValueError('Number of workers must be at least 1, got '+str(workers))
+
+    budgets = [total//workers + (i < total % workers) for i in range(workers)]
+    return [budget for budget in budgets if budget > 0]
+
+
+def parallelLocalSearch(algorithm, N, sentence, total, params, workers, seed, stats, verbose):
+    """
+    Runs the workers of a parallel local search and collects their results, see parallelGSAT() and parallelWalkSAT().
+
+    :return: model satisfying the sentence, or -1 if no worker found one
+    """
+
+    if workers is None:
+        workers = numWorkers()
+
+    t0 = perf_counter()
+    stop = Event()
+    processes = []
+    for i, budget in enumerate(splitBudget(total, workers)):
+        parent, child = Pipe(duplex=False)
+        process = Process(target=localSearchWorker,
+                          args=(algorithm, N, sentence, budget, params, seed+i, stop, child), daemon=True)
+        process.start()
+        child.close()
+        processes.append((parent, process))
+
+    # Collect the results of all workers as they arrive, which happens quickly once the stop event is set. The first
+    # model to arrive wins
+    solution = -1
+    winner = None
+    total_stats = {'failed_workers': 0}
+    running = {connection: (i, process) for i, (connection, process) in enumerate(processes)}
+    while running:
+        for connection in wait(list(running)):
+            i, process = running.pop(connection)
+            try:
+                V, worker_stats = connection.recv()
+            except EOFError:
+                # Worker crashed without a result
+                V, worker_stats = -1, {'failed_workers': 1}
+            finally:
+                connection.close()
+            process.join()
+            if V != -1 and solution == -1:
+                solution = V
+                winner = i
+                stop.set()
+            addStats(total_stats, worker_stats)
+
+    T = perf_counter() - t0
+    total_stats['workers'] = len(processes)
+    total_stats['winner'] = winner
+    total_stats['time'] = T
+    total_stats['flips_per_sec'] = total_stats.get('flips', 0)/T if T > 0 else 0.0
+
+    if verbose:
+        print('Parallel %s: %d workers, %d flips in %.3f s (%.0f flips/s)' %
+              (algorithm, len(processes), total_stats.get('flips', 0), T, total_stats['flips_per_sec']))
+    if stats is not None:
+        stats.update(total_stats)
+
+    return solution
+
+
+def parallelGSAT(N, sentence, max_restarts, max_climbs, workers=None, seed=0, stats=None, verbose=False):
+    """
+    Parallel GSAT algorithm. The restarts are spread over independent workers, worker i using seed + i.
+
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers
+    :param max_restarts: max. number of restarts in total over all workers
+    :param max_climbs: max. number of climbs per restart
+    :param workers: number of worker processes (at least 1), defaults to the number of available CPUs
+    :param seed: random seed of the first worker
+    :param stats: optional dictionary in which the aggregate restarts, flips, wall-clock time, flips/sec, number of
+    workers, number of crashed workers and index of the winning worker (or None) are stored
+    :param verbose: if True, print the aggregate flips/sec
+    :return model: model satisfying the sentence, i.e. list of (boolean) truth assignments ordered by variable number
+    :return: -1 if no solution found within max_climbs and max_restarts
+    """
+
+    return parallelLocalSearch('GSAT', N, sentence, max_restarts, max_climbs, workers, seed, stats, verbose)
+
+
+def parallelWalkSAT(N, sentence, p, max_flips, workers=None, seed=0, stats=None, verbose=False):
+    """
+    Parallel WalkSAT algorithm. The flips are spread over independent walkers, walker i using seed + i.
+
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers
+    :param p: probability of performing a random variable flip rather than a greedy variable flip
+    :param max_flips: maximum number of variable flips in total over all walkers
+    :param workers: number of worker processes (at least 1), defaults to the number of available CPUs
+    :param seed: random seed of the first walker
+    :param stats: optional dictionary in which the aggregate flips, wall-clock time, flips/sec, number of workers,
+    number of crashed walkers and index of the winning walker (or None) are stored
+    :param verbose: if True, print the aggregate flips/sec
+    :return model: model satisfying the sentence, i.e. list of (boolean) truth assignments ordered by variable number
+    :return: -1 if no solution found within max_flips
+    """
+
+    return parallelLocalSearch('WalkSAT', N, sentence, max_flips, p, workers, seed, stats, verbose)
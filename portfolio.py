@@ -0,0 +1,122 @@
+########################################################################################################################
+#
+#   File name:      portfolio.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the portfolio solver: GSAT, WalkSAT, DPLL and CDCL (possibly several differently seeded variants of
+each) are raced in separate processes on the same sentence. The first definitive answer wins and the remaining engines
+are cancelled, such that the latency is the minimum over the engines.
+"""
+
+import random
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+from time import perf_counter
+import numpy.random
+from batch import runAlgorithm
+
+
+# Default portfolio: (algorithm, seed) pairs, seeds only being relevant for the local search algorithms
+ENGINES = [('GSAT', 1), ('WalkSAT', 1), ('WalkSAT', 2), ('DPLL', None), ('CDCL', None)]
+
+
+def portfolioWorker(algorithm, seed, N, sentence, connection):
+    """
+    Worker process of a single engine: seeds the random number generators, runs the algorithm and sends the result to
+    the parent process.
+
+    :param algorithm: algorithm name string (GSAT, WalkSAT, DPLL or CDCL)
+    :param seed: random seed, or None
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers
+    :param connection: pipe connection to the parent process
+    :return:
+    """
+
+    if seed is not None:
+        random.seed(seed)
+        numpy.random.seed(seed)
+
+    V = runAlgorithm(algorithm, N, sentence)
+
+    # DPLL and CDCL return an empty list if the sentence is unsatisfiable
+    if isinstance(V, list) and not V and algorithm in ('DPLL', 'CDCL'):
+        V = 0
+
+    connection.send(V)
+    connection.close()
+
+
+def portfolio(N, sentence, engines=ENGINES, timeout=None, verbose=False):
+    """
+    Races the engines of the portfolio and returns the first definitive answer: a model found by any engine, or
+    unsatisfiability proven by a complete engine (DPLL or CDCL). "No decision" answers of the local search algorithms
+    are ignored as long as other engines are still running. The remaining engines are terminated as soon as there is a
+    winner, when all engines have finished or when the time limit is exceeded.
+
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers
+    :param engines: list of (algorithm name string, seed) pairs
+    :param timeout: wall-clock time limit in seconds, or None
+    :param verbose: if True, print the winning engine and its time
+    :return V: model, 0 (= unsatisfiable) or -1 (= no decision)
+    :return winner: name of the winning engine (algorithm, followed by '#' and the seed if seeded), or None
+    :return T: wall-clock time until the answer in seconds
+    """
+
+    t0 = perf_counter()
+    running = dict()    # connection -> (engine name, process)
+
+    for algorithm, seed in engines:
+        parent, child = Pipe(duplex=False)
+        process = Process(target=portfolioWorker, args=(algorithm, seed, N, sentence, child), daemon=True)
+        process.start()
+        child.close()
+        running[parent] = (algorithm if seed is None else algorithm+'#'+str(seed), process)
+
+    V = -1
+    winner = None
+    try:
+        while running and winner is None:
+            remaining = None if timeout is None else timeout - (perf_counter() - t0)
+            if remaining is not None and remaining <= 0:
+                break
+            for connection in wait(list(running), remaining):
+                name, process = running.pop(connection)
+                try:
+                    result = connection.recv()
+                except EOFError:
+                    # Engine crashed without an answer
+                    continue
+                finally:
+                    connection.close()
+                    process.join()
+                # A model or a proof of unsatisfiability is definitive, "no decision" is not
+                if result != -1:
+                    V = result
+                    winner = name
+                    break
+    finally:
+        # Cancel the remaining engines
+        for connection, (name, process) in running.items():
+            process.terminate()
+        for connection, (name, process) in running.items():
+            process.join()
+            connection.close()
+
+    T = perf_counter() - t0
+    if verbose:
+        if winner is None:
+            print('Portfolio: no decision after %.3f s' % T)
+        else:
+            print('Portfolio: %s won in %.3f s' % (winner, T))
+
+    return V, winner, T
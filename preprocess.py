@@ -0,0 +1,407 @@
+########################################################################################################################
+#
+#   File name:      preprocess.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the CNF preprocessor, which simplifies a sentence before it is given to a solver: removal of
+tautologies and duplicate literals, top-level unit propagation, pure literal elimination, subsumption and self-subsuming
+resolution and SatELite-style bounded variable elimination. Every step can be switched off. The variables are not
+renumbered, so the simplified sentence has the same N, and the model found by a solver for the simplified sentence is
+extended to a model of the original sentence by reconstruct().
+"""
+
+
+class Preprocessor:
+    """
+    CNF preprocessor. The clauses are stored as lists in a clause database, deleted clauses being replaced by None, and
+    every literal has the set of indices of the clauses containing it.
+
+    NOTE: Like the occurrence lists of the local search, all per-literal lists have length 2N+1 and are indexed directly
+    by the literal, negative literals using Python's negative indexing.
+
+    Model reconstruction uses an elimination stack of (witness literal, clause) pairs: going through the stack in
+    reverse order, the witness literal is made True whenever its clause is False. Fixed and pure literals are pushed as
+    unit clauses, eliminated variables as the clauses of one of their phases followed by the unit clause of the other
+    phase.
+    """
+
+    def __init__(self, N, sentence, tautologies=True, units=True, pure=True, subsumption=True, elimination=True,
+                 max_resolvent=20, max_occurrences=10):
+        """
+        Loads the sentence into the preprocessor. NOTE: Duplicate literals are always merged, as the clauses are stored
+        without them.
+
+        :param N: number of variables
+        :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+        :param tautologies: remove tautologies, i.e. clauses containing a literal and its negation
+        :param units: perform top-level unit propagation
+        :param pure: assign pure literals, i.e. literals whose negation does not occur in any clause
+        :param subsumption: remove subsumed clauses and strengthen clauses by self-subsuming resolution
+        :param elimination: eliminate variables by resolution if this does not increase the number of clauses
+        :param max_resolvent: maximum length of the resolvents added by variable elimination
+        :param max_occurrences: variables occurring more often than this in both phases are not eliminated
+        """
+
+        self.N = N
+        self.steps = {'tautologies': tautologies, 'units': units, 'pure': pure, 'subsumption': subsumption,
+                      'elimination': elimination}
+        self.maxResolvent = max_resolvent
+        self.maxOccurrences = max_occurrences
+
+        self.clauses = []                               # clause database, None for deleted clauses
+        self.occurs = [set() for i in range(2*N+1)]     # indices of the clauses containing each literal
+        self.value = [0]*(2*N+1)                        # 1 if literal fixed True, -1 if fixed False, 0 otherwise
+        self.eliminated = [False]*(N+1)                 # set for eliminated variables
+        self.stack = []                                 # elimination stack of (witness literal, clause) pairs
+        self.queue = []                                 # unit literals still to be propagated
+        self.unsat = False                              # set when the empty clause has been derived
+        self.stats = {'tautologies': 0, 'units': 0, 'pure_literals': 0, 'subsumed': 0, 'strengthened': 0,
+                      'eliminated': 0}
+
+        for clause in sentence:
+            literals = list(dict.fromkeys(clause))
+            if tautologies and any(-literal in literals for literal in literals):
+                self.stats['tautologies'] += 1
+                continue
+            self.addClause(literals)
+
+    def addClause(self, literals):
+        """
+        Adds a clause to the database, enqueueing it if it is unit.
+
+        :param literals: list of distinct literals
+        :return: index of the clause, or -1 if the clause is empty
+        """
+
+        if len(literals) == 0:
+            self.unsat = True
+            return -1
+        if len(literals) == 1:
+            self.queue.append(literals[0])
+
+        c = len(self.clauses)
+        self.clauses.append(literals)
+        for literal in literals:
+            self.occurs[literal].add(c)
+
+        return c
+
+    def removeClause(self, c):
+        """
+        Deletes a clause from the database.
+
+        :param c: clause index
+        :return:
+        """
+
+        for literal in self.clauses[c]:
+            self.occurs[literal].discard(c)
+        self.clauses[c] = None
+
+    def removeLiteral(self, c, literal):
+        """
+        Removes a literal from a clause, enqueueing the clause if it becomes unit.
+
+        :param c: clause index
+        :param literal: literal to remove
+        :return:
+        """
+
+        clause = self.clauses[c]
+        clause.remove(literal)
+        self.occurs[literal].discard(c)
+        if len(clause) == 0:
+            self.unsat = True
+        elif len(clause) == 1:
+            self.queue.append(clause[0])
+
+    def fix(self, literal):
+        """
+        Makes a literal True at the top level: removes the clauses containing it and the negated literal from all other
+        clauses.
+
+        :param literal: literal represented by a positive or negative integer
+        :return:
+        """
+
+        self.value[literal] = 1
+        self.value[-literal] = -1
+        self.stack.append((literal, [literal]))
+
+        for c in list(self.occurs[literal]):
+            self.removeClause(c)
+        for c in list(self.occurs[-literal]):
+            self.removeLiteral(c, -literal)
+
+    def propagate(self):
+        """
+        Performs top-level unit propagation of all enqueued unit literals.
+
+        :return: False if the empty clause has been derived, True otherwise
+        """
+
+        while self.queue and not self.unsat:
+            literal = self.queue.pop()
+            if self.value[literal] == 1:
+                continue
+            if self.value[literal] == -1:
+                self.unsat = True
+                break
+            self.fix(literal)
+            self.stats['units'] += 1
+
+        return not self.unsat
+
+    def pureLiterals(self):
+        """
+        Assigns all pure literals, repeating until no new pure literals appear.
+
+        :return: number of pure literals assigned
+        """
+
+        count = 0
+        changed = True
+        while changed:
+            changed = False
+            for variable in range(1, self.N+1):
+                if self.value[variable] != 0 or self.eliminated[variable]:
+                    continue
+                for literal in (variable, -variable):
+                    if self.occurs[literal] and not self.occurs[-literal]:
+                        self.fix(literal)
+                        count += 1
+                        changed = True
+                        break
+        self.stats['pure_literals'] += count
+
+        return count
+
+    def subsume(self, c):
+        """
+        Removes the clauses subsumed by a clause and strengthens the clauses that can be resolved with it such that the
+        resolvent subsumes them (self-subsuming resolution), i.e. removes literal -l from every clause D containing -l
+        and all other literals of the clause.
+
+        :param c: clause index
+        :return: list of indices of the strengthened clauses
+        """
+
+        clause = self.clauses[c]
+        literals = set(clause)
+        strengthened = []
+
+        # Subsumed clauses contain all literals of the clause, so it suffices to check those containing its rarest one
+        rarest = min(clause, key=lambda literal: len(self.occurs[literal]))
+        for d in list(self.occurs[rarest]):
+            if d != c and len(self.clauses[d]) >= len(clause) and literals.issubset(self.clauses[d]):
+                self.removeClause(d)
+                self.stats['subsumed'] += 1
+
+        # Self-subsuming resolution on every literal of the clause. NOTE: The resolvents of tautologies on their
+        # complementary literals are the other clauses themselves, which are not strengthened by them
+        for literal in list(clause):
+            if -literal in literals:
+                continue
+            others = literals - {literal}
+            for d in list(self.occurs[-literal]):
+                if len(self.clauses[d]) >= len(clause) and others.issubset(self.clauses[d]):
+                    self.removeLiteral(d, -literal)
+                    self.stats['strengthened'] += 1
+                    strengthened.append(d)
+
+        return strengthened
+
+    def subsumption(self):
+        """
+        Performs subsumption and self-subsuming resolution with every clause, shortest clauses first, until no clause
+        changes anymore.
+
+        :return: False if the empty clause has been derived, True otherwise
+        """
+
+        pending = sorted((c for c in range(len(self.clauses)) if self.clauses[c] is not None),
+                         key=lambda c: len(self.clauses[c]))
+        while pending and not self.unsat:
+            queued = set()
+            for c in pending:
+                if self.clauses[c] is None:
+                    continue
+                for d in self.subsume(c):
+                    queued.add(d)
+                if self.unsat:
+                    break
+            if self.steps['units'] and not self.propagate():
+                break
+            pending = sorted((d for d in queued if self.clauses[d] is not None), key=lambda d: len(self.clauses[d]))
+
+        return not self.unsat
+
+    def resolvents(self, variable):
+        """
+        Computes the non-tautological resolvents of all clauses containing a variable with all clauses containing its
+        negation.
+
+        :param variable: variable number
+        :return: list of resolvents, or None if one of them is longer than the maximum resolvent length
+        """
+
+        resolvents = []
+        for c in self.occurs[variable]:
+            for d in self.occurs[-variable]:
+                resolvent = list(dict.fromkeys([literal for literal in self.clauses[c] if literal != variable] +
+                                               [literal for literal in self.clauses[d] if literal != -variable]))
+                if any(-literal in resolvent for literal in resolvent):
+                    continue
+                if len(resolvent) > self.maxResolvent:
+                    return None
+                resolvents.append(resolvent)
+
+        return resolvents
+
+    def eliminate(self, variable):
+        """
+        Eliminates a variable by replacing all clauses containing it by their resolvents, if this does not increase the
+        number of clauses (bounded variable elimination).
+
+        :param variable: variable number
+        :return: True if the variable was eliminated, False otherwise
+        """
+
+        positive = self.occurs[variable]
+        negative = self.occurs[-variable]
+        if len(positive) > self.maxOccurrences and len(negative) > self.maxOccurrences:
+            return False
+
+        resolvents = self.resolvents(variable)
+        if resolvents is None or len(resolvents) > len(positive) + len(negative):
+            return False
+
+        # Store the clauses of the phase with fewer occurrences with the variable as witness, followed by the unit
+        # clause of the other phase, which is the default value if none of the stored clauses is False
+        literal = variable if len(positive) <= len(negative) else -variable
+        for c in self.occurs[literal]:
+            self.stack.append((literal, list(self.clauses[c])))
+        self.stack.append((-literal, [-literal]))
+
+        for c in positive | negative:
+            self.removeClause(c)
+        self.eliminated[variable] = True
+        self.stats['eliminated'] += 1
+
+        for resolvent in resolvents:
+            c = self.addClause(resolvent)
+            # New resolvents may subsume or strengthen other clauses
+            if c != -1 and self.steps['subsumption']:
+                self.subsume(c)
+
+        return not self.unsat
+
+    def elimination(self):
+        """
+        Tries to eliminate every variable, cheapest first (lowest product of the numbers of occurrences of both phases).
+
+        :return: False if the empty clause has been derived, True otherwise
+        """
+
+        candidates = [variable for variable in range(1, self.N+1) if self.value[variable] == 0]
+        candidates.sort(key=lambda variable: len(self.occurs[variable])*len(self.occurs[-variable]))
+
+        for variable in candidates:
+            if self.value[variable] != 0 or self.eliminated[variable]:
+                continue
+            if not self.occurs[variable] and not self.occurs[-variable]:
+                continue
+            if not self.eliminate(variable):
+                if self.unsat:
+                    break
+                continue
+            if self.steps['units'] and not self.propagate():
+                break
+
+        return not self.unsat
+
+    def run(self):
+        """
+        Runs the enabled preprocessing steps.
+
+        :return: False if the sentence was found unsatisfiable, True otherwise
+        """
+
+        if self.unsat:
+            return False
+
+        if self.steps['units'] and not self.propagate():
+            return False
+        if self.steps['pure']:
+            self.pureLiterals()
+        if self.steps['subsumption'] and not self.subsumption():
+            return False
+        if self.steps['elimination'] and not self.elimination():
+            return False
+        # Elimination and strengthening may have created new pure literals
+        if self.steps['pure']:
+            self.pureLiterals()
+
+        return not self.unsat
+
+    def sentence(self):
+        """
+        Returns the simplified sentence.
+
+        :return: list of clauses with literals represented by positive or negative integers
+        """
+
+        return [list(clause) for clause in self.clauses if clause is not None]
+
+    def reconstruct(self, model):
+        """
+        Extends a model of the simplified sentence to a model of the original sentence, by setting the fixed and pure
+        literals and choosing values for the eliminated variables.
+
+        :param model: list of (boolean) truth assignments ordered by variable number, as returned by GSAT and WalkSAT,
+        or list of literals represented by positive or negative integers, as returned by DPLL and CDCL
+        :return: model of the original sentence, in the same format
+        """
+
+        literals = len(model) > 0 and not isinstance(model[0], bool)
+        if literals:
+            values = [False]*self.N
+            for literal in model:
+                values[abs(literal)-1] = literal > 0
+        else:
+            values = list(model)
+
+        # NOTE: -1 because index starts at 0 while variables start at 1
+        for witness, clause in reversed(self.stack):
+            if not any(values[abs(literal)-1] == (literal > 0) for literal in clause):
+                values[abs(witness)-1] = witness > 0
+
+        if literals:
+            return [variable if values[variable-1] else -variable for variable in range(1, self.N+1)]
+        return values
+
+
+def preprocess(N, sentence, **steps):
+    """
+    Preprocesses a sentence with the given steps switched on or off, see Preprocessor.
+
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :param steps: keyword arguments of Preprocessor, e.g. elimination=False
+    :return sentence: simplified sentence as list of clauses, or None if the sentence was found unsatisfiable
+    :return preprocessor: Preprocessor object, whose reconstruct() extends the models of the simplified sentence
+    """
+
+    preprocessor = Preprocessor(N, sentence, **steps)
+    if not preprocessor.run():
+        return None, preprocessor
+
+    return preprocessor.sentence(), preprocessor
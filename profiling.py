@@ -0,0 +1,296 @@
+########################################################################################################################
+#
+#   File name:      profiling.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the profiling mode of SAT.py, in which every solver invocation is profiled in one of two modes:
+
+    cprofile    cProfile, which yields the exact number of calls and time per function, but slows the solvers down
+                several times. Writes <problem>.prof<algorithm> next to the solution file (.sol<algorithm>), sortable
+                with pstats (python -m pstats n20_c91.profDPLL)
+    sample      stack sampler, which records the complete call stack at regular intervals of CPU time (SIGPROF) at a
+                low overhead. Writes <problem>.folded<algorithm> with collapsed stacks 'f1;f2;f3 samples', the input of
+                flamegraph.pl or speedscope
+
+The modes are exclusive, such that neither profiler measures the other one. The runs are aggregated per algorithm and
+per C/N ratio into profile_<algorithm>_<ratio>.prof/.folded, and per algorithm over all ratios into
+profile_<algorithm>.prof/.folded, in the problems directory.
+
+NOTE: Only the process running the solver is profiled, not the worker processes of the portfolio or of the component
+decomposition. The stack sampler needs SIGPROF, which is not available on Windows.
+"""
+
+import cProfile
+import os
+import pstats
+import signal
+from collections import Counter
+from dimacs import stripCompression
+
+
+# Profiling modes, see the description of this file
+MODES = ['cprofile', 'sample']
+
+# Interval of the stack sampler in seconds of CPU time
+SAMPLE_INTERVAL = 0.001
+
+
+def frameName(frame):
+    """
+    :param frame: stack frame
+    :return: name string of the function of the frame, 'module:function'
+    """
+
+    code = frame.f_code
+    return os.path.splitext(os.path.basename(code.co_filename))[0]+':'+code.co_name
+
+
+def profileFiles(filename, algorithm, mode):
+    """
+    :param filename: problem file name string
+    :param algorithm: algorithm name string
+    :param mode: profiling mode, see MODES
+    :return: (statistics, collapsed stacks) file name strings of a run, next to its solution file, the file not written
+    in the given mode being None
+    """
+
+    stem = stripCompression(filename)[:-len('.cnf')]
+    if mode == 'cprofile':
+        return stem+'.prof'+algorithm, None
+    return None, stem+'.folded'+algorithm
+
+
+class Profiler:
+    """
+    Profiles the code run between start() and stop(), or in a with block, with cProfile or the stack sampler.
+    """
+
+    def __init__(self, mode='cprofile', interval=SAMPLE_INTERVAL):
+        """
+        :param mode: profiling mode, see MODES
+        :param interval: sampling interval of the stack sampler in seconds of CPU time
+        """
+
+        if mode not in MODES:
+            raise ValueError('Unknown profiling mode: '+str(mode)+'. Choose from '+', '.join(MODES))
+        if mode == 'sample' and not hasattr(signal, 'setitimer'):
+            raise ValueError('The sample profiling mode needs SIGPROF, which is not available on this platform')
+
+        self.mode = mode
+        self.profile = cProfile.Profile() if mode == 'cprofile' else None
+        self.interval = interval
+        self.stacks = Counter()     # collapsed stack string -> number of samples
+        self.previous = None        # SIGPROF handler replaced by the sampler
+        self.sampling = False
+
+    def sample(self, signum, frame):
+        """
+        SIGPROF handler: records the stack of the interrupted frame, outermost function first.
+
+        :param signum: signal number
+        :param frame: interrupted stack frame
+        :return:
+        """
+
+        names = []
+        while frame is not None:
+            names.append(frameName(frame))
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(names))] += 1
+
+    def start(self):
+        """
+        Starts profiling. NOTE: In sample mode, this must be called in the main thread, which receives the signals
+
+        :return:
+        """
+
+        if self.mode == 'cprofile':
+            self.profile.enable()
+        else:
+            self.previous = signal.signal(signal.SIGPROF, self.sample)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            self.sampling = True
+
+    def stop(self):
+        """
+        Stops profiling.
+
+        :return:
+        """
+
+        if self.profile is not None:
+            self.profile.disable()
+        if self.sampling:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self.previous)
+            self.sampling = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exception):
+        self.stop()
+
+    def dump(self, filename, algorithm):
+        """
+        Writes the statistics or collapsed stacks file of a run next to its solution file.
+
+        :param filename: problem file name string
+        :param algorithm: algorithm name string
+        :return: (statistics, collapsed stacks) file name strings, see profileFiles()
+        """
+
+        statsFile, stacksFile = profileFiles(filename, algorithm, self.mode)
+        if statsFile is not None:
+            self.profile.dump_stats(statsFile)
+        else:
+            # NOTE: A run too short to be sampled gets an empty file, such that no stacks of an earlier run remain
+            writeStacks(stacksFile, self.stacks)
+
+        return statsFile, stacksFile
+
+
+def writeStacks(filename, stacks):
+    """
+    Writes collapsed stacks, most sampled first.
+
+    :param filename: file name string
+    :param stacks: Counter of collapsed stack strings
+    :return:
+    """
+
+    with open(filename, 'w') as file:
+        for stack, samples in stacks.most_common():
+            file.write(stack+' '+str(samples)+'\n')
+
+
+def readStacks(filename):
+    """
+    Reads collapsed stacks as written by writeStacks().
+
+    :param filename: file name string
+    :return: Counter of collapsed stack strings
+    """
+
+    stacks = Counter()
+    with open(filename) as file:
+        for line in file:
+            stack, samples = line.rstrip('\n').rsplit(' ', 1)
+            stacks[stack] += int(samples)
+
+    return stacks
+
+
+def printTop(stats, algorithm, runs, top=10):
+    """
+    Prints the functions with the largest own time of a profile.
+
+    :param stats: pstats.Stats
+    :param algorithm: algorithm name string
+    :param runs: number of runs in the profile
+    :param top: number of functions printed
+    :return:
+    """
+
+    # NOTE: Entries are (primitive calls, calls, own time, cumulative time, callers) per (file, line, function)
+    entries = sorted(stats.stats.items(), key=lambda entry: entry[1][2], reverse=True)[:top]
+    print('Profile of %s over %d run(s), %.3f s:' % (algorithm, runs, stats.total_tt))
+    print('%12s %12s %10s  %s' % ('own [s]', 'cumul. [s]', 'calls', 'function'))
+    for (file, line, function), (primitive, calls, own, cumulative, callers) in entries:
+        print('%12.4f %12.4f %10d  %s:%s' % (own, cumulative, calls, os.path.splitext(os.path.basename(file))[0],
+                                             function))
+
+
+def printTopStacks(stacks, algorithm, runs, top=10):
+    """
+    Prints the functions sampled most often at the top of the stack, i.e. with the largest own time.
+
+    :param stacks: Counter of collapsed stack strings
+    :param algorithm: algorithm name string
+    :param runs: number of runs in the profile
+    :param top: number of functions printed
+    :return:
+    """
+
+    own = Counter()
+    for stack, samples in stacks.items():
+        own[stack.rsplit(';', 1)[-1]] += samples
+    total = sum(own.values())
+
+    print('Profile of %s over %d run(s), %d sample(s):' % (algorithm, runs, total))
+    print('%10s %8s  %s' % ('samples', 'share', 'function'))
+    for function, samples in own.most_common(top):
+        print('%10d %7.1f%%  %s' % (samples, 100.0*samples/total, function))
+
+
+class ProfileAggregate:
+    """
+    Aggregates the profiles of runs per algorithm and C/N ratio, and per algorithm over all ratios.
+    """
+
+    def __init__(self):
+        self.stats = dict()     # (algorithm, ratio or None) -> pstats.Stats
+        self.stacks = dict()    # (algorithm, ratio or None) -> Counter of collapsed stacks
+        self.runs = Counter()   # (algorithm, ratio or None) -> number of runs
+
+    def add(self, algorithm, N, C, statsFile=None, stacksFile=None):
+        """
+        Adds the profile of a run, read from its file.
+
+        :param algorithm: algorithm name string
+        :param N: number of variables
+        :param C: number of clauses
+        :param statsFile: statistics file name string, or None
+        :param stacksFile: collapsed stacks file name string, or None
+        :return:
+        """
+
+        stacks = readStacks(stacksFile) if stacksFile is not None else None
+
+        for key in ((algorithm, C/N if N else 0.0), (algorithm, None)):
+            if statsFile is not None:
+                if key in self.stats:
+                    self.stats[key].add(statsFile)
+                else:
+                    self.stats[key] = pstats.Stats(statsFile)
+            if stacks is not None:
+                self.stacks.setdefault(key, Counter()).update(stacks)
+            self.runs[key] += 1
+
+    def write(self, directory, verbose=True, top=10):
+        """
+        Writes the aggregated statistics and collapsed stacks files.
+
+        :param directory: output directory string
+        :param verbose: if True, print the functions with the largest own time per algorithm, see printTop() and
+        printTopStacks()
+        :param top: number of functions printed per algorithm
+        :return: list of written file name strings
+        """
+
+        written = []
+        for (algorithm, ratio) in sorted(self.runs, key=lambda key: (key[0], -1 if key[1] is None else key[1])):
+            name = os.path.join(directory, 'profile_'+algorithm+('' if ratio is None else '_%.2f' % ratio))
+            runs = self.runs[(algorithm, ratio)]
+            if (algorithm, ratio) in self.stats:
+                self.stats[(algorithm, ratio)].dump_stats(name+'.prof')
+                written.append(name+'.prof')
+                if verbose and ratio is None:
+                    printTop(self.stats[(algorithm, ratio)], algorithm, runs, top)
+            if (algorithm, ratio) in self.stacks:
+                writeStacks(name+'.folded', self.stacks[(algorithm, ratio)])
+                written.append(name+'.folded')
+                if verbose and ratio is None:
+                    printTopStacks(self.stacks[(algorithm, ratio)], algorithm, runs, top)
+
+        return written
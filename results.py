@@ -0,0 +1,171 @@
+########################################################################################################################
+#
+#   File name:      results.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the local results database (SQLite). Every result is keyed by a hash of the formula content together
+with the algorithm and its parameters, such that cached results are found again after problem files are renamed or
+moved, and the C/N ratio versus CPU time data is obtained with a single indexed query.
+"""
+
+import json
+import sqlite3
+from hashlib import sha256
+from time import time
+from cnf import CNF
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    formula     TEXT NOT NULL,      -- hash of the formula content, see formulaHash()
+    algorithm   TEXT NOT NULL,
+    params      TEXT NOT NULL,      -- algorithm parameters as canonical JSON
+    N           INTEGER NOT NULL,
+    C           INTEGER NOT NULL,
+    ratio       REAL NOT NULL,      -- C/N
+    status      INTEGER NOT NULL,   -- 1 (= satisfiable), 0 (= unsatisfiable) or -1 (= no decision)
+    assignment  TEXT,               -- model as returned by the algorithm, as JSON
+    time        REAL NOT NULL,      -- CPU time in seconds
+    counters    TEXT,               -- solver counters as JSON
+    filename    TEXT,               -- problem file the result was last obtained for
+    created     REAL NOT NULL,
+    PRIMARY KEY (formula, algorithm, params)
+);
+CREATE INDEX IF NOT EXISTS results_ratio ON results (status, algorithm, ratio);
+"""
+
+
+def formulaHash(N, sentence):
+    """
+    Computes the hash of the content of a formula, i.e. of its number of variables and its clauses, independently of the
+    file it was read from.
+
+    :param N: number of variables
+    :param sentence: list of clauses with literals represented by positive or negative integers, or CNF object
+    :return: hexadecimal SHA-256 hash string
+    """
+
+    if not isinstance(sentence, CNF):
+        sentence = CNF.fromClauses(N, sentence)
+
+    h = sha256()
+    h.update(str(N).encode())
+    h.update(sentence.offsets.tobytes())
+    h.update(sentence.literals.tobytes())
+
+    return h.hexdigest()
+
+
+def solutionStatus(V, N=None):
+    """
+    Returns the status of a result as written to the output files.
+
+    :param V: model or, if no solution found, 0 (= unsatisfiable) or -1 (= no decision)
+    :param N: number of variables, needed to recognize the empty list returned by DPLL and CDCL if the sentence is
+    unsatisfiable
+    :return: 1 (= satisfiable), 0 (= unsatisfiable) or -1 (= no decision)
+    """
+
+    # NOTE: An empty model is only a solution if there are no variables
+    if isinstance(V, list):
+        return 1 if V or not N else 0
+    return V
+
+
+class ResultStore:
+    """
+    SQLite database of solver results.
+    """
+
+    def __init__(self, path='results.sqlite'):
+        """
+        Opens (and if necessary creates) the database.
+
+        :param path: database file name string
+        """
+
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, formula, algorithm, params):
+        """
+        Looks up a cached result. Results without a decision (-1, e.g. a local search that ran out of flips or a killed
+        job) are not definitive and are not returned, such that they are retried.
+
+        :param formula: formula hash string, see formulaHash()
+        :param algorithm: algorithm name string
+        :param params: dictionary of algorithm parameters
+        :return: dictionary with keys N, C, status, V (the model as returned by the algorithm or the status), time,
+        counters and filename, or None if there is no cached definitive result
+        """
+
+        row = self.connection.execute(
+            'SELECT N, C, status, assignment, time, counters, filename FROM results '
+            'WHERE formula = ? AND algorithm = ? AND params = ? AND status != -1',
+            (formula, algorithm, json.dumps(params, sort_keys=True))).fetchone()
+        if row is None:
+            return None
+
+        N, C, status, assignment, T, counters, filename = row
+        return {'N': N, 'C': C, 'status': status, 'V': json.loads(assignment) if status == 1 else status, 'time': T,
+                'counters': json.loads(counters) if counters else dict(), 'filename': filename}
+
+    def put(self, formula, algorithm, params, N, C, V, T, counters=None, filename=None):
+        """
+        Stores a result, replacing any previous result for the same formula, algorithm and parameters.
+
+        :param formula: formula hash string, see formulaHash()
+        :param algorithm: algorithm name string
+        :param params: dictionary of algorithm parameters
+        :param N: number of variables
+        :param C: number of clauses
+        :param V: model or, if no solution found, 0 (= unsatisfiable) or -1 (= no decision)
+        :param T: algorithm execution time (CPU time) in seconds
+        :param counters: optional dictionary of solver counters
+        :param filename: optional problem file name string
+        :return:
+        """
+
+        status = solutionStatus(V, N)
+        with self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (formula, algorithm, json.dumps(params, sort_keys=True), N, C, C/N if N else 0.0, status,
+                 json.dumps(V) if status == 1 else None, T, json.dumps(counters) if counters else None, filename,
+                 time()))
+
+    def meanTimes(self, algorithms=None):
+        """
+        Computes the average CPU time per algorithm and C/N ratio over all solved problems.
+
+        :param algorithms: optional list of algorithm name strings to include
+        :return: dictionary with for every algorithm a list of (C/N ratio, average time) tuples sorted by ratio
+        """
+
+        rows = self.connection.execute(
+            'SELECT algorithm, ratio, AVG(time) FROM results WHERE status = 1 '
+            'GROUP BY algorithm, ratio ORDER BY algorithm, ratio').fetchall()
+
+        data = dict()
+        for algorithm, ratio, T in rows:
+            if algorithms is None or algorithm in algorithms:
+                data.setdefault(algorithm, []).append((ratio, T))
+
+        return data
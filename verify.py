@@ -0,0 +1,255 @@
+########################################################################################################################
+#
+#   File name:      verify.py
+#   Authors:        Maciej Przydatek & Giliam Datema
+#   Created:        18/10/2026
+#
+#   Course:         Artificial Intelligence & Decision Systems
+#   Assignment:     2
+#   Institution:    Instituto Superior Técnico Lisboa
+#
+########################################################################################################################
+
+"""
+This file contains the bulk verifier of solution files: every solution file (.sol<algorithm>) in a directory is checked
+against its problem file (.cnf, possibly compressed). The variable lines are read at once with a vectorized integer
+conversion, like the problem files (see dimacs.py), and all clauses are evaluated at once by the batch evaluator of
+functions.py. The problems are spread over a pool of worker processes, every problem being parsed once for all its
+solution files.
+
+A satisfiable solution passes if its header matches the problem and its assignment is consistent and satisfies every
+clause. Unsatisfiable and undecided solutions carry no assignment to check and are reported as unverified.
+
+Usage:
+    python verify.py 3SATproblems/ [-j 4] [-q]
+"""
+
+import argparse
+import os
+import re
+import sys
+from multiprocessing import Pool
+from time import perf_counter
+import numpy as np
+from dimacs import readDIMACS, readBuffer, isCNF, stripCompression
+from cnf import paddedMatrix
+from functions import evaluateTable
+from batch import numWorkers
+
+
+# Solution line, e.g. 's cnf 1 20 91'
+SOLUTION = re.compile(rb'^s[ \t]+cnf[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)[ \t]*\r?$', re.M)
+
+# Variable lines, e.g. 'v -3', possibly holding several literals terminated by a zero
+VARIABLES = re.compile(rb'^v[ \t]+(.*)$', re.M)
+
+
+def listPairs(problems_dir):
+    """
+    Lists the problem files of a directory together with their solution files.
+
+    :param problems_dir: directory string
+    :return: list of (problem file name, list of solution file names) tuples, sorted by problem file name
+    """
+
+    files = sorted(os.listdir(problems_dir))
+    pairs = []
+
+    for file in files:
+        if isCNF(file):
+            prefix = stripCompression(file)[:-len('.cnf')]+'.sol'
+            solutions = [os.path.join(problems_dir, other) for other in files if other.startswith(prefix)]
+            if solutions:
+                pairs.append((os.path.join(problems_dir, file), solutions))
+
+    return pairs
+
+
+def readSolution(filename):
+    """
+    Reads a solution file as written by writeFile() in functions.py.
+
+    :param filename: file name string
+    :return status: 1 (= satisfiable), 0 (= unsatisfiable) or -1 (= no decision)
+    :return N: number of variables
+    :return C: number of clauses
+    :return literals: numpy array of the literals of the variable lines, without terminating zeros
+    """
+
+    data = readBuffer(filename)
+
+    solutions = SOLUTION.findall(data)
+    if len(solutions) != 1:
+        raise ValueError('Expected exactly one solution line "s cnf S N C", found '+str(len(solutions)))
+    try:
+        status, N, C = (int(value) for value in solutions[0])
+    except ValueError:
+        raise ValueError('Invalid solution line: status, number of variables and clauses must be integers')
+
+    # Join all variable lines and convert the literals at once
+    try:
+        literals = np.array(b' '.join(VARIABLES.findall(data)).split(), dtype=np.int64)
+    except ValueError:
+        raise ValueError('Invalid literal in variable lines')
+
+    return status, N, C, literals[literals != 0]
+
+
+def checkAssignment(N, literals, offsets, assignment):
+    """
+    Checks if an assignment satisfies all clauses, evaluating all clauses at once.
+
+    :param N: number of variables
+    :param literals: flat numpy array of all literals of all clauses
+    :param offsets: numpy array of length C+1, clause i consisting of literals[offsets[i]:offsets[i+1]]
+    :param assignment: numpy array of the True literals
+    :return unsat: number of clauses that are not satisfied, None if the assignment is invalid
+    :return error: error message string if the assignment is invalid, None otherwise
+    """
+
+    if len(assignment) > 0 and np.abs(assignment).max() > N:
+        return None, 'variable '+str(np.abs(assignment).max())+' exceeds N = '+str(N)
+
+    # Truth value of every literal, indexed by literal + N. NOTE: Unassigned variables make both their literals False
+    value = np.zeros(2*N+1, dtype=bool)
+    value[assignment + N] = True
+    if np.any(value[:N] & value[N+1:][::-1]):
+        return None, 'variable assigned both True and False'
+
+    C = len(offsets) - 1
+    if C == 0:
+        return 0, None
+
+    # A clause is satisfied if any of its literals is True, evaluated by the batch evaluator of functions.py on the
+    # zero-padded clauses. NOTE: Empty clauses are all padding, so they are never satisfied
+    satisfied = evaluateTable(value, paddedMatrix(literals, offsets))[0]
+
+    return int(C - np.count_nonzero(satisfied)), None
+
+
+def verifyProblem(problem, solutions):
+    """
+    Verifies all solution files of a problem.
+
+    :param problem: problem file name string
+    :param solutions: list of solution file name strings
+    :return: list of dictionaries with the file name, status, result ('pass', 'fail' or 'unverified'), reason of a
+    failure and number of literals checked per solution file
+    """
+
+    N, C, literals, offsets = readDIMACS(problem)
+    reports = []
+
+    for solution in solutions:
+        report = {'file': solution, 'status': None, 'result': 'fail', 'reason': None, 'literals': 0}
+        reports.append(report)
+        try:
+            status, solutionN, solutionC, assignment = readSolution(solution)
+        except (OSError, ValueError) as error:
+            report['reason'] = str(error)
+            continue
+        report['status'] = status
+
+        if (solutionN, solutionC) != (N, C):
+            report['reason'] = 'header %d %d does not match problem %d %d' % (solutionN, solutionC, N, C)
+        elif status != 1:
+            report['result'] = 'unverified'
+        else:
+            unsat, error = checkAssignment(N, literals, offsets, assignment)
+            report['literals'] = len(literals)
+            if error is not None:
+                report['reason'] = error
+            elif unsat > 0:
+                report['reason'] = str(unsat)+' clause(s) not satisfied'
+            else:
+                report['result'] = 'pass'
+
+    return reports
+
+
+def verifyWorker(pair):
+    """
+    Worker of the verification pool: verifies a problem and its solution files, turning an unreadable problem into
+    failures of all its solution files.
+
+    :param pair: (problem file name, list of solution file names) tuple
+    :return: list of reports, see verifyProblem()
+    """
+
+    problem, solutions = pair
+    try:
+        return verifyProblem(problem, solutions)
+    except (OSError, ValueError) as error:
+        return [{'file': solution, 'status': None, 'result': 'fail', 'reason': 'problem: '+str(error), 'literals': 0}
+                for solution in solutions]
+
+
+def verifyDirectory(problems_dir, workers=None, verbose=True):
+    """
+    Verifies all solution files of a directory against their problem files in parallel.
+
+    :param problems_dir: directory string
+    :param workers: number of worker processes, defaults to the number of available CPUs
+    :param verbose: if True, print the result of every solution file and the throughput
+    :return reports: list of reports, see verifyProblem(), sorted by file name
+    :return summary: dictionary with the number of files per result, the elapsed time and the throughput in files and
+    literals per second
+    """
+
+    if workers is None:
+        workers = numWorkers()
+
+    pairs = listPairs(problems_dir)
+    t_start = perf_counter()
+
+    # NOTE: Small problems are verified in chunks, such that the inter-process communication does not dominate
+    chunksize = max(1, len(pairs)//(4*workers))
+    if workers > 1 and len(pairs) > 1:
+        with Pool(workers) as pool:
+            reports = [report for reports in pool.imap_unordered(verifyWorker, pairs, chunksize) for report in reports]
+    else:
+        reports = [report for pair in pairs for report in verifyWorker(pair)]
+
+    elapsed = perf_counter() - t_start
+    reports.sort(key=lambda report: report['file'])
+
+    summary = {result: sum(1 for report in reports if report['result'] == result)
+               for result in ('pass', 'fail', 'unverified')}
+    summary['files'] = len(reports)
+    summary['time'] = elapsed
+    summary['files_per_second'] = len(reports)/elapsed if elapsed > 0 else 0.0
+    summary['literals_per_second'] = sum(report['literals'] for report in reports)/elapsed if elapsed > 0 else 0.0
+
+    if verbose:
+        for report in reports:
+            print('%-10s %s%s' % (report['result'].upper(), os.path.basename(report['file']),
+                                  ': '+report['reason'] if report['reason'] else ''))
+        print('%d file(s): %d passed, %d failed, %d unverified in %.3f s (%.1f files/s, %.3g literals/s)' %
+              (summary['files'], summary['pass'], summary['fail'], summary['unverified'], elapsed,
+               summary['files_per_second'], summary['literals_per_second']))
+
+    return reports, summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Verify the solution files of a directory against their problems.')
+    parser.add_argument('directory', help='directory with problem (.cnf) and solution (.sol*) files')
+    parser.add_argument('-j', '--workers', type=int, help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='only print failures and the summary')
+
+    args = parser.parse_args(argv)
+
+    reports, summary = verifyDirectory(args.directory, args.workers, verbose=not args.quiet)
+    if args.quiet:
+        for report in reports:
+            if report['result'] == 'fail':
+                print('FAIL       %s: %s' % (os.path.basename(report['file']), report['reason']))
+        print('%d file(s): %d passed, %d failed, %d unverified in %.3f s (%.1f files/s)' %
+              (summary['files'], summary['pass'], summary['fail'], summary['unverified'], summary['time'],
+               summary['files_per_second']))
+
+    return 1 if summary['fail'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())